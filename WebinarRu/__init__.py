@@ -1,2 +1,72 @@
-from .webinar_api import WebinarAPI
-from .models import *
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .webinar_api import WebinarAPI
+    from .models import *
+    from .exceptions import *
+    from .budget import deadline
+
+
+# Подмодули и их экспорт загружаются при первом обращении к имени:
+# обработчик вебхуков, импортирующий только WebhookMessage, не загружает aiohttp и клиент API
+_EXPORTS = {
+    ".webinar_api": ("WebinarAPI",),
+    ".models": (
+        "User",
+        "Member",
+        "Contact",
+        "EventParticipant",
+        "EventSessionParticipant",
+        "RegisteredParticipant",
+        "EventParticipantInvite",
+        "AccessSettings",
+        "EventSession",
+        "Event",
+        "CreatedEvent",
+        "EventStats",
+        "CreatedEventSession",
+        "Timezone",
+        "File",
+        "ChatMessage",
+        "EventSessionStats",
+        "UserStats",
+        "WebhookTypes",
+        "WebhookData",
+        "WebhookMessage",
+        "EventSessionSnapshot",
+        "EventSnapshot",
+        "WebinarSpec",
+        "BulkItemResult",
+    ),
+    ".exceptions": (
+        "WebinarAPIError",
+        "RateLimitedError",
+        "NotFoundError",
+        "AuthError",
+        "ServerError",
+        "RequestTimeoutError",
+        "APIConnectionError",
+        "CircuitOpenError",
+        "error_for_status",
+    ),
+    ".budget": ("deadline",),
+}
+
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
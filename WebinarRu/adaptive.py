@@ -0,0 +1,241 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Literal
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .breaker import route_template
+from .transport import Transport, TransportResponse
+
+
+__all__ = [
+    "Outcome",
+    "AdaptiveStats",
+    "AdaptiveLimiter",
+    "AdaptiveTransport",
+]
+
+
+# ok — успешный ответ; throttled — 429; timeout — таймаут; error — 5xx или ошибка соединения
+Outcome = Literal["ok", "throttled", "timeout", "error"]
+
+# Нижняя граница базовой задержки, сек: у заглушки или при грубых часах задержка бывает нулевой
+MIN_BASELINE = 0.001
+
+
+@dataclass
+class AdaptiveStats:
+    limit: float = 0.0  # текущий лимит одновременных запросов
+    in_flight: int = 0  # выполняется сейчас
+    waiting: int = 0  # ожидает слот
+    latency_ms: float = 0.0  # сглаженная задержка ответов (по маршруту с наибольшим отношением к базовой)
+    baseline_ms: float = 0.0  # оценка задержки без нагрузки того же маршрута
+    increases: int = 0
+    decreases: int = 0
+    throttled: int = 0
+    timeouts: int = 0
+    errors: int = 0
+
+
+class AdaptiveLimiter:
+    """
+    Лимит одновременных запросов, подбираемый по AIMD: пока задержка близка к задержке без нагрузки,
+    лимит растёт на increase за каждые limit успешных ответов (примерно на increase за круг запросов);
+    при 429, таймауте, 5xx или росте задержки больше чем в latency_tolerance раз лимит умножается на decrease.
+    Задержка и её базовое значение считаются отдельно для каждого маршрута: медленные, но здоровые запросы
+    (большие страницы статистики) не выглядят перегрузкой на фоне быстрых. Отменённые запросы лимит не меняют.
+    Снижение применяется не чаще одного раза за круг: ответы на запросы, начатые до снижения, его не повторяют.
+    """
+    def __init__(
+            self,
+            initial: int = 4,
+            min_limit: int = 1,
+            max_limit: int = 100,
+            increase: float = 1.0,
+            decrease: float = 0.5,
+            latency_tolerance: float = 2.0,
+    ):
+        """
+        @param initial: начальный лимит
+        @param min_limit: нижняя граница лимита
+        @param max_limit: верхняя граница лимита
+        @param increase: прирост лимита за круг успешных запросов
+        @param decrease: множитель лимита при перегрузке (0..1)
+        @param latency_tolerance: во сколько раз задержка может превысить задержку без нагрузки
+        """
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be in (0, 1)")
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        # Маршрут -> [сглаженная задержка, задержка без нагрузки]
+        self._latencies: dict[str, list[float]] = {}
+        # Номер запроса, начатого последним перед снижением лимита
+        self._started = 0
+        self._decreased_after = 0
+        self._stats = AdaptiveStats()
+
+    @property
+    def limit(self) -> int:
+        """
+        Текущий лимит одновременных запросов
+        """
+        return int(self._limit)
+
+    async def acquire(self) -> int:
+        """
+        Дождаться слота
+        @return: номер запроса для release
+        """
+        if self._in_flight >= self.limit or self._waiters:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._in_flight -= 1
+                    self._wake()
+                raise
+        else:
+            self._in_flight += 1
+        self._started += 1
+        return self._started
+
+    def release(
+            self,
+            ticket: int,
+            outcome: Optional[Outcome],
+            latency: Optional[float] = None,
+            route: str = "",
+    ):
+        """
+        Вернуть слот и сообщить результат запроса
+        @param ticket: номер запроса из acquire
+        @param outcome: результат запроса. None — запрос отменён до ответа, лимит не меняется
+        @param latency: задержка ответа, сек
+        @param route: маршрут (шаблон), для которого ведётся оценка задержки
+        """
+        self._in_flight -= 1
+        if outcome is None:
+            self._wake()
+            return
+        overloaded = outcome != "ok"
+        if outcome == "throttled":
+            self._stats.throttled += 1
+        elif outcome == "timeout":
+            self._stats.timeouts += 1
+        elif outcome == "error":
+            self._stats.errors += 1
+        if latency is not None and outcome == "ok":
+            overloaded = self._observe(route, latency)
+        if overloaded:
+            if ticket > self._decreased_after:
+                self._limit = max(self.min_limit, self._limit * self.decrease)
+                self._decreased_after = self._started
+                self._stats.decreases += 1
+        elif self._in_flight + 1 >= self.limit or self._waiters:
+            # Лимит растёт, только если он действительно используется
+            previous = self.limit
+            self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+            if self.limit > previous:
+                self._stats.increases += 1
+        self._wake()
+
+    def _observe(self, route: str, latency: float) -> bool:
+        """
+        Учесть задержку ответа маршрута
+        @return: превышает ли сглаженная задержка маршрута допустимую
+        """
+        state = self._latencies.get(route)
+        if state is None:
+            state = self._latencies[route] = [latency, latency]
+        # Сравнивается сглаженная задержка: одиночный медленный ответ не снижает лимит
+        state[0] += (latency - state[0]) * 0.1
+        if state[0] < state[1]:
+            state[1] = state[0]
+        else:
+            # Медленно подстраиваемся к росту задержки без нагрузки
+            state[1] += (state[0] - state[1]) * 0.01
+        state[1] = max(state[1], MIN_BASELINE)
+        return state[0] > state[1] * self.latency_tolerance
+
+    def _wake(self):
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> AdaptiveStats:
+        """
+        Текущий лимит, загрузка и счётчики сигналов перегрузки
+        """
+        self._stats.limit = round(self._limit, 2)
+        self._stats.in_flight = self._in_flight
+        self._stats.waiting = sum(1 for waiter in self._waiters if not waiter.done())
+        latency, baseline = max(
+            self._latencies.values(),
+            key=lambda state: state[0] / state[1] if state[1] else 0.0,
+            default=(0.0, 1.0),
+        )
+        self._stats.latency_ms = latency * 1000
+        self._stats.baseline_ms = baseline * 1000 if self._latencies else 0.0
+        return self._stats
+
+
+class AdaptiveTransport(Transport):
+    """
+    Транспорт с адаптивным лимитом одновременных запросов для выгрузок и других массовых операций.
+    Параметр concurrency самих методов (например, get_participations_columns) задаёт верхнюю границу,
+    фактическую загрузку подбирает лимитер в пределах max_limit:
+
+        limiter = AdaptiveLimiter(initial=4, max_limit=50)
+        webinar = WebinarAPI(token, transport=AdaptiveTransport(AiohttpTransport(), limiter))
+        columns = await webinar.get_participations_columns(session_ids, concurrency=50)
+        limiter.limit
+    """
+    def __init__(self, inner: Transport, limiter: AdaptiveLimiter):
+        self.inner = inner
+        self.limiter = limiter
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None) -> TransportResponse:
+        ticket = await self.limiter.acquire()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        outcome: Optional[Outcome] = None
+        latency = None
+        try:
+            response = await self.inner.request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+            if response.status == 429:
+                outcome = "throttled"
+            elif response.status >= 500:
+                outcome = "error"
+            else:
+                outcome = "ok"
+                latency = loop.time() - started
+            return response
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except (aiohttp.ClientConnectionError, ConnectionError):
+            outcome = "error"
+            raise
+        finally:
+            # Отмена (deadline, break в цикле выгрузки) оставляет outcome None: это не перегрузка
+            self.limiter.release(ticket, outcome, latency, route_template(urlsplit(url).path))
+
+    async def close(self):
+        await self.inner.close()
+
+    def detach(self):
+        self.inner.detach()
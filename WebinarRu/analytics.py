@@ -0,0 +1,300 @@
+import datetime
+from typing import Optional, Iterable, NamedTuple, Literal, Any
+
+from .columns import ParticipantColumns, SessionStatsColumns, UserStatsColumns, INT_NULL, UTC
+from .models import EventSessionParticipant, EventSessionStats, UserStats
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+__all__ = [
+    "Funnel",
+    "EventAggregate",
+    "UserAggregate",
+    "attendance_funnel",
+    "attendance_by",
+    "event_aggregates",
+    "user_aggregates",
+    "histogram",
+    "to_dataframe",
+]
+
+
+Bucket = Literal["hour", "day", "week", "month"] | int
+
+
+class Funnel(NamedTuple):
+    registered: int  # зарегистрировано
+    visited: int  # посетило
+
+    @property
+    def rate(self) -> float:
+        return self.visited / self.registered if self.registered else 0.0
+
+
+class EventAggregate(NamedTuple):
+    visits: int  # посещений вебинаров серии
+    users: int  # уникальных участников
+    total_watch: int  # суммарная длительность подключений, сек
+    mean_watch: float  # средняя длительность подключений на посещение, сек
+
+
+class UserAggregate(NamedTuple):
+    visits: int  # посещённых вебинаров
+    events: int  # уникальных серий
+    total_watch: int  # суммарная длительность подключений, сек
+    mean_watch: float  # средняя длительность подключений на посещение, сек
+
+
+def _use_numpy(use_numpy: Optional[bool]) -> bool:
+    if use_numpy and np is None:
+        raise ImportError("numpy is not installed")
+    return np is not None if use_numpy is None else use_numpy
+
+
+def _participants(participants: ParticipantColumns | Iterable[EventSessionParticipant]) -> ParticipantColumns:
+    if isinstance(participants, ParticipantColumns):
+        return participants
+    return ParticipantColumns.from_rows(participants)
+
+
+def _session_stats(
+        stats: SessionStatsColumns | UserStatsColumns | Iterable[UserStats | EventSessionStats],
+) -> SessionStatsColumns:
+    if isinstance(stats, SessionStatsColumns):
+        return stats
+    if isinstance(stats, UserStatsColumns):
+        return stats.sessions
+    rows = list(stats)
+    if rows and isinstance(rows[0], EventSessionStats):
+        return SessionStatsColumns.from_rows(rows)
+    return UserStatsColumns.from_rows(rows).sessions
+
+
+def attendance_funnel(
+        participants: ParticipantColumns | Iterable[EventSessionParticipant],
+        use_numpy: Optional[bool] = None,
+) -> Funnel:
+    """
+    Воронка посещаемости: зарегистрировано → посетило
+    @param participants: участники (ParticipantColumns или модели)
+    @param use_numpy: принудительно включить/выключить numpy. По умолчанию — если установлен
+    @return: воронка
+    """
+    participants = _participants(participants)
+    visited = participants.columns["visited"]
+    if _use_numpy(use_numpy):
+        return Funnel(len(participants), int(np.count_nonzero(np.frombuffer(visited, dtype=np.int8) == 1)))
+    return Funnel(len(participants), visited.count(1))
+
+
+def attendance_by(
+        participants: ParticipantColumns | Iterable[EventSessionParticipant],
+        key: str = "eventSessionId",
+        use_numpy: Optional[bool] = None,
+) -> dict[Any, Funnel]:
+    """
+    Воронки посещаемости по группам (по умолчанию — по вебинарам)
+    @param participants: участники
+    @param key: колонка группировки, например eventSessionId, email или role
+    @param use_numpy: принудительно включить/выключить numpy
+    @return: значение ключа -> воронка
+    """
+    participants = _participants(participants)
+    visited = participants.columns["visited"]
+    if _use_numpy(use_numpy) and participants.kinds[key] in ("int", "str"):
+        keys = np.frombuffer(participants.columns[key], dtype=np.int64 if participants.kinds[key] == "int" else np.uint32)
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        registered = np.bincount(inverse, minlength=len(uniq))
+        came = np.bincount(inverse, weights=np.frombuffer(visited, dtype=np.int8) == 1, minlength=len(uniq))
+        return {
+            participants._decode_key(key, raw.item()): Funnel(int(total), int(count))
+            for raw, total, count in zip(uniq, registered, came)
+        }
+    return {
+        group_key: Funnel(len(group), sum(1 for index in group if visited[index] == 1))
+        for group_key, group in participants.group_by(key).items()
+    }
+
+
+def _watch(stats: SessionStatsColumns):
+    watch = np.frombuffer(stats.columns["watchDuration"], dtype=np.int64)
+    return np.where(watch == INT_NULL, 0, watch)
+
+
+def _aggregate_numpy(stats: SessionStatsColumns, key: str, distinct: str) -> dict:
+    keys = np.frombuffer(stats.columns[key], dtype=np.int64)
+    others = np.frombuffer(stats.columns[distinct], dtype=np.int64)
+    watch = _watch(stats)
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    visits = np.bincount(inverse, minlength=len(uniq))
+    totals = np.bincount(inverse, weights=watch, minlength=len(uniq))
+    # Уникальные пары (ключ, значение) через одно целое: быстрее, чем np.unique(..., axis=0)
+    other_uniq, other_inverse = np.unique(others, return_inverse=True)
+    pairs = np.unique(inverse.astype(np.int64) * max(len(other_uniq), 1) + other_inverse)
+    distinct_counts = np.bincount(pairs // max(len(other_uniq), 1), minlength=len(uniq))
+    return {
+        (None if raw == INT_NULL else int(raw)): (int(count), int(unique), int(total))
+        for raw, count, unique, total in zip(uniq, visits, distinct_counts, totals)
+    }
+
+
+def _aggregate_python(stats: SessionStatsColumns, key: str, distinct: str) -> dict:
+    others = stats.columns[distinct]
+    watch = stats.columns["watchDuration"]
+    result = {}
+    for group_key, group in stats.group_by(key).items():
+        total = 0
+        unique = set()
+        for index in group:
+            value = watch[index]
+            if value != INT_NULL:
+                total += value
+            unique.add(others[index])
+        result[group_key] = (len(group), len(unique), total)
+    return result
+
+
+def event_aggregates(
+        stats: SessionStatsColumns | UserStatsColumns | Iterable[UserStats | EventSessionStats],
+        use_numpy: Optional[bool] = None,
+) -> dict[Optional[int], EventAggregate]:
+    """
+    Показатели по сериям: посещения, уникальные участники, длительность просмотра
+    @param stats: статистика участников (get_users_stats_columns или модели get_users_stats)
+    @param use_numpy: принудительно включить/выключить numpy
+    @return: eventId -> показатели
+    """
+    stats = _session_stats(stats)
+    aggregate = _aggregate_numpy if _use_numpy(use_numpy) else _aggregate_python
+    return {
+        event_id: EventAggregate(visits, users, total, total / visits if visits else 0.0)
+        for event_id, (visits, users, total) in aggregate(stats, "eventId", "userId").items()
+    }
+
+
+def user_aggregates(
+        stats: SessionStatsColumns | UserStatsColumns | Iterable[UserStats | EventSessionStats],
+        use_numpy: Optional[bool] = None,
+) -> dict[Optional[int], UserAggregate]:
+    """
+    Показатели по участникам: посещённые вебинары и серии, длительность просмотра
+    @param stats: статистика участников
+    @param use_numpy: принудительно включить/выключить numpy
+    @return: userId -> показатели
+    """
+    stats = _session_stats(stats)
+    aggregate = _aggregate_numpy if _use_numpy(use_numpy) else _aggregate_python
+    return {
+        user_id: UserAggregate(visits, events, total, total / visits if visits else 0.0)
+        for user_id, (visits, events, total) in aggregate(stats, "userId", "eventId").items()
+    }
+
+
+def _bucket_python(epoch: int, bucket: Bucket) -> int:
+    match bucket:
+        case "hour":
+            return epoch - epoch % 3600
+        case "day":
+            return epoch - epoch % 86400
+        case "week":
+            days = epoch // 86400
+            return (days - (days + 3) % 7) * 86400  # 1970-01-01 — четверг
+        case "month":
+            moment = datetime.datetime.fromtimestamp(epoch, UTC)
+            return int(datetime.datetime(moment.year, moment.month, 1, tzinfo=UTC).timestamp())
+        case _:
+            return epoch - epoch % bucket
+
+
+def _bucket_numpy(epochs, bucket: Bucket):
+    match bucket:
+        case "hour":
+            return epochs - epochs % 3600
+        case "day":
+            return epochs - epochs % 86400
+        case "week":
+            days = epochs // 86400
+            return (days - (days + 3) % 7) * 86400
+        case "month":
+            months = epochs.astype("datetime64[s]").astype("datetime64[M]")
+            return months.astype("datetime64[s]").astype(np.int64)
+        case _:
+            return epochs - epochs % bucket
+
+
+def histogram(
+        stats: SessionStatsColumns | UserStatsColumns | ParticipantColumns | Iterable[UserStats | EventSessionStats],
+        column: str = "startsAt",
+        bucket: Bucket = "day",
+        utc_offset: int = 0,
+        use_numpy: Optional[bool] = None,
+) -> dict[datetime.datetime, int]:
+    """
+    Количество строк по интервалам времени
+    @param stats: коллекция (например, статистика участников или участники с колонкой registerDate)
+    @param column: колонка с датой
+    @param bucket: интервал: hour, day, week, month или количество секунд
+    @param utc_offset: смещение часового пояса в секундах для границ интервалов (Москва — 10800)
+    @param use_numpy: принудительно включить/выключить numpy
+    @return: начало интервала -> количество строк
+    """
+    collection = stats if isinstance(stats, ParticipantColumns) else _session_stats(stats)
+    tz = datetime.timezone(datetime.timedelta(seconds=utc_offset))
+    raw = collection.columns[column]
+    if _use_numpy(use_numpy):
+        epochs = np.frombuffer(raw, dtype=np.int64)
+        epochs = epochs[epochs != INT_NULL] + utc_offset
+        starts, counts = np.unique(_bucket_numpy(epochs, bucket), return_counts=True)
+        pairs = zip(starts.tolist(), counts.tolist())
+    else:
+        result: dict[int, int] = {}
+        for epoch in raw:
+            if epoch == INT_NULL:
+                continue
+            start = _bucket_python(epoch + utc_offset, bucket)
+            result[start] = result.get(start, 0) + 1
+        pairs = sorted(result.items())
+    return {
+        datetime.datetime.fromtimestamp(start - utc_offset, tz): count
+        for start, count in pairs
+    }
+
+
+def to_dataframe(collection: ParticipantColumns | SessionStatsColumns | UserStatsColumns):
+    """
+    Преобразует колоночную коллекцию в pandas.DataFrame (требуется pandas)
+    @param collection: коллекция
+    @return: DataFrame
+    """
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError("to_dataframe requires pandas") from e
+    data = {}
+    for name, kind in collection.kinds.items():
+        column = collection.columns[name]
+        match kind:
+            case "int":
+                values = pd.array(np.frombuffer(column, dtype=np.int64), dtype="Int64")
+                values[values == INT_NULL] = pd.NA
+                data[name] = values
+            case "float":
+                data[name] = np.frombuffer(column, dtype=np.float64)
+            case "bool":
+                raw = np.frombuffer(column, dtype=np.int8)
+                values = pd.array(raw == 1, dtype="boolean")
+                values[raw < 0] = pd.NA
+                data[name] = values
+            case "str":
+                codes = np.frombuffer(column, dtype=np.uint32).astype(np.int64) - 1
+                data[name] = pd.Categorical.from_codes(codes, categories=collection.pool.values[1:])
+            case "datetime":
+                raw = np.frombuffer(column, dtype=np.int64)
+                data[name] = pd.to_datetime(np.where(raw == INT_NULL, np.iinfo(np.int64).min, raw * 10 ** 9), utc=True)
+            case _:
+                data[name] = list(column)
+    return pd.DataFrame(data)
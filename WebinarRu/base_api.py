@@ -1,141 +1,421 @@
+import asyncio
+import json
 import logging
-from typing import Optional
+import ssl
+from fnmatch import fnmatchcase
+from types import MappingProxyType
+from typing import Optional, Sequence, Mapping, Any, AsyncIterator, TYPE_CHECKING
 
 import aiohttp
+from pydantic import BaseModel
+
+from .breaker import CircuitBreakers
+from .budget import remaining_time
+from .exceptions import WebinarAPIError, RequestTimeoutError, APIConnectionError, CircuitOpenError, error_for_status
+from .transport import Transport, AiohttpTransport, TransportResponse
+
+if TYPE_CHECKING:
+    from .cache import DiskCache
+    from .columns import ColumnarCollection
+    from .parallel import ProcessDecoder
+
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=10, sock_read=60)
 
 
 class BaseAPI:
-    def __init__(self, base_link: str, base_token: str = ""):
+    def __init__(
+            self,
+            base_link: str,
+            base_token: str = "",
+            strict: bool = False,
+            timeout: Optional[aiohttp.ClientTimeout] = None,
+            route_timeouts: Optional[dict[str, aiohttp.ClientTimeout]] = None,
+            ssl_context: Optional[ssl.SSLContext] = None,
+            ssl_pins: Optional[Sequence[str | bytes]] = None,
+            connection_limit: int = 100,
+            headers: Optional[Mapping[str, str]] = None,
+            transport: Optional[Transport] = None,
+            cache: Optional["DiskCache"] = None,
+            decoder: Optional["ProcessDecoder"] = None,
+            breakers: Optional[CircuitBreakers] = None,
+    ):
+        """
+        @param base_link: адрес API
+        @param base_token: токен
+        @param strict: строгий режим. Вместо возврата None бросаются исключения из WebinarRu.exceptions
+        @param timeout: таймауты запросов (total, connect, sock_read) по умолчанию
+        @param route_timeouts: таймауты для отдельных маршрутов. Ключ — шаблон маршрута в формате fnmatch,
+        например "/stats/users" или "/eventsessions/*/participations"
+        @param ssl_context: SSL контекст (см. WebinarRu.tls.make_ssl_context). По умолчанию — системные сертификаты
+        @param ssl_pins: допустимые SHA-256 отпечатки сертификата сервера (hex строка или bytes)
+        @param connection_limit: максимальное количество одновременных соединений
+        @param headers: заголовки по умолчанию. После создания клиента не изменяются
+        @param transport: транспорт для HTTP запросов (WebinarRu.transport). По умолчанию — AiohttpTransport,
+        собранный из ssl_context, ssl_pins и connection_limit. Вместе с transport параметры ssl_context и ssl_pins
+        не передаются (ValueError): они задаются в самом транспорте
+        @param cache: дисковый кэш GET ответов (WebinarRu.cache.DiskCache) с условными запросами по ETag/Last-Modified
+        @param decoder: пул процессов для разбора JSON и валидации моделей (WebinarRu.parallel.ProcessDecoder).
+        По умолчанию ответы разбираются в текущем процессе
+        @param breakers: предохранители маршрутов (WebinarRu.breaker.CircuitBreakers). Пока предохранитель
+        маршрута разомкнут, GET запрос возвращает последний ответ из cache, а без него — ошибку CircuitOpenError
+        """
         self._link = base_link
         self._token = base_token
-        self.headers = {
+        self.strict = strict
+        self.timeout = timeout if timeout is not None else DEFAULT_TIMEOUT
+        self.route_timeouts = dict(route_timeouts) if route_timeouts else {}
+        if transport is not None and (ssl_context is not None or ssl_pins):
+            # Параметры TLS применяются только к транспорту по умолчанию: переданный транспорт
+            # их бы молча проигнорировал, и запросы ушли бы без закрепления сертификата
+            raise ValueError(
+                "ssl_context and ssl_pins configure the default transport; "
+                "pass them to the transport instead, e.g. AiohttpTransport(ssl_pins=...)"
+            )
+        self._owns_transport = transport is None
+        self.transport = transport if transport is not None else AiohttpTransport(
+            ssl_context=ssl_context,
+            ssl_pins=ssl_pins,
+            connection_limit=connection_limit,
+        )
+        self.cache = cache
+        self.decoder = decoder
+        self.breakers = breakers
+        self._headers = MappingProxyType({
             "Accept": "*/*",
-        }
+            **(headers or {}),
+        })
 
-    async def get_json(self, route: str, params: Optional[dict] = None):
-        if params is None:
-            params = {}
-        logging.info(f"GET JSON {self._link}{route} with {params=}")
+    @property
+    def headers(self) -> Mapping[str, str]:
+        """
+        Заголовки по умолчанию (только для чтения). Дополнительные заголовки передаются в каждый запрос отдельно
+        """
+        return self._headers
+
+    def _merge_headers(self, headers: Optional[Mapping[str, str]] = None) -> Mapping[str, str]:
+        if not headers:
+            return self._headers
+        return {**self._headers, **headers}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Закрывает соединения клиента. Переданный извне транспорт не закрывается
+        """
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def _request(
+            self,
+            method: str,
+            route: str,
+            params: Optional[dict] = None,
+            data: Optional[dict] = None,
+            headers: Optional[Mapping[str, str]] = None,
+            read: str = "json",
+    ):
+        """
+        Выполняет запрос и обрабатывает ошибки
+        @param method: HTTP метод
+        @param route: маршрут
+        @param params: параметры строки запроса
+        @param data: данные формы
+        @param headers: дополнительные заголовки запроса поверх заголовков по умолчанию
+        @param read: что вернуть: json, bytes, response или status
+        @return: результат запроса или None при ошибке (в нестрогом режиме)
+        """
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(
-                    url=f"{self._link}{route}",
-                    params=params,
-                    verify_ssl=False,
-                ) as resp:
-                    logging.info(f"{resp=}")
-                    if resp.ok:
-                        logging.info(f"{resp.status=} {self._link}{route} {params=}")
-                        return await resp.json()
-                    else:
-                        raise aiohttp.ClientError
-        except aiohttp.ClientConnectionError:
+            request_headers = self._merge_headers(headers)
+            key = cached = None
+            if self.cache is not None and method == "GET":
+                from .cache import cache_key
+
+                key = cache_key(method, f"{self._link}{route}", params, request_headers)
+                cached = await self._cache_call(self.cache.get, key)
+                if cached is not None:
+                    request_headers = {**request_headers, **cached.validators}
+            breaker = self.breakers.get(route) if self.breakers is not None else None
+            if breaker is not None and not breaker.allow():
+                if cached is None:
+                    raise CircuitOpenError(
+                        f"Circuit {breaker.name} is open", route=route, retry_after=breaker.retry_after()
+                    )
+                logging.warning(f"Circuit {breaker.name} is open, using cached response {self._link}{route}")
+                resp = cached.to_response()
+                key = None
+            else:
+                resp = await self._send(breaker, method, route, params, data, request_headers)
+            logging.info(f"{resp.status=} {self._link}{route}")
+            if cached is not None and resp.status == 304:
+                resp = cached.to_response()
+                await self._cache_call(self.cache.touch, key)
+            elif key is not None and resp.status == 200:
+                await self._cache_call(self.cache.put, key, resp)
+            if not resp.ok:
+                raise error_for_status(
+                    resp.status,
+                    route,
+                    resp.text(),
+                    self._retry_after(resp.headers.get("Retry-After")),
+                )
+            logging.info(f"{resp.status=} {self._link}{route} {params=} {data=}")
+            match read:
+                case "json":
+                    return resp.json()
+                case "bytes":
+                    return resp.body
+                case "status":
+                    return resp.status
+                case _:
+                    return resp
+        except WebinarAPIError as e:
+            logging.warning(f"Api returned an error {e.status} {self._link}{route}: {e.body}")
+            if self.strict:
+                raise
+        except asyncio.TimeoutError as e:
+            logging.warning(f"Api timeout {self._link}{route}")
+            if self.strict:
+                raise RequestTimeoutError(route=route) from e
+        except (aiohttp.ClientConnectionError, ConnectionError) as e:
             logging.warning(f"Api is unreachable {self._link}{route}")
+            if self.strict:
+                raise APIConnectionError(str(e), route=route) from e
         except Exception as e:
             logging.warning(f"Api is unreachable: {e}")
+            if self.strict:
+                raise WebinarAPIError(str(e), route=route) from e
+
+    async def _send(self, breaker, method, route, params, data, headers) -> TransportResponse:
+        """
+        Запрос через транспорт с учётом результата в предохранителе маршрута.
+        Ошибкой маршрута считаются 5xx, таймауты и ошибки соединения; 429 и другие 4xx — нет
+        """
+        success = None
+        try:
+            timeout = self._timeout_for(route)
+            try:
+                resp = await self.transport.request(
+                    method,
+                    f"{self._link}{route}",
+                    params=params,
+                    data=data,
+                    headers=headers,
+                    timeout=timeout,
+                )
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError, ConnectionError):
+                success = False
+                raise
+            success = resp.status < 500
+            return resp
+        finally:
+            if breaker is not None:
+                breaker.record(success)
+
+    @staticmethod
+    async def _cache_call(func, *args):
+        """
+        Вызывает метод кэша в отдельном потоке. Ошибки кэша не прерывают запрос
+        """
+        import sqlite3
+
+        try:
+            return await asyncio.to_thread(func, *args)
+        except sqlite3.Error as e:
+            logging.warning(f"Cache is unavailable: {e}")
+            return None
+
+    def _timeout_for(self, route: str) -> aiohttp.ClientTimeout:
+        """
+        Таймаут для маршрута с учётом оставшегося бюджета deadline()
+        @param route: маршрут
+        @return: таймаут запроса
+        """
+        timeout = self.timeout
+        for pattern, route_timeout in self.route_timeouts.items():
+            if fnmatchcase(route, pattern):
+                timeout = route_timeout
+                break
+        budget = remaining_time()
+        if budget is None:
+            return timeout
+        if budget <= 0:
+            raise asyncio.TimeoutError
+        if timeout.total is not None and timeout.total <= budget:
+            return timeout
+        return aiohttp.ClientTimeout(
+            total=budget,
+            connect=timeout.connect,
+            sock_read=timeout.sock_read,
+            sock_connect=timeout.sock_connect,
+        )
+
+    @staticmethod
+    def _retry_after(value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    async def get_json(self, route: str, params: Optional[dict] = None, headers: Optional[Mapping[str, str]] = None):
+        if params is None:
+            params = {}
+        logging.info(f"GET JSON {self._link}{route} with {params=}")
+        return await self._request("GET", route, params=params, headers=headers)
 
-    async def get_data(self, route: str, params: Optional[dict] = None):
+    async def get_data(self, route: str, params: Optional[dict] = None, headers: Optional[Mapping[str, str]] = None):
         if params is None:
             params = {}
         logging.info(f"GET DATA {self._link}{route} with {params=}")
+        return await self._request("GET", route, params=params, headers=headers, read="bytes")
+
+    async def _decode_body(self, route: str, body: bytes, model: type[BaseModel], key: Optional[str] = None) -> Any:
+        """
+        Разбирает тело ответа в модели в текущем процессе или в пуле decoder.
+        Ошибка разбора JSON обрабатывается как ошибка запроса, ошибки валидации моделей не перехватываются
+        """
+        from .parallel import decode_models
+
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(
-                    url=f"{self._link}{route}",
-                    params=params,
-                    verify_ssl=False,
-                ) as resp:
-                    logging.info(f"{resp=}")
-                    if resp.ok:
-                        logging.info(f"{resp.status=} {self._link}{route}")
-                        return await resp.read()
-                    else:
-                        raise aiohttp.ClientError
-        except aiohttp.ClientConnectionError:
-            logging.warning(f"Api is unreachable {self._link}{route}")
-        except Exception as e:
-            logging.warning(f"Api is unreachable: {e}")
+            if self.decoder is not None:
+                return await self.decoder.decode(body, model, key)
+            return decode_models(body, model, key)
+        except json.JSONDecodeError as e:
+            logging.warning(f"Api returned invalid JSON {self._link}{route}: {e}")
+            if self.strict:
+                raise WebinarAPIError(str(e), route=route) from e
+
+    async def get_models(
+            self,
+            route: str,
+            model: type[BaseModel],
+            params: Optional[dict] = None,
+            key: Optional[str] = None,
+            headers: Optional[Mapping[str, str]] = None,
+    ) -> Any:
+        """
+        GET запрос с разбором ответа в модели (в пуле процессов, если задан decoder)
+        @param route: маршрут
+        @param model: модель элемента ответа
+        @param params: параметры строки запроса
+        @param key: ключ вложенного объекта в элементах списка, например "file"
+        @param headers: дополнительные заголовки запроса
+        @return: список моделей, модель или None
+        """
+        body = await self.get_data(route, params, headers=headers)
+        if body is None:
+            return None
+        return await self._decode_body(route, body, model, key)
+
+    async def get_columns(
+            self,
+            route: str,
+            collection: type["ColumnarCollection"],
+            params: Optional[dict] = None,
+            extra: Optional[dict] = None,
+    ) -> Any:
+        """
+        GET запрос с разбором ответа в колоночную коллекцию (в пуле процессов, если задан decoder)
+        @param route: маршрут
+        @param collection: класс коллекции
+        @param params: параметры строки запроса
+        @param extra: значения дополнительных колонок для всех строк
+        @return: коллекция или None
+        """
+        from .parallel import decode_columns
+
+        body = await self.get_data(route, params)
+        if body is None:
+            return None
+        try:
+            if self.decoder is not None:
+                return await self.decoder.decode_columns(body, collection, extra)
+            return decode_columns(body, collection, extra)
+        except json.JSONDecodeError as e:
+            logging.warning(f"Api returned invalid JSON {self._link}{route}: {e}")
+            if self.strict:
+                raise WebinarAPIError(str(e), route=route) from e
+
+    async def iter_pages(
+            self,
+            route: str,
+            model: type[BaseModel],
+            params: Optional[dict] = None,
+            per_page: int = 500,
+    ) -> AsyncIterator[list]:
+        """
+        Постранично выгружает список (параметры page/perPage). Следующая страница запрашивается,
+        пока разбирается текущая, поэтому с decoder загрузка и разбор идут параллельно
+        @param route: маршрут
+        @param model: модель элемента
+        @param params: параметры строки запроса
+        @param per_page: размер страницы
+        """
+        async def fetch(number: int):
+            return await self.get_data(route, {**(params or {}), "perPage": per_page, "page": number})
+
+        page = 1
+        next_page = asyncio.ensure_future(fetch(page))
+        try:
+            while True:
+                body = await next_page
+                if body is None:
+                    return
+                page += 1
+                next_page = asyncio.ensure_future(fetch(page))
+                items = await self._decode_body(route, body, model)
+                if items:
+                    yield items
+                if not items or len(items) < per_page:
+                    return
+        finally:
+            next_page.cancel()
 
-    async def post_json(self, route: str, data: Optional[dict] = None) -> dict:
+    async def post_json(
+            self,
+            route: str,
+            data: Optional[dict] = None,
+            headers: Optional[Mapping[str, str]] = None,
+    ) -> dict:
         """
         Send post request to host
         :param route: request link
         :param data: json object to send
+        :param headers: extra headers for this request only
         :return: json object from host
         """
-        headers = self.headers
-        headers.update({"Content-Type": "application/x-www-form-urlencoded"})
+        headers = {"Content-Type": "application/x-www-form-urlencoded", **(headers or {})}
         if data is None:
             data = {}
         logging.info(f"Sending post request to {self._link}{route} with data: {data}")
-        try:
-            async with aiohttp.ClientSession(headers=headers) as session:
-                async with session.post(
-                    f'{self._link}{route}',
-                    data=data,
-                    verify_ssl=False,
-                ) as post:
-                    logging.info(f"{post=}")
-                    if post.ok:
-                        logging.info(f"{post.status=} {self._link}{route} {data=}")
-                        return await post.json()
-                    else:
-                        raise aiohttp.ClientError
-        except aiohttp.ClientConnectionError:
-            logging.warning(f"Api is unreachable {self._link}{route}")
-        except Exception as e:
-            logging.warning(f"Api is unreachable: {e}")
+        return await self._request("POST", route, data=data, headers=headers)
 
-    async def put(self, route: str, data: Optional[dict] = None) -> aiohttp.ClientResponse:
+    async def put(
+            self,
+            route: str,
+            data: Optional[dict] = None,
+            headers: Optional[Mapping[str, str]] = None,
+    ) -> TransportResponse:
         """
         Send put request to host
         :param route: request link
         :param data: json object to send
+        :param headers: extra headers for this request only
         :return: json object from host
         """
-        headers = self.headers
-        headers.update({"Content-Type": "application/x-www-form-urlencoded"})
+        headers = {"Content-Type": "application/x-www-form-urlencoded", **(headers or {})}
         if data is None:
             data = {}
         logging.info(f"Sending PUT request to {self._link}{route} {data=}")
-        try:
-            async with aiohttp.ClientSession(headers=headers) as session:
-                async with session.put(
-                    f'{self._link}{route}',
-                    data=data,
-                    verify_ssl=False,
-                ) as put:
-                    logging.info(f"{put=}")
-                    if put.ok:
-                        logging.info(f"{put.status=} {self._link}{route} {data=}")
-                        return put
-                    else:
-                        raise aiohttp.ClientError
-        except aiohttp.ClientConnectionError:
-            logging.warning(f"Api is unreachable {self._link}{route}")
-        except Exception as e:
-            logging.warning(f"Api is unreachable: {e}")
+        return await self._request("PUT", route, data=data, headers=headers, read="response")
 
-    async def delete(self, route: str, data: Optional[dict] = None) -> int:
+    async def delete(self, route: str, data: Optional[dict] = None, headers: Optional[Mapping[str, str]] = None) -> int:
         if data is None:
             data = {}
         logging.info(f"Sending DELETE request to {self._link}{route} with data={data}")
-        try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.delete(
-                    url=f"{self._link}{route}",
-                    data=data,
-                    verify_ssl=False,
-                ) as resp:
-                    logging.info(f"{resp=}")
-                    if resp.ok:
-                        logging.info(f"{resp.status=} {self._link}{route} {data=}")
-                        return resp.status
-                    else:
-                        raise aiohttp.ClientError
-        except aiohttp.ClientConnectionError:
-            logging.warning(f"Api is unreachable {self._link}{route}")
-        except Exception as e:
-            logging.warning(f"Api is unreachable: {e}")
-
-
+        return await self._request("DELETE", route, data=data, headers=headers, read="status")
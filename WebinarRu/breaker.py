@@ -0,0 +1,185 @@
+import logging
+import re
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Optional, Mapping, Literal
+
+
+__all__ = [
+    "BreakerState",
+    "BreakerSettings",
+    "BreakerStats",
+    "CircuitBreaker",
+    "CircuitBreakers",
+    "route_template",
+]
+
+
+# closed — запросы проходят; open — запросы отклоняются без обращения к API;
+# half_open — пропускается ограниченное число пробных запросов
+BreakerState = Literal["closed", "open", "half_open"]
+
+_ID = re.compile(r"/\d+(?=/|$)")
+
+
+def route_template(route: str) -> str:
+    """
+    Шаблон маршрута: числовые идентификаторы заменяются на *, например /eventsessions/*/participations
+    """
+    return _ID.sub("/*", route)
+
+
+@dataclass(frozen=True)
+class BreakerSettings:
+    failure_threshold: int = 5  # ошибок подряд до размыкания
+    open_duration: float = 30.0  # сколько секунд цепь разомкнута до пробных запросов
+    half_open_probes: int = 1  # успешных пробных запросов до замыкания
+
+
+@dataclass
+class BreakerStats:
+    state: BreakerState = "closed"
+    failures: int = 0  # ошибок подряд
+    opened: int = 0  # сколько раз цепь размыкалась
+    rejected: int = 0  # отклонено запросов без обращения к API
+    retry_after: float = 0.0  # секунд до пробных запросов (для open)
+
+
+class CircuitBreaker:
+    """
+    Предохранитель маршрута. После failure_threshold ошибок подряд (5xx, таймауты, ошибки соединения)
+    цепь размыкается на open_duration секунд: запросы отклоняются сразу. Затем пропускаются half_open_probes
+    пробных запросов; если все успешны, цепь замыкается, при ошибке — снова размыкается.
+    """
+    def __init__(self, name: str, settings: BreakerSettings = BreakerSettings()):
+        """
+        @param name: шаблон маршрута
+        @param settings: пороги предохранителя
+        """
+        self.name = name
+        self.settings = settings
+        self._state: BreakerState = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0  # пробных запросов в работе
+        self._successes = 0  # успешных пробных запросов
+        self._stats = BreakerStats()
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.settings.open_duration:
+            self._transition("half_open")
+        return self._state
+
+    def _transition(self, state: BreakerState):
+        logging.warning(f"Circuit {self.name}: {self._state} -> {state}")
+        self._state = state
+        self._probes = self._successes = 0
+        if state == "open":
+            self._opened_at = time.monotonic()
+            self._stats.opened += 1
+        elif state == "closed":
+            self._failures = 0
+
+    def allow(self) -> bool:
+        """
+        Можно ли выполнить запрос. В полуоткрытом состоянии разрешение занимает пробный слот,
+        который освобождается в record
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and self._probes + self._successes < self.settings.half_open_probes:
+            self._probes += 1
+            return True
+        self._stats.rejected += 1
+        return False
+
+    def record(self, success: Optional[bool]):
+        """
+        Результат разрешённого запроса
+        @param success: True — успех, False — ошибка, None — запрос отменён до ответа
+        """
+        if self._state == "half_open":
+            self._probes = max(self._probes - 1, 0)
+            if success is False:
+                self._transition("open")
+            elif success:
+                self._successes += 1
+                if self._successes >= self.settings.half_open_probes:
+                    self._transition("closed")
+            return
+        if success is False:
+            self._failures += 1
+            if self._state == "closed" and self._failures >= self.settings.failure_threshold:
+                self._transition("open")
+        elif success:
+            self._failures = 0
+
+    def retry_after(self) -> float:
+        """
+        Через сколько секунд начнутся пробные запросы
+        """
+        if self.state != "open":
+            return 0.0
+        return max(self.settings.open_duration - (time.monotonic() - self._opened_at), 0.0)
+
+    def stats(self) -> BreakerStats:
+        self._stats.state = self.state
+        self._stats.failures = self._failures
+        self._stats.retry_after = self.retry_after()
+        return self._stats
+
+
+class CircuitBreakers:
+    """
+    Предохранители по шаблонам маршрутов для BaseAPI(breakers=...).
+    Для каждого шаблона маршрута (/stats/users, /eventsessions/*/participations, ...) создаётся свой предохранитель,
+    поэтому деградация одного маршрута не задерживает остальные. Пороги задаются по умолчанию и для отдельных
+    маршрутов шаблонами fnmatch:
+
+        breakers = CircuitBreakers(
+            BreakerSettings(failure_threshold=5, open_duration=30),
+            routes={"/stats/*": BreakerSettings(failure_threshold=3, open_duration=120)},
+        )
+        webinar = WebinarAPI(token, breakers=breakers, cache=DiskCache("cache.sqlite"))
+    """
+    def __init__(
+            self,
+            default: BreakerSettings = BreakerSettings(),
+            routes: Optional[Mapping[str, BreakerSettings]] = None,
+    ):
+        """
+        @param default: пороги по умолчанию
+        @param routes: пороги для маршрутов. Ключ — шаблон fnmatch, например "/stats/*"
+        """
+        self.default = default
+        self.routes = dict(routes) if routes else {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, route: str) -> CircuitBreaker:
+        """
+        Предохранитель маршрута
+        @param route: маршрут запроса
+        """
+        name = route_template(route)
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            settings = next(
+                (settings for pattern, settings in self.routes.items() if fnmatchcase(name, pattern)), self.default
+            )
+            breaker = self._breakers[name] = CircuitBreaker(name, settings)
+        return breaker
+
+    def states(self) -> dict[str, BreakerState]:
+        """
+        Состояния предохранителей по шаблонам маршрутов
+        """
+        return {name: breaker.state for name, breaker in self._breakers.items()}
+
+    def stats(self) -> dict[str, BreakerStats]:
+        """
+        Статистика предохранителей по шаблонам маршрутов
+        """
+        return {name: breaker.stats() for name, breaker in self._breakers.items()}
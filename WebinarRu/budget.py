@@ -0,0 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from .exceptions import RequestTimeoutError
+
+
+__all__ = [
+    "deadline",
+    "remaining_time",
+]
+
+
+# Абсолютное время (loop.time()) окончания бюджета текущей операции
+_deadline: ContextVar[Optional[float]] = ContextVar("webinarru_deadline", default=None)
+
+
+@asynccontextmanager
+async def deadline(seconds: float):
+    """
+    Ограничивает время выполнения блока. Оставшийся бюджет передаётся во все запросы,
+    выполняемые внутри блока (в том числе в задачах, созданных через asyncio.gather/create_task),
+    и ограничивает их таймауты. По истечении бюджета блок отменяется и бросается RequestTimeoutError.
+    Вложенный deadline не может продлить внешний.
+    @param seconds: бюджет времени в секундах
+    """
+    loop = asyncio.get_running_loop()
+    when = loop.time() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        when = min(when, outer)
+    token = _deadline.set(when)
+    try:
+        async with asyncio.timeout_at(when) as cm:
+            try:
+                yield
+            finally:
+                _deadline.reset(token)
+    except TimeoutError as e:
+        if cm.expired() and not isinstance(e, RequestTimeoutError):
+            raise RequestTimeoutError(f"Deadline of {seconds}s exceeded") from e
+        raise
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Оставшийся бюджет времени текущего deadline()
+    @return: секунды или None, если бюджет не задан
+    """
+    when = _deadline.get()
+    if when is None:
+        return None
+    return max(when - asyncio.get_running_loop().time(), 0.0)
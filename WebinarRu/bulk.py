@@ -0,0 +1,196 @@
+import asyncio
+import json
+import os
+from typing import Optional, Sequence, Literal, Any, Callable, Awaitable
+
+from .models import WebinarSpec, BulkItemResult, CreatedEvent, CreatedEventSession
+
+
+__all__ = [
+    "RollbackMode",
+    "BulkJournal",
+    "BulkWebinarCreator",
+]
+
+
+RollbackMode = Literal["item", "all", "none"]
+
+
+class BulkJournal:
+    """
+    Журнал массового создания: ключ WebinarSpec -> созданная серия и вебинары.
+    Повторный запуск с тем же журналом не создаёт серии повторно: завершённые элементы пропускаются,
+    незавершённые досоздаются. Если задан path, журнал сохраняется в JSON файл после каждого изменения.
+    """
+    def __init__(self, path: Optional[str | os.PathLike] = None):
+        """
+        @param path: файл журнала. По умолчанию журнал хранится только в памяти
+        """
+        self.path = os.fspath(path) if path is not None else None
+        self._entries: dict[str, dict] = {}
+        if self.path is not None and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as file:
+                self._entries = json.load(file)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._entries.get(key)
+
+    def record(self, key: str, entry: dict):
+        self._entries[key] = entry
+        self._save()
+
+    def drop(self, key: str):
+        if self._entries.pop(key, None) is not None:
+            self._save()
+
+    def _save(self):
+        if self.path is None:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(self._entries, file, ensure_ascii=False, indent=1)
+        os.replace(temporary, self.path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BulkWebinarCreator:
+    """
+    Массовое создание мероприятий: сначала параллельно создаются все серии, затем их вебинары.
+    При ошибке созданная серия удаляется через delete_event (rollback="item"),
+    либо удаляются все серии, созданные в этом запуске (rollback="all"). Серии, восстановленные из журнала
+    предыдущих запусков, rollback="all" не затрагивает.
+    """
+    def __init__(
+            self,
+            api,
+            concurrency: int = 10,
+            journal: Optional[BulkJournal] = None,
+            rollback: RollbackMode = "item",
+    ):
+        """
+        @param api: экземпляр WebinarAPI
+        @param concurrency: максимальное количество одновременных запросов
+        @param journal: журнал идемпотентности. По умолчанию — в памяти
+        @param rollback: item — удалять серию элемента с ошибкой; all — при любой ошибке удалить все серии,
+        созданные в этом запуске; none — ничего не удалять (повторный запуск досоздаст вебинары)
+        """
+        if rollback not in ("item", "all", "none"):
+            raise ValueError(f"Unknown rollback mode: {rollback}")
+        self.api = api
+        self.journal = journal if journal is not None else BulkJournal()
+        self.rollback = rollback
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _call(self, func: Callable[..., Awaitable[Any]], **kwargs) -> tuple[Any, Optional[str]]:
+        async with self._semaphore:
+            try:
+                result = await func(**kwargs)
+            except Exception as e:
+                return None, f"{type(e).__name__}: {e}"
+        if result is None:
+            return None, f"{func.__name__} returned no result"
+        return result, None
+
+    async def _create_event(self, spec: WebinarSpec) -> tuple[Optional[CreatedEvent], Optional[str]]:
+        entry = self.journal.get(spec.key)
+        if entry is not None:
+            return CreatedEvent(**entry["event"]), None
+        event, error = await self._call(self.api.create_event, **spec.event)
+        if event is not None:
+            self.journal.record(spec.key, {
+                "event": event.model_dump(),
+                "sessions": [None] * len(spec.sessions),
+                "complete": False,
+            })
+        return event, error
+
+    async def _create_sessions(self, spec: WebinarSpec, event: CreatedEvent) -> Optional[str]:
+        entry = self.journal.get(spec.key)
+        sessions = entry["sessions"]
+
+        async def create(index: int) -> Optional[str]:
+            if sessions[index] is not None:
+                return None
+            session, error = await self._call(
+                self.api.create_event_session, event_id=event.eventId, **spec.sessions[index]
+            )
+            if session is not None:
+                sessions[index] = session.model_dump()
+                self.journal.record(spec.key, entry)
+            return error
+
+        errors = [error for error in await asyncio.gather(*(create(index) for index in range(len(sessions)))) if error]
+        if errors:
+            return "; ".join(errors)
+        entry["complete"] = True
+        self.journal.record(spec.key, entry)
+        return None
+
+    async def _roll_back(self, key: str, event: CreatedEvent) -> Optional[str]:
+        deleted, error = await self._call(self.api.delete_event, event_id=event.eventId)
+        if deleted:
+            self.journal.drop(key)
+            return None
+        return error or "delete_event returned False"
+
+    def _result(self, key: str, status: str, event: Optional[CreatedEvent] = None, error: Optional[str] = None):
+        entry = self.journal.get(key)
+        sessions = [CreatedEventSession(**session) for session in entry["sessions"] if session] if entry else []
+        return BulkItemResult(key=key, status=status, event=event, sessions=sessions, error=error)
+
+    async def run(self, specs: Sequence[WebinarSpec]) -> list[BulkItemResult]:
+        """
+        Создать мероприятия
+        @param specs: описания мероприятий с уникальными ключами
+        @return: результат по каждому элементу в порядке specs
+        """
+        keys = [spec.key for spec in specs]
+        if len(set(keys)) != len(keys):
+            raise ValueError("WebinarSpec keys must be unique")
+
+        results: dict[str, BulkItemResult] = {}
+        pending = []
+        for spec in specs:
+            entry = self.journal.get(spec.key)
+            if entry is not None and entry["complete"]:
+                results[spec.key] = self._result(spec.key, "existing", CreatedEvent(**entry["event"]))
+            else:
+                pending.append(spec)
+
+        # Серии, которых нет в журнале, создаются в этом запуске. Только их удаляет rollback="all":
+        # серии из журнала принадлежат предыдущим запускам
+        fresh = {spec.key for spec in pending if self.journal.get(spec.key) is None}
+        events = await asyncio.gather(*(self._create_event(spec) for spec in pending))
+        created = [(spec, event) for spec, (event, error) in zip(pending, events) if event is not None]
+        for spec, (event, error) in zip(pending, events):
+            if event is None:
+                results[spec.key] = self._result(spec.key, "failed", error=error)
+
+        errors = await asyncio.gather(*(self._create_sessions(spec, event) for spec, event in created))
+        for (spec, event), error in zip(created, errors):
+            results[spec.key] = self._result(spec.key, "created" if error is None else "failed", event, error)
+
+        failed = any(result.status == "failed" for result in results.values())
+        if self.rollback == "item":
+            to_roll_back = [(spec, event) for (spec, event), error in zip(created, errors) if error is not None]
+        elif self.rollback == "all" and failed:
+            to_roll_back = [(spec, event) for spec, event in created if spec.key in fresh]
+        else:
+            to_roll_back = []
+        rollback_errors = await asyncio.gather(*(self._roll_back(spec.key, event) for spec, event in to_roll_back))
+        for (spec, event), rollback_error in zip(to_roll_back, rollback_errors):
+            previous = results[spec.key].error
+            if rollback_error is None:
+                results[spec.key] = BulkItemResult(
+                    key=spec.key, status="rolled_back", event=event, error=previous or "rolled back with the batch"
+                )
+            else:
+                results[spec.key] = self._result(
+                    spec.key, "failed", event, f"{previous or 'batch failed'}; rollback failed: {rollback_error}"
+                )
+        return [results[spec.key] for spec in specs]
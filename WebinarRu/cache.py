@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Mapping
+
+from multidict import CIMultiDict
+
+from .transport import TransportResponse
+
+
+__all__ = [
+    "CachedResponse",
+    "DiskCache",
+    "cache_key",
+]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+# Заголовки ответа, которые сохраняются вместе с телом
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def cache_key(method: str, url: str, params: Optional[Mapping] = None, headers: Optional[Mapping[str, str]] = None) -> str:
+    """
+    Ключ кэша запроса. В ключ входят заголовки запроса (в том числе токен),
+    поэтому ответы разных организаций не смешиваются. Сам токен в базе не хранится
+    @param method: HTTP метод
+    @param url: адрес
+    @param params: параметры строки запроса
+    @param headers: заголовки запроса
+    @return: SHA-256 hex
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{method} {url}\n".encode())
+    for name, value in sorted((str(name), str(value)) for name, value in (params or {}).items()):
+        digest.update(f"{name}={value}\n".encode())
+    for name, value in sorted((str(name).lower(), str(value)) for name, value in (headers or {}).items()):
+        digest.update(f"{name}: {value}\n".encode())
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Mapping[str, str]
+    body: bytes
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """
+        Заголовки условного запроса
+        """
+        result = {}
+        if self.etag:
+            result["If-None-Match"] = self.etag
+        if self.last_modified:
+            result["If-Modified-Since"] = self.last_modified
+        return result
+
+    def to_response(self) -> TransportResponse:
+        return TransportResponse(200, CIMultiDict(self.headers), self.body)
+
+
+class DiskCache:
+    """
+    Кэш GET ответов в SQLite. Сохраняются только ответы с ETag или Last-Modified:
+    при повторном запросе отправляются If-None-Match / If-Modified-Since, и ответ 304 заменяется телом из кэша.
+    Размер базы ограничен max_bytes, при превышении удаляются давно не использованные записи.
+    Базу можно использовать одновременно из нескольких процессов (WAL, ожидание блокировки busy_timeout).
+    Методы синхронные, BaseAPI вызывает их в отдельном потоке.
+    """
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, busy_timeout: float = 30.0):
+        """
+        @param path: файл базы
+        @param max_bytes: максимальный суммарный размер тел ответов
+        @param busy_timeout: сколько секунд ждать блокировку базы другим процессом
+        """
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Сохранённый ответ
+        @param key: ключ (cache_key)
+        @return: ответ или None
+        """
+        row = self._connect().execute(
+            "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body = row
+        return CachedResponse(etag, last_modified, json.loads(headers), body)
+
+    def touch(self, key: str):
+        """
+        Отмечает использование записи (для вытеснения давно не использованных)
+        """
+        self._connect().execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+
+    def put(self, key: str, response: TransportResponse) -> bool:
+        """
+        Сохраняет ответ, если у него есть ETag или Last-Modified и он не запрещает хранение
+        @param key: ключ (cache_key)
+        @param response: ответ
+        @return: сохранён ли ответ
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if not (etag or last_modified) or "no-store" in cache_control:
+            return False
+        size = len(response.body)
+        if size > self.max_bytes:
+            return False
+        headers = {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers}
+        now = time.time()
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, etag, last_modified, headers, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(headers), response.body, size, now, now),
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return True
+
+    def _evict(self, connection: sqlite3.Connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        connection.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def delete(self, key: str):
+        self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connect().execute("DELETE FROM responses")
+
+    @property
+    def size(self) -> int:
+        """
+        Суммарный размер сохранённых тел ответов
+        """
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        """
+        Закрывает соединения с базой. После закрытия кэш можно использовать снова
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for connection in connections:
+            connection.close()
@@ -0,0 +1,407 @@
+"""
+Выгрузка данных webinar.ru из командной строки.
+
+    webinarru events --from 2024-01-01 --to 2024-02-01 -o events.ndjson
+    webinarru participations --from 2024-01-01 --concurrency 20 --rps 10 -o participations.csv
+    webinarru chat --from 2024-01-01 --concurrency 50 --adaptive -o chat.ndjson
+    webinarru stats --from 2024-01-01 --format parquet -o stats.parquet
+
+Токен берётся из --token или переменной окружения WEBINARRU_TOKEN. Строки записываются по мере загрузки,
+прогресс и скорость выводятся в stderr. Если часть запросов завершилась ошибкой, код возврата — 1.
+"""
+import argparse
+import asyncio
+import csv
+import datetime
+import io
+import json
+import os
+import sys
+import time
+from typing import Optional, Any, AsyncIterator, Callable, Awaitable
+
+from .adaptive import AdaptiveLimiter, AdaptiveTransport
+from .exceptions import WebinarAPIError
+from .models import Event
+from .ratelimit import RateLimiter, RateLimitedTransport
+from .transport import AiohttpTransport
+from .webinar_api import WebinarAPI
+
+
+__all__ = [
+    "main",
+]
+
+
+FORMATS = ("ndjson", "csv", "parquet")
+EVENTS_PAGE = 250
+RECORDS_PAGE = 100
+PARQUET_BATCH = 10_000
+QUEUE_SIZE = 10_000
+
+_DONE = object()
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class NdjsonWriter:
+    def __init__(self, stream: io.BufferedIOBase):
+        self.stream = stream
+
+    def write(self, row: dict):
+        self.stream.write(json.dumps(row, ensure_ascii=False).encode() + b"\n")
+
+    def close(self):
+        self.stream.flush()
+
+
+class CsvWriter:
+    """
+    Колонки берутся из первой строки, вложенные значения записываются как JSON
+    """
+    def __init__(self, stream: io.BufferedIOBase):
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="", write_through=True)
+        self.writer: Optional[csv.DictWriter] = None
+
+    def write(self, row: dict):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.text, fieldnames=list(row), extrasaction="ignore")
+            self.writer.writeheader()
+        self.writer.writerow({key: _cell(value) for key, value in row.items()})
+
+    def close(self):
+        self.text.flush()
+        self.text.detach()
+
+
+class ParquetWriter:
+    """
+    Строки записываются группами по PARQUET_BATCH. Схема определяется по первой группе:
+    вложенные значения записываются как JSON, колонки без значений — как строки
+    """
+    def __init__(self, stream: io.BufferedIOBase):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.stream = stream
+        self.writer = None
+        self.schema = None
+        self.rows: list[dict] = []
+
+    def write(self, row: dict):
+        self.rows.append({key: _cell(value) for key, value in row.items()})
+        if len(self.rows) >= PARQUET_BATCH:
+            self._flush()
+
+    def _flush(self):
+        if not self.rows:
+            return
+        if self.schema is None:
+            inferred = self.pa.Table.from_pylist(self.rows).schema
+            self.schema = self.pa.schema([
+                self.pa.field(field.name, self.pa.string()) if self.pa.types.is_null(field.type) else field
+                for field in inferred
+            ])
+            self.writer = self.pq.ParquetWriter(self.stream, self.schema)
+        strings = [field.name for field in self.schema if self.pa.types.is_string(field.type)]
+        for row in self.rows:
+            for name in strings:
+                value = row.get(name)
+                if value is not None and not isinstance(value, str):
+                    row[name] = str(value)
+        self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.rows = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+        self.stream.flush()
+
+
+_WRITERS = {
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+}
+
+
+class Progress:
+    """
+    Счётчики выгрузки с периодическим выводом в stderr
+    """
+    def __init__(self, interval: float = 1.0, quiet: bool = False, limiter: Optional[AdaptiveLimiter] = None):
+        self.interval = interval
+        self.quiet = quiet
+        self.limiter = limiter
+        self.rows = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self._printed = self.started
+
+    def row(self):
+        self.rows += 1
+        now = time.monotonic()
+        if now - self._printed >= self.interval:
+            self._printed = now
+            self.report()
+
+    def error(self, what: str, e: Exception):
+        self.errors += 1
+        print(f"error: {what}: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def report(self, final: bool = False):
+        if self.quiet and not final:
+            return
+        elapsed = time.monotonic() - self.started
+        rate = self.rows / elapsed if elapsed else 0.0
+        limit = f", concurrency {self.limiter.limit}" if self.limiter is not None else ""
+        print(f"{'done' if final else 'progress'}: {self.rows} rows, {rate:.0f} rows/s, {elapsed:.1f}s, "
+              f"{self.errors} errors{limit}", file=sys.stderr)
+
+
+class Exporter:
+    """
+    Источники строк для подкоманд. Независимые части (вебинары, серии) загружаются параллельно
+    не больше concurrency одновременно, строки передаются записи через ограниченную очередь
+    """
+    def __init__(
+            self,
+            api: WebinarAPI,
+            date_from: Optional[datetime.datetime],
+            date_to: Optional[datetime.datetime],
+            concurrency: int,
+            progress: Progress,
+    ):
+        self.api = api
+        self.date_from = date_from
+        self.date_to = date_to
+        self.concurrency = concurrency
+        self.progress = progress
+
+    async def _guard(self, what: str, coroutine: Awaitable) -> Any:
+        try:
+            return await coroutine
+        except (WebinarAPIError, asyncio.TimeoutError, ConnectionError) as e:
+            self.progress.error(what, e)
+            return None
+
+    async def iter_events(self) -> AsyncIterator[Event]:
+        page = 1
+        while True:
+            events = await self._guard(f"events page {page}", self.api.get_events(
+                date_from=self.date_from, date_to=self.date_to, page=page, per_page=EVENTS_PAGE
+            ))
+            if not events:
+                return
+            for event in events:
+                yield event
+            if len(events) < EVENTS_PAGE:
+                return
+            page += 1
+
+    async def _fan_out(
+            self,
+            items: AsyncIterator,
+            produce: Callable[[Any, asyncio.Queue], Awaitable[None]],
+    ) -> AsyncIterator[dict]:
+        """
+        Для каждого элемента items запускает produce (не больше concurrency одновременно)
+        и отдаёт строки, которые они кладут в очередь
+        """
+        rows: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+        tasks: asyncio.Queue = asyncio.Queue(self.concurrency)
+
+        async def worker():
+            while (item := await tasks.get()) is not _DONE:
+                await produce(item, rows)
+
+        async def feed():
+            try:
+                async for item in items:
+                    await tasks.put(item)
+            finally:
+                for _ in range(self.concurrency):
+                    await tasks.put(_DONE)
+
+        async def run():
+            try:
+                await asyncio.gather(feed(), *(worker() for _ in range(self.concurrency)))
+            finally:
+                await rows.put(_DONE)
+
+        runner = asyncio.ensure_future(run())
+        try:
+            while (row := await rows.get()) is not _DONE:
+                yield row
+            await runner
+        finally:
+            runner.cancel()
+
+    async def _sessions(self) -> AsyncIterator[tuple[Event, Any]]:
+        async for event in self.iter_events():
+            for session in event.eventSessions or ():
+                yield event, session
+
+    async def events(self) -> AsyncIterator[dict]:
+        async for event in self.iter_events():
+            yield event.model_dump(mode="json", exclude={"eventSessions"})
+
+    async def participations(self) -> AsyncIterator[dict]:
+        async def produce(item, rows: asyncio.Queue):
+            event, session = item
+            try:
+                async for participants in self.api.iter_event_session_participations(session.id):
+                    for participant in participants:
+                        await rows.put({
+                            "eventId": event.id,
+                            "eventSessionId": session.id,
+                            **participant.model_dump(mode="json"),
+                        })
+            except (WebinarAPIError, asyncio.TimeoutError, ConnectionError) as e:
+                self.progress.error(f"participations of session {session.id}", e)
+
+        async for row in self._fan_out(self._sessions(), produce):
+            yield row
+
+    async def chat(self) -> AsyncIterator[dict]:
+        async def produce(item, rows: asyncio.Queue):
+            event, session = item
+            messages = await self._guard(f"chat of session {session.id}", self.api.get_chat_messages(session.id))
+            for message in messages or ():
+                await rows.put({"eventId": event.id, "eventSessionId": session.id, **message.model_dump(mode="json")})
+
+        async for row in self._fan_out(self._sessions(), produce):
+            yield row
+
+    async def stats(self) -> AsyncIterator[dict]:
+        async def produce(event: Event, rows: asyncio.Queue):
+            stats = await self._guard(f"stats of event {event.id}", self.api.get_users_stats(
+                date_from=self.date_from, date_to=self.date_to, event_id=event.id
+            ))
+            for row in stats or ():
+                await rows.put({"eventId": event.id, **row.model_dump(mode="json")})
+
+        async for row in self._fan_out(self.iter_events(), produce):
+            yield row
+
+    async def records(self) -> AsyncIterator[dict]:
+        offset = 0
+        while True:
+            records = await self._guard(f"records offset {offset}", self.api.get_records(
+                date_from=self.date_from, date_to=self.date_to, offset=offset, limit=RECORDS_PAGE
+            ))
+            for record in records or ():
+                yield record.model_dump(mode="json", exclude_none=True)
+            if not records or len(records) < RECORDS_PAGE:
+                return
+            offset += RECORDS_PAGE
+
+
+COMMANDS = {
+    "events": "мероприятия за период",
+    "participations": "участники всех вебинаров за период",
+    "chat": "сообщения чатов всех вебинаров за период",
+    "stats": "статистика посещений участников по мероприятиям за период",
+    "records": "онлайн-записи за период",
+}
+
+
+def _date(value: str) -> datetime.datetime:
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r}, expected YYYY-MM-DD[THH:MM]")
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"invalid value: {value!r}, expected a positive integer")
+    return number
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="webinarru", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=list(COMMANDS), help="; ".join(f"{k} — {v}" for k, v in COMMANDS.items()))
+    parser.add_argument("--from", dest="date_from", type=_date, help="start of the period (ISO date)")
+    parser.add_argument("--to", dest="date_to", type=_date, help="end of the period (ISO date)")
+    parser.add_argument("--concurrency", type=_positive_int, default=10, help="simultaneous requests")
+    parser.add_argument("--rps", type=float, help="requests per second limit")
+    parser.add_argument(
+        "--adaptive", action="store_true", help="adjust simultaneous requests up to --concurrency by latency and errors"
+    )
+    parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="output format. Default: by file extension or ndjson")
+    parser.add_argument("--token", default=os.environ.get("WEBINARRU_TOKEN"), help="API token [WEBINARRU_TOKEN]")
+    parser.add_argument("--base-link", default="https://userapi.webinar.ru/v3")
+    parser.add_argument("-q", "--quiet", action="store_true", help="print only the final summary")
+    return parser
+
+
+def _format(args: argparse.Namespace) -> str:
+    if args.format:
+        return args.format
+    extension = os.path.splitext(args.output)[1].lstrip(".").lower()
+    return {"jsonl": "ndjson", "json": "ndjson"}.get(extension, extension if extension in FORMATS else "ndjson")
+
+
+async def export(args: argparse.Namespace) -> int:
+    """
+    Выполнить выгрузку по разобранным аргументам
+    @return: код возврата
+    """
+    limiter = AdaptiveLimiter(initial=min(4, args.concurrency), max_limit=args.concurrency) if args.adaptive else None
+    progress = Progress(quiet=args.quiet, limiter=limiter)
+    transport = AiohttpTransport(connection_limit=args.concurrency)
+    if limiter is not None:
+        transport = AdaptiveTransport(transport, limiter)
+    if args.rps:
+        transport = RateLimitedTransport(transport, RateLimiter(args.rps))
+    stream = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    writer = _WRITERS[_format(args)](stream)
+    try:
+        async with WebinarAPI(args.token, base_link=args.base_link, strict=True, transport=transport) as api:
+            exporter = Exporter(api, args.date_from, args.date_to, args.concurrency, progress)
+            async for row in getattr(exporter, args.command)():
+                writer.write(row)
+                progress.row()
+    finally:
+        await transport.close()
+        writer.close()
+        if stream is not sys.stdout.buffer:
+            stream.close()
+    progress.report(final=True)
+    return 1 if progress.errors else 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    if not args.token:
+        print("error: API token is required (--token or WEBINARRU_TOKEN)", file=sys.stderr)
+        return 2
+    try:
+        return asyncio.run(export(args))
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Получатель stdout закрыл канал (например, head): не выводить ошибку при завершении
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
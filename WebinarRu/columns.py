@@ -0,0 +1,458 @@
+import datetime
+import math
+import sys
+from array import array
+from typing import Optional, Any, Iterable, Iterator, Literal, Mapping, Sequence, Callable, Self
+
+from pydantic import BaseModel
+
+from .models import EventSessionParticipant, EventSessionStats, UserStats
+
+
+__all__ = [
+    "StringPool",
+    "ColumnarCollection",
+    "ParticipantColumns",
+    "SessionStatsColumns",
+    "UserStatsColumns",
+    "total_nbytes",
+]
+
+
+ColumnKind = Literal["int", "float", "bool", "str", "datetime", "object"]
+
+INT_NULL = -2 ** 63
+UTC = datetime.timezone.utc
+
+
+class StringPool:
+    """
+    Таблица интернированных строк. Индекс 0 зарезервирован под None
+    """
+    def __init__(self):
+        self.values: list[Optional[str]] = [None]
+        self._index: dict[str, int] = {}
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.values)
+            self.values.append(sys.intern(value))
+            self._index[value] = index
+        return index
+
+    def find(self, value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return 0
+        return self._index.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(sys.getsizeof(value) for value in self.values) + sys.getsizeof(self._index)
+
+
+def _new_column(kind: ColumnKind):
+    match kind:
+        case "int" | "datetime":
+            return array("q")
+        case "float":
+            return array("d")
+        case "bool":
+            return array("b")
+        case "str":
+            return array("I")
+        case _:
+            return []
+
+
+def _to_epoch(value) -> int:
+    if value is None:
+        return INT_NULL
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp())
+
+
+class ColumnarCollection:
+    """
+    Компактная коллекция строк одной модели: каждое поле хранится в отдельном массиве
+    (целые и даты — array('q'), строки — индексы в общей таблице строк, даты — секунды epoch).
+    Модели создаются только при обращении к строке (model_construct, без повторной валидации).
+    Значения None хранятся как INT_NULL / nan / -1 / индекс 0.
+    """
+    model: type[BaseModel]
+    schema: Mapping[str, ColumnKind]  # поля модели
+    extra: Mapping[str, ColumnKind] = {}  # дополнительные колонки, которых нет в модели (контекст строки)
+
+    def __init__(self, pool: Optional[StringPool] = None):
+        """
+        @param pool: таблица строк. Можно разделять между несколькими коллекциями
+        """
+        self.pool = pool if pool is not None else StringPool()
+        self.kinds: dict[str, ColumnKind] = {**self.schema, **self.extra}
+        self.columns: dict[str, Any] = {name: _new_column(kind) for name, kind in self.kinds.items()}
+        self._length = 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping | BaseModel], pool: Optional[StringPool] = None, **extra) -> Self:
+        """
+        Создаёт коллекцию из словарей ответа API или моделей
+        @param rows: строки
+        @param pool: таблица строк
+        @param extra: значения дополнительных колонок для всех строк
+        @return: коллекция
+        """
+        collection = cls(pool)
+        collection.extend(rows, **extra)
+        return collection
+
+    def _prepare(self, row: Mapping) -> Mapping:
+        """
+        Точка расширения для вычисляемых колонок
+        """
+        return row
+
+    def append(self, row: Mapping | BaseModel, **extra):
+        """
+        Добавляет строку
+        @param row: словарь ответа API или модель
+        @param extra: значения дополнительных колонок
+        """
+        if isinstance(row, BaseModel):
+            row = row.__dict__
+        row = self._prepare(row)
+        pool = self.pool
+        for name, kind in self.kinds.items():
+            value = extra[name] if name in extra else row.get(name)
+            column = self.columns[name]
+            match kind:
+                case "int":
+                    column.append(INT_NULL if value is None else int(value))
+                case "float":
+                    column.append(math.nan if value is None else float(value))
+                case "bool":
+                    column.append(-1 if value is None else int(bool(value)))
+                case "str":
+                    column.append(pool.add(value))
+                case "datetime":
+                    column.append(_to_epoch(value))
+                case _:
+                    column.append(value if value != [] else None)
+        self._length += 1
+
+    def extend(self, rows: Iterable[Mapping | BaseModel], **extra):
+        for row in rows:
+            self.append(row, **extra)
+
+    def concat(self, other: Self):
+        """
+        Дописывает строки другой коллекции того же типа (например, собранной в другом процессе).
+        Строки перекодируются в таблицу строк этой коллекции
+        @param other: коллекция
+        """
+        if type(other) is not type(self):
+            raise TypeError(f"Cannot concat {type(other).__name__} to {type(self).__name__}")
+        remap = None
+        if other.pool is not self.pool:
+            remap = array("I", (self.pool.add(value) for value in other.pool.values))
+        for name, column in self.columns.items():
+            source = other.columns[name]
+            if remap is not None and self.kinds[name] == "str":
+                column.extend(array("I", (remap[index] for index in source)))
+            else:
+                column.extend(source)
+        self._length += other._length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def value(self, name: str, index: int) -> Any:
+        """
+        Значение колонки в строке
+        @param name: колонка
+        @param index: номер строки
+        @return: значение в исходном типе
+        """
+        raw = self.columns[name][index]
+        match self.kinds[name]:
+            case "int":
+                return None if raw == INT_NULL else raw
+            case "float":
+                return None if math.isnan(raw) else raw
+            case "bool":
+                return None if raw < 0 else bool(raw)
+            case "str":
+                return self.pool.values[raw]
+            case "datetime":
+                return None if raw == INT_NULL else datetime.datetime.fromtimestamp(raw, UTC)
+            case _:
+                return raw
+
+    def values(self, name: str) -> list:
+        """
+        Все значения колонки в исходном типе
+        """
+        return [self.value(name, index) for index in range(self._length)]
+
+    def row(self, index: int) -> dict:
+        return {name: self.value(name, index) for name in self.kinds}
+
+    def __getitem__(self, index: int) -> BaseModel:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return self.model.model_construct(**{name: self.value(name, index) for name in self.schema})
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for index in range(self._length):
+            yield self[index]
+
+    def _encode(self, name: str, value: Any) -> Any:
+        match self.kinds[name]:
+            case "int":
+                return INT_NULL if value is None else value
+            case "bool":
+                return -1 if value is None else int(bool(value))
+            case "str":
+                return self.pool.find(value)
+            case "datetime":
+                return _to_epoch(value)
+            case _:
+                return value
+
+    def where(self, predicates: Optional[Mapping[str, Callable[[Any], bool]]] = None, /, **equals) -> array:
+        """
+        Номера строк, удовлетворяющих условиям. Сравнение на равенство выполняется по закодированным значениям
+        без создания моделей.
+        @param predicates: колонка -> функция от исходного значения, например {"registerDate": lambda d: d.year == 2024}
+        @param equals: условия равенства, например visited=True, role="GUEST"
+        @return: массив номеров строк
+        """
+        indices = range(self._length)
+        for column_name, expected in equals.items():
+            encoded = self._encode(column_name, expected)
+            if encoded is None and self.kinds[column_name] == "str":
+                return array("q")
+            column = self.columns[column_name]
+            indices = [index for index in indices if column[index] == encoded]
+        for column_name, predicate in (predicates or {}).items():
+            indices = [index for index in indices if predicate(self.value(column_name, index))]
+        return array("q", indices)
+
+    def filter(self, predicates: Optional[Mapping[str, Callable[[Any], bool]]] = None, /, **equals) -> Self:
+        """
+        Новая коллекция со строками, удовлетворяющими условиям (см. where). Таблица строк общая.
+        """
+        return self.take(self.where(predicates, **equals))
+
+    def take(self, indices: Iterable[int]) -> Self:
+        """
+        Новая коллекция из выбранных строк
+        """
+        result = type(self)(self.pool)
+        indices = list(indices)
+        for name, column in self.columns.items():
+            if isinstance(column, array):
+                result.columns[name] = array(column.typecode, (column[index] for index in indices))
+            else:
+                result.columns[name] = [column[index] for index in indices]
+        result._length = len(indices)
+        return result
+
+    def group_by(self, name: str) -> dict[Any, array]:
+        """
+        Группировка номеров строк по значению колонки
+        @param name: колонка
+        @return: значение -> массив номеров строк
+        """
+        groups: dict[Any, array] = {}
+        column = self.columns[name]
+        for index in range(self._length):
+            key = column[index]
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = array("q")
+            group.append(index)
+        return {self._decode_key(name, key): group for key, group in groups.items()}
+
+    def _decode_key(self, name: str, raw: Any) -> Any:
+        match self.kinds[name]:
+            case "str":
+                return self.pool.values[raw]
+            case "int" | "datetime":
+                return None if raw == INT_NULL else raw
+            case "bool":
+                return None if raw < 0 else bool(raw)
+            case _:
+                return raw
+
+    def count_by(self, name: str) -> dict[Any, int]:
+        return {key: len(group) for key, group in self.group_by(name).items()}
+
+    def sum_by(self, key: str, column: str) -> dict[Any, float]:
+        """
+        Сумма числовой колонки по группам. Пустые значения пропускаются
+        """
+        values = self.columns[column]
+        null = INT_NULL if self.kinds[column] == "int" else None
+        result = {}
+        for group_key, group in self.group_by(key).items():
+            total = 0
+            for index in group:
+                value = values[index]
+                if value != null and value == value:
+                    total += value
+            result[group_key] = total
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Приблизительный объём памяти коллекции (без общей таблицы строк)
+        """
+        total = 0
+        for column in self.columns.values():
+            if isinstance(column, array):
+                total += column.buffer_info()[1] * column.itemsize
+            else:
+                total += sys.getsizeof(column)
+        return total
+
+
+class ParticipantColumns(ColumnarCollection):
+    """
+    Компактная коллекция EventSessionParticipant. Колонка eventSessionId хранит вебинар строки
+    """
+    model = EventSessionParticipant
+    schema = {
+        "id": "int",
+        "name": "str",
+        "secondName": "str",
+        "email": "str",
+        "isAccepted": "int",
+        "role": "str",
+        "registerStatus": "str",
+        "paymentStatus": "str",
+        "registerDate": "datetime",
+        "additionalFieldValues": "object",
+        "visited": "bool",
+    }
+    extra = {
+        "eventSessionId": "int",
+    }
+
+
+class SessionStatsColumns(ColumnarCollection):
+    """
+    Компактная коллекция EventSessionStats. Список подключений не хранится: вместо него колонки
+    watchDuration (суммарная длительность подключений, сек) и connectionsCount.
+    Колонка userId хранит участника строки
+    """
+    model = EventSessionStats
+    schema = {
+        "id": "int",
+        "name": "str",
+        "startsAt": "datetime",
+        "endsAt": "datetime",
+        "duration": "int",
+        "eventId": "int",
+        "questionCount": "int",
+        "userQuestionCount": "int",
+        "chatMessageCount": "int",
+        "userChatMessageCount": "int",
+        "actualInvolvement": "object",
+        "speechDuration": "int",
+        "percentOfTotalSpeechDuration": "object",
+        "usersReactionClicks": "int",
+        "percentOfTotalReactionClicks": "object",
+        "actualParticipantActivityPercent": "float",
+        "rating": "int",
+        "utms": "object",
+    }
+    extra = {
+        "userId": "int",
+        "watchDuration": "int",
+        "connectionsCount": "int",
+    }
+
+    def _prepare(self, row: Mapping) -> Mapping:
+        connections = row.get("connections") or []
+        return {
+            **row,
+            "watchDuration": sum((connection or {}).get("duration") or 0 for connection in connections),
+            "connectionsCount": len(connections),
+        }
+
+
+class UserStatsColumns(ColumnarCollection):
+    """
+    Компактная коллекция UserStats. Посещённые вебинары хранятся в отдельной коллекции sessions
+    (SessionStatsColumns с колонкой userId) с общей таблицей строк
+    """
+    model = UserStats
+    schema = {
+        "id": "int",
+        "email": "str",
+        "name": "str",
+        "secondName": "str",
+        "patrName": "str",
+        "sex": "str",
+        "phone": "str",
+        "organization": "str",
+        "position": "str",
+    }
+
+    def __init__(self, pool: Optional[StringPool] = None):
+        super().__init__(pool)
+        self.sessions = SessionStatsColumns(self.pool)
+        self._by_user: Optional[dict[Any, array]] = None
+
+    def append(self, row: Mapping | BaseModel, **extra):
+        if isinstance(row, BaseModel):
+            row = row.__dict__
+        super().append(row, **extra)
+        for session in row.get("eventSessions") or []:
+            self.sessions.append(session, userId=row.get("id"))
+        self._by_user = None
+
+    def concat(self, other: Self):
+        super().concat(other)
+        self.sessions.concat(other.sessions)
+        self._by_user = None
+
+    def take(self, indices: Iterable[int]) -> Self:
+        indices = list(indices)
+        result = super().take(indices)
+        users = {self.columns["id"][index] for index in indices}
+        user_column = self.sessions.columns["userId"]
+        result.sessions = self.sessions.take(
+            index for index in range(len(self.sessions)) if user_column[index] in users
+        )
+        return result
+
+    def __getitem__(self, index: int) -> UserStats:
+        user = super().__getitem__(index)
+        if self._by_user is None:
+            self._by_user = self.sessions.group_by("userId")
+        user.eventSessions = [self.sessions[row] for row in self._by_user.get(user.id, ())]
+        return user
+
+    @property
+    def nbytes(self) -> int:
+        return super().nbytes + self.sessions.nbytes
+
+
+def total_nbytes(collections: Sequence[ColumnarCollection]) -> int:
+    """
+    Объём памяти нескольких коллекций с учётом общих таблиц строк
+    """
+    pools = {id(collection.pool): collection.pool for collection in collections}
+    return sum(collection.nbytes for collection in collections) + sum(pool.nbytes for pool in pools.values())
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+from typing import Optional, Iterable, NamedTuple, Sequence
+
+from pydantic import BaseModel
+
+from .models import REGISTRATION_FIELDS
+
+
+__all__ = [
+    "REGISTRATION_FIELDS",
+    "fingerprint",
+    "ParticipantDiff",
+    "Fingerprint",
+    "Differ",
+    "FingerprintStore",
+]
+
+
+def fingerprint(participant: BaseModel, fields: Optional[Sequence[str]] = REGISTRATION_FIELDS) -> int:
+    """
+    Стабильный хэш полей участника: одинаков в разных процессах и запусках (в отличие от hash())
+    @param participant: модель участника
+    @param fields: учитываемые поля. None — все поля модели
+    @return: 64-битное число
+    """
+    if fields is None:
+        payload = json.dumps(participant.model_dump(mode="json"), sort_keys=True, ensure_ascii=False, default=str)
+    else:
+        # repr значений полей (str, int, bool, None, datetime) детерминирован и быстрее json.dumps
+        payload = repr(tuple(getattr(participant, name, None) for name in fields))
+    return int.from_bytes(hashlib.blake2b(payload.encode(), digest_size=8).digest(), "big")
+
+
+class ParticipantDiff(NamedTuple):
+    added: list  # новые участники (модели)
+    removed: set[int]  # id участников, которых больше нет в списке
+    changed: list  # участники с изменёнными полями (модели)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class Fingerprint:
+    """
+    Компактный снимок списка участников: id участника -> хэш учитываемых полей.
+    Сами модели не хранятся, поэтому снимок большого вебинара занимает несколько мегабайт.
+    """
+    def __init__(
+            self,
+            items: Optional[dict[int, int]] = None,
+            fields: Optional[Sequence[str]] = REGISTRATION_FIELDS,
+            key: str = "id",
+    ):
+        """
+        @param items: id -> хэш
+        @param fields: учитываемые поля. None — все поля модели
+        @param key: поле с идентификатором участника
+        """
+        self.items = items if items is not None else {}
+        self.fields = tuple(fields) if fields is not None else None
+        self.key = key
+
+    @classmethod
+    def of(
+            cls,
+            participants: Iterable[BaseModel],
+            fields: Optional[Sequence[str]] = REGISTRATION_FIELDS,
+            key: str = "id",
+    ) -> "Fingerprint":
+        """
+        Снимок списка участников
+        """
+        snapshot = cls(fields=fields, key=key)
+        for participant in participants:
+            snapshot.items[getattr(participant, key)] = fingerprint(participant, snapshot.fields)
+        return snapshot
+
+    def differ(self) -> "Differ":
+        """
+        Сравнение с новой выгрузкой, которая передаётся по страницам
+        """
+        return Differ(self)
+
+    def diff(self, participants: Iterable[BaseModel]) -> tuple[ParticipantDiff, "Fingerprint"]:
+        """
+        Сравнить снимок с новым списком участников за линейное время
+        @return: различия и снимок нового списка
+        """
+        differ = self.differ()
+        differ.feed(participants)
+        return differ.finish()
+
+    def to_dict(self) -> dict:
+        return {
+            "fields": list(self.fields) if self.fields is not None else None,
+            "key": self.key,
+            "items": {str(participant_id): f"{value:016x}" for participant_id, value in self.items.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Fingerprint":
+        return cls(
+            items={int(participant_id): int(value, 16) for participant_id, value in data["items"].items()},
+            fields=data["fields"],
+            key=data["key"],
+        )
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class Differ:
+    """
+    Потоковое сравнение: страницы новой выгрузки передаются в feed по мере загрузки,
+    в памяти остаются только новые и изменённые участники
+    """
+    def __init__(self, previous: Fingerprint):
+        self.previous = previous
+        self.current = Fingerprint(fields=previous.fields, key=previous.key)
+        self.added: list = []
+        self.changed: list = []
+
+    def feed(self, participants: Iterable[BaseModel]):
+        previous = self.previous.items
+        current = self.current.items
+        fields = self.current.fields
+        key = self.current.key
+        for participant in participants:
+            participant_id = getattr(participant, key)
+            value = fingerprint(participant, fields)
+            current[participant_id] = value
+            old = previous.get(participant_id)
+            if old is None:
+                self.added.append(participant)
+            elif old != value:
+                self.changed.append(participant)
+
+    def finish(self) -> tuple[ParticipantDiff, Fingerprint]:
+        """
+        @return: различия и снимок нового списка
+        """
+        removed = self.previous.items.keys() - self.current.items.keys()
+        return ParticipantDiff(self.added, set(removed), self.changed), self.current
+
+
+class FingerprintStore:
+    """
+    Снимки списков участников между запусками в JSON файле: ключ (например, id вебинара) -> Fingerprint.
+    Файл перезаписывается атомарно в save()
+    """
+    def __init__(self, path: Optional[str] = None):
+        """
+        @param path: файл снимков. По умолчанию снимки хранятся только в памяти
+        """
+        self.path = os.fspath(path) if path is not None else None
+        self._snapshots: dict[str, Fingerprint] = {}
+        if self.path is not None and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as file:
+                self._snapshots = {key: Fingerprint.from_dict(data) for key, data in json.load(file).items()}
+
+    def get(
+            self,
+            key: str | int,
+            fields: Optional[Sequence[str]] = REGISTRATION_FIELDS,
+            id_field: str = "id",
+    ) -> Fingerprint:
+        """
+        Снимок по ключу. Если снимка нет или он снят по другим полям, возвращается пустой снимок:
+        все участники новой выгрузки окажутся добавленными
+        """
+        snapshot = self._snapshots.get(str(key))
+        expected = tuple(fields) if fields is not None else None
+        if snapshot is None or snapshot.fields != expected or snapshot.key != id_field:
+            return Fingerprint(fields=fields, key=id_field)
+        return snapshot
+
+    def put(self, key: str | int, snapshot: Fingerprint):
+        self._snapshots[str(key)] = snapshot
+
+    def save(self):
+        if self.path is None:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({key: snapshot.to_dict() for key, snapshot in self._snapshots.items()}, file)
+        os.replace(temporary, self.path)
+
+    def __contains__(self, key: str | int) -> bool:
+        return str(key) in self._snapshots
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
@@ -0,0 +1,93 @@
+from typing import Optional
+
+
+__all__ = [
+    "WebinarAPIError",
+    "RateLimitedError",
+    "NotFoundError",
+    "AuthError",
+    "ServerError",
+    "RequestTimeoutError",
+    "APIConnectionError",
+    "CircuitOpenError",
+    "error_for_status",
+]
+
+
+class WebinarAPIError(Exception):
+    """
+    Базовая ошибка клиента. Бросается только в строгом режиме (strict=True).
+    """
+    def __init__(
+            self,
+            message: str = "",
+            status: Optional[int] = None,
+            route: Optional[str] = None,
+            body: Optional[str] = None,
+    ):
+        super().__init__(message or f"{status} {route}")
+        self.status = status  # HTTP статус ответа (None если ответа не было)
+        self.route = route  # маршрут запроса
+        self.body = body  # тело ответа платформы
+
+    def __repr__(self):
+        return f"{type(self).__name__}(status={self.status!r}, route={self.route!r})"
+
+
+class RateLimitedError(WebinarAPIError):
+    """429 — превышен лимит запросов"""
+    def __init__(self, *args, retry_after: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after  # значение заголовка Retry-After в секундах
+
+
+class NotFoundError(WebinarAPIError):
+    """404 — объект не найден"""
+
+
+class AuthError(WebinarAPIError):
+    """401/403 — неверный токен или нет доступа"""
+
+
+class ServerError(WebinarAPIError):
+    """5xx — ошибка на стороне платформы"""
+
+
+class RequestTimeoutError(WebinarAPIError, TimeoutError):
+    """Истекло время ожидания ответа или бюджет времени deadline()"""
+
+
+class APIConnectionError(WebinarAPIError):
+    """Платформа недоступна"""
+
+
+class CircuitOpenError(WebinarAPIError):
+    """Предохранитель маршрута разомкнут: запрос отклонён без обращения к API"""
+    def __init__(self, *args, retry_after: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after  # секунд до пробных запросов
+
+
+def error_for_status(
+        status: int,
+        route: str,
+        body: Optional[str] = None,
+        retry_after: Optional[float] = None,
+) -> WebinarAPIError:
+    """
+    Подбирает класс ошибки по HTTP статусу
+    @param status: HTTP статус
+    @param route: маршрут запроса
+    @param body: тело ответа
+    @param retry_after: значение Retry-After
+    @return: экземпляр ошибки
+    """
+    if status == 429:
+        return RateLimitedError(status=status, route=route, body=body, retry_after=retry_after)
+    if status == 404:
+        return NotFoundError(status=status, route=route, body=body)
+    if status in (401, 403):
+        return AuthError(status=status, route=route, body=body)
+    if status >= 500:
+        return ServerError(status=status, route=route, body=body)
+    return WebinarAPIError(status=status, route=route, body=body)
@@ -0,0 +1,144 @@
+import asyncio
+import datetime
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Iterable, Callable, AsyncIterator
+
+from .models import File
+
+
+__all__ = [
+    "CrawlStats",
+    "FileCrawler",
+]
+
+
+QUEUE_SIZE = 1000
+
+
+@dataclass
+class CrawlStats:
+    folders: int = 0  # просмотрено папок
+    files: int = 0  # отдано файлов
+    failed: list[Optional[int]] = field(default_factory=list)  # папки, которые не удалось получить
+
+
+def _naive(value: datetime.datetime, bound: datetime.datetime) -> datetime.datetime:
+    # Граница без часового пояса сравнивается с локальным временем платформы
+    if bound.tzinfo is None and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+class FileCrawler:
+    """
+    Обход файлового хранилища (/fileSystem/files) в ширину: папки одного уровня запрашиваются параллельно,
+    не больше concurrency одновременно, каждая папка — один раз. Файлы отдаются по мере загрузки
+    через ограниченную очередь. В памяти остаются идентификаторы просмотренных папок и папок следующего уровня.
+    При выходе из цикла обход останавливается, незавершённые запросы отменяются.
+    """
+    def __init__(
+            self,
+            api,
+            concurrency: int = 10,
+            formats: Optional[Iterable[str]] = None,
+            created_from: Optional[datetime.datetime] = None,
+            created_to: Optional[datetime.datetime] = None,
+            predicate: Optional[Callable[[File], bool]] = None,
+            include_folders: bool = False,
+            user: Optional[int] = None,
+            is_shared: Optional[bool] = None,
+    ):
+        """
+        @param api: экземпляр WebinarAPI
+        @param concurrency: максимальное количество одновременных запросов
+        @param formats: расширения файлов, например ["mp4", "pdf"]. По умолчанию — все
+        @param created_from: только файлы, созданные не раньше
+        @param created_to: только файлы, созданные раньше
+        @param predicate: дополнительный фильтр файлов
+        @param include_folders: отдавать также сами папки (фильтры к ним не применяются)
+        @param user: ID сотрудника организации
+        @param is_shared: обход общей папки
+        """
+        self.api = api
+        self.concurrency = concurrency
+        self.formats = {item.lower().lstrip(".") for item in formats} if formats is not None else None
+        self.created_from = created_from
+        self.created_to = created_to
+        self.predicate = predicate
+        self.include_folders = include_folders
+        self.user = user
+        self.is_shared = is_shared
+        self.stats = CrawlStats()
+
+    def _matches(self, file: File) -> bool:
+        if self.formats is not None and (file.format or "").lower() not in self.formats:
+            return False
+        if self.created_from is not None or self.created_to is not None:
+            if file.createAt is None:
+                return False
+            if self.created_from is not None and _naive(file.createAt, self.created_from) < self.created_from:
+                return False
+            if self.created_to is not None and _naive(file.createAt, self.created_to) >= self.created_to:
+                return False
+        return self.predicate is None or self.predicate(file)
+
+    async def crawl(self, root: Optional[int] = None) -> AsyncIterator[File]:
+        """
+        Обойти хранилище
+        @param root: id папки, с которой начинается обход. По умолчанию — корневая папка
+        """
+        self.stats = CrawlStats()
+        visited: set[Optional[int]] = {root}
+        pending: deque[Optional[int]] = deque([root])
+        output: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+        done = object()
+
+        async def list_folder(folder_id: Optional[int]):
+            items = await self.api.get_files(
+                user=self.user,
+                parent=str(folder_id) if folder_id is not None else None,
+                is_shared=self.is_shared,
+            )
+            self.stats.folders += 1
+            if items is None:
+                self.stats.failed.append(folder_id)
+                return
+            for item in items:
+                if item.type == "folder":
+                    if item.id is not None and item.id not in visited:
+                        visited.add(item.id)
+                        pending.append(item.id)
+                    if self.include_folders:
+                        await output.put(item)
+                elif self._matches(item):
+                    await output.put(item)
+
+        async def walk():
+            # Уровни обходятся по очереди, папки уровня — параллельно
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def limited(folder_id: Optional[int]):
+                async with semaphore:
+                    await list_folder(folder_id)
+
+            try:
+                while pending:
+                    level = list(pending)
+                    pending.clear()
+                    await asyncio.gather(*(limited(folder_id) for folder_id in level))
+            finally:
+                # После отмены очередь никто не читает: ожидание свободного места в ней не закончилось бы
+                if not asyncio.current_task().cancelling():
+                    await output.put(done)
+
+        walker = asyncio.ensure_future(walk())
+        try:
+            while (item := await output.get()) is not done:
+                if item.type != "folder":
+                    self.stats.files += 1
+                yield item
+            await walker
+        finally:
+            walker.cancel()
+            await asyncio.gather(walker, return_exceptions=True)
@@ -0,0 +1,348 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Iterable, Callable, Awaitable, Sequence, Literal
+
+from .models import Member, Contact, EventParticipant, EventSessionParticipant
+
+
+__all__ = [
+    "normalize_email",
+    "normalize_phone",
+    "Identity",
+    "IdentityIndex",
+]
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    if not email:
+        return None
+    return email.strip().lower() or None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """
+    Только цифры; российский номер с 8 в начале приводится к 7
+    """
+    if not phone:
+        return None
+    digits = "".join(char for char in phone if char.isdigit())
+    if len(digits) == 11 and digits[0] == "8":
+        digits = "7" + digits[1:]
+    return digits or None
+
+
+@dataclass
+class Identity:
+    user_id: Optional[int] = None  # UserID на платформе
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    name: Optional[str] = None
+    second_name: Optional[str] = None
+    sources: set[str] = field(default_factory=set)  # member, contact, participant
+    contact_ids: set[int] = field(default_factory=set)
+    participation_ids: set[int] = field(default_factory=set)
+
+
+class IdentityIndex:
+    """
+    Индекс пользователей организации по email, телефону и userId. Сотрудники, контакты и участники
+    мероприятий выгружаются постранично параллельными запросами, после чего пакетные поиски
+    выполняются в памяти. Записи из разных источников объединяются по userId, email или телефону.
+    Промахи догружаются точечными запросами (get_members(email=...) и search_contacts),
+    refresh() повторно выгружает источники и дополняет индекс, не перестраивая его.
+    Источники, которые не удалось выгрузить полностью, перечислены в failed; load() и refresh() возвращают False.
+
+        index = IdentityIndex(webinar, event_ids=[1, 2])
+        await index.load()
+        user_ids = await index.user_ids(emails)
+    """
+    def __init__(
+            self,
+            api,
+            members: bool = True,
+            contacts: bool = True,
+            event_ids: Iterable[int] = (),
+            event_session_ids: Iterable[int] = (),
+            per_page: Literal[10, 50, 100, 250, 500] = 500,
+            concurrency: int = 10,
+    ):
+        """
+        @param api: экземпляр WebinarAPI
+        @param members: загружать сотрудников организации
+        @param contacts: загружать адресную книгу
+        @param event_ids: серии, участники которых загружаются
+        @param event_session_ids: вебинары, участники которых загружаются
+        @param per_page: размер страницы
+        @param concurrency: максимальное количество одновременных запросов
+        """
+        self.api = api
+        self.members = members
+        self.contacts = contacts
+        self.event_ids = list(event_ids)
+        self.event_session_ids = list(event_session_ids)
+        self.per_page = per_page
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._by_user_id: dict[int, Identity] = {}
+        self._by_email: dict[str, Identity] = {}
+        self._by_phone: dict[str, Identity] = {}
+        # Загруженные серии и вебинары: refresh(incremental) загружает только новые
+        self._loaded_events: set[int] = set()
+        self._loaded_sessions: set[int] = set()
+        # Ключи, не найденные и точечными запросами (до следующего refresh)
+        self._missing: set[tuple[str, str]] = set()
+        # Не выгруженные источники: members, contacts, event:<id>, session:<id>
+        self.failed: set[str] = set()
+
+    async def _call(self, func: Callable[..., Awaitable], *args, **kwargs):
+        async with self._semaphore:
+            return await func(*args, **kwargs)
+
+    async def _pages(self, fetch: Callable[[int], Awaitable[Optional[Sequence]]]) -> Optional[list]:
+        """
+        Загружает страницы по порядку, заранее запрашивая следующие. Окно упреждения растёт вдвое после
+        каждой полной страницы (до concurrency), поэтому короткие списки не порождают лишних запросов.
+        На первой неполной странице загрузка заканчивается, запросы следующих страниц отменяются
+        @return: элементы всех страниц или None, если какая-то страница не получена
+        """
+        result = []
+        window: deque[asyncio.Future] = deque()
+        width = 1
+        page = 1
+        try:
+            while True:
+                while len(window) < width:
+                    window.append(asyncio.ensure_future(self._call(fetch, page)))
+                    page += 1
+                chunk = await window.popleft()
+                if chunk is None:
+                    return None
+                result.extend(chunk)
+                if len(chunk) < self.per_page:
+                    return result
+                width = min(width * 2, self.concurrency)
+        finally:
+            for task in window:
+                task.cancel()
+
+    def _find(self, user_id: Optional[int], email: Optional[str], phone: Optional[str]) -> Optional[Identity]:
+        if user_id is not None and user_id in self._by_user_id:
+            return self._by_user_id[user_id]
+        if email is not None and email in self._by_email:
+            return self._by_email[email]
+        if phone is not None and phone in self._by_phone:
+            return self._by_phone[phone]
+        return None
+
+    def _upsert(
+            self,
+            source: str,
+            user_id: Optional[int] = None,
+            email: Optional[str] = None,
+            phone: Optional[str] = None,
+            name: Optional[str] = None,
+            second_name: Optional[str] = None,
+            contact_id: Optional[int] = None,
+            participation_id: Optional[int] = None,
+    ):
+        email = normalize_email(email)
+        phone = normalize_phone(phone)
+        if user_id is None and email is None and phone is None:
+            return
+        identity = self._find(user_id, email, phone)
+        if identity is None:
+            identity = Identity()
+        if identity.user_id is None:
+            identity.user_id = user_id
+        identity.email = identity.email or email
+        identity.phone = identity.phone or phone
+        identity.name = identity.name or name
+        identity.second_name = identity.second_name or second_name
+        identity.sources.add(source)
+        if contact_id is not None:
+            identity.contact_ids.add(contact_id)
+        if participation_id is not None:
+            identity.participation_ids.add(participation_id)
+        # Одна личность может быть известна по нескольким email и телефонам из разных источников
+        if identity.user_id is not None:
+            self._by_user_id.setdefault(identity.user_id, identity)
+        for key, index in ((email, self._by_email), (phone, self._by_phone)):
+            if key is not None:
+                index.setdefault(key, identity)
+
+    def add_members(self, members: Iterable[Member]):
+        for member in members:
+            self._upsert(
+                "member", member.id, member.email, member.phone, member.name, member.secondName
+            )
+
+    def add_contacts(self, contacts: Iterable[Contact]):
+        for contact in contacts:
+            self._upsert(
+                "contact", None, contact.email, contact.phoneMain, contact.name, contact.secondName,
+                contact_id=contact.id,
+            )
+
+    def add_participants(self, participants: Iterable[EventParticipant | EventSessionParticipant]):
+        for participant in participants:
+            self._upsert(
+                "participant", getattr(participant, "userId", None), participant.email, None,
+                participant.name, participant.secondName, participation_id=participant.id,
+            )
+
+    def _loaded(self, source: str, items: Optional[list]) -> bool:
+        """
+        Отметить результат выгрузки источника
+        @return: получены ли все страницы
+        """
+        if items is None:
+            self.failed.add(source)
+            return False
+        self.failed.discard(source)
+        return True
+
+    async def _load_members(self):
+        members = await self._pages(lambda page: self.api.get_members(per_page=self.per_page, page=page))
+        if self._loaded("members", members):
+            self.add_members(members)
+
+    async def _load_contacts(self):
+        contacts = await self._pages(lambda page: self.api.search_contacts(per_page=self.per_page, page=page))
+        if self._loaded("contacts", contacts):
+            self.add_contacts(contacts)
+
+    async def _load_event(self, event_id: int):
+        participants = await self._pages(
+            lambda page: self.api.get_event_participations(event_id, per_page=self.per_page, page=page)
+        )
+        # Серия считается загруженной, только если получены все страницы: иначе refresh загрузит её снова
+        if self._loaded(f"event:{event_id}", participants):
+            self.add_participants(participants)
+            self._loaded_events.add(event_id)
+
+    async def _load_session(self, event_session_id: int):
+        participants = await self._pages(
+            lambda page: self.api.get_event_session_participations(event_session_id, per_page=self.per_page, page=page)
+        )
+        if self._loaded(f"session:{event_session_id}", participants):
+            self.add_participants(participants)
+            self._loaded_sessions.add(event_session_id)
+
+    async def load(self) -> bool:
+        """
+        Выгрузить все источники
+        @return: False, если какой-то источник не выгружен (см. failed)
+        """
+        return await self.refresh(incremental=False)
+
+    async def refresh(self, incremental: bool = True) -> bool:
+        """
+        Дополнить индекс: сотрудники и контакты выгружаются заново, участники — только для серий
+        и вебинаров, добавленных после предыдущей загрузки (или всех, если incremental=False).
+        Записи объединяются с уже известными, индекс не перестраивается
+        @return: False, если какой-то источник не выгружен (см. failed)
+        """
+        events = [event_id for event_id in self.event_ids if not incremental or event_id not in self._loaded_events]
+        sessions = [
+            session_id for session_id in self.event_session_ids
+            if not incremental or session_id not in self._loaded_sessions
+        ]
+        tasks = [self._load_event(event_id) for event_id in events]
+        tasks.extend(self._load_session(session_id) for session_id in sessions)
+        if self.members:
+            tasks.append(self._load_members())
+        if self.contacts:
+            tasks.append(self._load_contacts())
+        await asyncio.gather(*tasks)
+        self._missing.clear()
+        return not self.failed
+
+    async def add_events(self, event_ids: Iterable[int] = (), event_session_ids: Iterable[int] = ()) -> bool:
+        """
+        Загрузить участников дополнительных серий и вебинаров
+        @return: False, если какой-то источник не выгружен (см. failed)
+        """
+        event_ids = [event_id for event_id in event_ids if event_id not in self._loaded_events]
+        event_session_ids = [session_id for session_id in event_session_ids if session_id not in self._loaded_sessions]
+        self.event_ids.extend(event_ids)
+        self.event_session_ids.extend(event_session_ids)
+        await asyncio.gather(
+            *(self._load_event(event_id) for event_id in event_ids),
+            *(self._load_session(session_id) for session_id in event_session_ids),
+        )
+        return not self.failed
+
+    async def _fetch_email(self, email: str):
+        members, contacts = await asyncio.gather(
+            self._call(self.api.get_members, email=email) if self.members else _nothing(),
+            self._call(self.api.search_contacts, contact_data={"email": email}) if self.contacts else _nothing(),
+        )
+        self.add_members(members or ())
+        self.add_contacts(contacts or ())
+        # Отсутствие запоминается, только если ответили все запрошенные источники
+        answered = (members is not None or not self.members) and (contacts is not None or not self.contacts)
+        if email not in self._by_email and answered:
+            self._missing.add(("email", email))
+
+    async def _fetch_user_id(self, user_id: int):
+        members = await self._call(self.api.get_members, user_id=user_id) if self.members else None
+        self.add_members(members or ())
+        if user_id not in self._by_user_id and members is not None:
+            self._missing.add(("user_id", str(user_id)))
+
+    async def by_email(self, emails: Iterable[str], fetch_missing: bool = True) -> dict[str, Optional[Identity]]:
+        """
+        Найти пользователей по email
+        @param emails: адреса (регистр и пробелы по краям не учитываются)
+        @param fetch_missing: догрузить промахи точечными запросами
+        @return: исходный email -> пользователь или None
+        """
+        keys = {email: normalize_email(email) for email in emails}
+        if fetch_missing:
+            misses = {
+                key for key in keys.values()
+                if key is not None and key not in self._by_email and ("email", key) not in self._missing
+            }
+            await asyncio.gather(*(self._fetch_email(key) for key in misses))
+        return {email: self._by_email.get(key) if key is not None else None for email, key in keys.items()}
+
+    async def by_user_id(self, user_ids: Iterable[int], fetch_missing: bool = True) -> dict[int, Optional[Identity]]:
+        """
+        Найти пользователей по userId
+        @param user_ids: идентификаторы пользователей
+        @param fetch_missing: догрузить промахи точечными запросами к сотрудникам
+        @return: userId -> пользователь или None
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if fetch_missing:
+            misses = [
+                user_id for user_id in user_ids
+                if user_id not in self._by_user_id and ("user_id", str(user_id)) not in self._missing
+            ]
+            await asyncio.gather(*(self._fetch_user_id(user_id) for user_id in misses))
+        return {user_id: self._by_user_id.get(user_id) for user_id in user_ids}
+
+    def by_phone(self, phones: Iterable[str]) -> dict[str, Optional[Identity]]:
+        """
+        Найти пользователей по телефону (только в загруженных данных: API не ищет по телефону)
+        @param phones: телефоны в любом формате
+        @return: исходный телефон -> пользователь или None
+        """
+        return {phone: self._by_phone.get(normalize_phone(phone)) for phone in phones}
+
+    async def user_ids(self, emails: Iterable[str], fetch_missing: bool = True) -> dict[str, Optional[int]]:
+        """
+        UserID по email
+        @return: исходный email -> UserID или None
+        """
+        found = await self.by_email(emails, fetch_missing)
+        return {email: identity.user_id if identity is not None else None for email, identity in found.items()}
+
+    def __len__(self) -> int:
+        return len({id(identity) for index in (self._by_user_id, self._by_email, self._by_phone)
+                    for identity in index.values()})
+
+
+async def _nothing():
+    return None
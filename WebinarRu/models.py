@@ -1,8 +1,8 @@
 import datetime
 from enum import Enum
-from typing import Optional, Sequence, Literal
+from typing import Optional, Sequence, Literal, Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 __all__ = [
@@ -26,11 +26,22 @@ __all__ = [
     "UserStats",
     "WebhookTypes",
     "WebhookData",
-    "WebhookMessage"
+    "WebhookMessage",
+    "EventSessionSnapshot",
+    "EventSnapshot",
+    "WebinarSpec",
+    "BulkItemResult",
 ]
 
 
-class User(BaseModel):
+class _Model(BaseModel):
+    """
+    Общая база моделей. Схема валидации строится при первом использовании модели, а не при импорте
+    """
+    model_config = ConfigDict(defer_build=True)
+
+
+class User(_Model):
     id: Optional[int] = None  # — UserID сотрудника организации;
     name: Optional[str] = None  # — имя сотрудника команды;
     email: Optional[str] = None  # — электронная почта;
@@ -94,13 +105,26 @@ class EventSessionParticipant(User):
         return f"{self.name},{self.secondName},{self.email},{self.visited}"
 
 
-class RegisteredParticipant(BaseModel):
+# Поля участника, изменение которых считается изменением регистрации (см. WebinarRu.diff)
+REGISTRATION_FIELDS = (
+    "email",
+    "name",
+    "secondName",
+    "role",
+    "registerStatus",
+    "paymentStatus",
+    "isAccepted",
+    "visited",
+)
+
+
+class RegisteredParticipant(_Model):
     participationId: Optional[int] = None
     link: Optional[str] = None
     contactId: Optional[int] = None
 
 
-class EventParticipantInvite(BaseModel):
+class EventParticipantInvite(_Model):
     email: str
     name: str
     second_name: str
@@ -114,7 +138,7 @@ class EventParticipantInvite(BaseModel):
     sex: Optional[str] = None
 
 
-class AccessSettings(BaseModel):
+class AccessSettings(_Model):
     # - isPasswordRequired — доступ с паролем, или без него
     # - isRegistrationRequired — доступ с регистрацией, или без неё
     # - isModerationRequired — доступ с залом ожидания, или без него
@@ -131,7 +155,7 @@ class AccessSettings(BaseModel):
         }
 
 
-class EventSession(BaseModel):
+class EventSession(_Model):
     id: Optional[int] = None  # —  идентификатор (eventsessionID);
     name: Optional[str] = None  # — название;
     description: Optional[str] = None  # — описание;
@@ -173,7 +197,7 @@ class EventSession(BaseModel):
         )
 
 
-class Event(BaseModel):
+class Event(_Model):
     id: int = None  # идентификатор (EventID) в числовом формате;
     name: str = None  # название;
     description: Optional[str] = None  # — описание;
@@ -216,7 +240,7 @@ class Event(BaseModel):
         )
 
 
-class CreatedEvent(BaseModel):
+class CreatedEvent(_Model):
     eventId: int  # идентификатор шаблона
     link: str  # публичная ссылка на лендинг мероприятия
 
@@ -224,7 +248,7 @@ class CreatedEvent(BaseModel):
         return f"{self.eventId}: {self.link}"
 
 
-class EventStats(BaseModel):
+class EventStats(_Model):
     id: Optional[int] = None  # — eventsessionID мероприятия;
     name: Optional[str] = None  # — название мероприятия;
     startsAt: Optional[datetime.datetime] = None  # — время начала мероприятия;
@@ -242,19 +266,19 @@ class EventStats(BaseModel):
     createUser: Optional[User] = None  # — информация о владельце мероприятия (id, имя/фамилия, email);
 
 
-class CreatedEventSession(BaseModel):
+class CreatedEventSession(_Model):
     eventSessionId: int  # идентификатор вебинара
     link: str  # Ссылка на сессию. В пользовательских сценариях не используется
 
 
-class Timezone(BaseModel):
+class Timezone(_Model):
     id: int  # уникальный идентификатор часового пояса (TimeZone);
     name: str  # имя часового пояса (TimeZone);
     description: str  # описание часового пояса (TimeZone);
     offset: int  # смещение часового пояса в секундах;
 
 
-class File(BaseModel):
+class File(_Model):
     id: Optional[int] = None  # — идентификатор файла/папки;
     parent: Optional[str | dict] = None  # — папка, в которой находится файл/папка. NULL — корневая папка;
     isDeleted: Optional[bool] = None  # — флаг удаления файла/папки. Значения:
@@ -314,7 +338,7 @@ class File(BaseModel):
     progress: Optional[int] = None  # состояние конвертации в %.
 
 
-class ChatMessage(BaseModel):
+class ChatMessage(_Model):
     id: Optional[int] = None  # идентификатор сообщения;
     authorName: Optional[str] = None  # имя автора сообщения;
     text: Optional[str] = None  # текст сообщения;
@@ -324,14 +348,14 @@ class ChatMessage(BaseModel):
     avatarUrl: Optional[str] = None  # url аватара отправителя;
     thumbnails: Optional[list] = None  # аватар отправителя в различных разрешениях;
     authorId: Optional[int] = None  # id отправителя.
-    createAt: Optional[datetime.datetime] = None,
-    updateAt: Optional[datetime.datetime] = None,
-    updateUserId: Optional[int] = None,
-    additionalData: Optional[str] = None,
-    attachments: Optional[Sequence] = None,
+    createAt: Optional[datetime.datetime] = None
+    updateAt: Optional[datetime.datetime] = None
+    updateUserId: Optional[int] = None
+    additionalData: Optional[str] = None
+    attachments: Optional[Sequence] = None
 
 
-class EventSessionStats(BaseModel):
+class EventSessionStats(_Model):
     id: Optional[int] = None  # —  идентификатор (eventsessionID);
     name: Optional[str] = None  # — название;
     startsAt: Optional[datetime.datetime] = None  # — дата начала мероприятия;
@@ -386,7 +410,7 @@ class EventSessionStats(BaseModel):
     # utm_custom - все прочие метки
 
 
-class UserStats(BaseModel):
+class UserStats(_Model):
     id: Optional[int]  # — UserID;
     email: Optional[str] = None  # — email;
     name: Optional[str] = None  # — имя;
@@ -413,7 +437,7 @@ class WebhookTypes(Enum):
     CONVERTED_RECORD_READY = "convertedRecord.ready"
 
 
-class WebhookData(BaseModel):
+class WebhookData(_Model):
     eventSessionId: Optional[int] = None
     eventSessionNewStartsAt: Optional[datetime.datetime] = None
     eventSessionOldStartsAt: Optional[datetime.datetime] = None
@@ -453,7 +477,7 @@ class WebhookData(BaseModel):
         return result
 
 
-class WebhookMessage(BaseModel):
+class WebhookMessage(_Model):
     event: Literal[
         "eventSession.created",
         "eventSession.startsAt.changed",
@@ -488,3 +512,34 @@ class WebhookMessage(BaseModel):
                 result += "Процесс конвертации завершен."
         result += f"\n\n{str(self.data)}"
         return result
+
+
+class EventSessionSnapshot(_Model):
+    session: EventSession  # вебинар
+    participations: Optional[Sequence[EventSessionParticipant]] = None  # участники вебинара
+    files: Optional[Sequence[File]] = None  # файлы, прикреплённые к вебинару
+    records: Optional[Sequence[File]] = None  # онлайн-записи вебинара
+
+
+class EventSnapshot(_Model):
+    event: Event  # серия мероприятий
+    files: Optional[Sequence[File]] = None  # файлы, прикреплённые к серии
+    sessions: Sequence[EventSessionSnapshot] = ()  # вебинары серии с вложенными данными
+
+
+class WebinarSpec(_Model):
+    key: str  # клиентский ключ идемпотентности, уникальный в рамках журнала
+    event: dict[str, Any]  # параметры create_event (name, access_settings, access, ...)
+    sessions: Sequence[dict[str, Any]] = ({},)  # параметры create_event_session для каждого вебинара серии
+
+
+class BulkItemResult(_Model):
+    key: str  # ключ из WebinarSpec
+    status: Literal['created', 'existing', 'failed', 'rolled_back']
+    event: Optional[CreatedEvent] = None  # созданная серия
+    sessions: Sequence[CreatedEventSession] = ()  # созданные вебинары
+    error: Optional[str] = None  # описание ошибки
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ('created', 'existing')
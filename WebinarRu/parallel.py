@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+from typing import Optional, Any, AsyncIterable, AsyncIterator, TYPE_CHECKING
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    import multiprocessing.context
+    from concurrent.futures import ProcessPoolExecutor
+    from .columns import ColumnarCollection
+
+
+__all__ = [
+    "decode_models",
+    "decode_columns",
+    "ProcessDecoder",
+]
+
+
+def decode_models(body: bytes, model: type[BaseModel], key: Optional[str] = None) -> Any:
+    """
+    Разбирает JSON ответа и валидирует его в модели
+    @param body: тело ответа
+    @param model: модель
+    @param key: если элементы списка вложены (например {"file": {...}}), ключ вложенного объекта
+    @return: список моделей, модель или None для пустого ответа
+    """
+    if not body.strip():
+        return None
+    data = json.loads(body)
+    if data is None:
+        return None
+    if isinstance(data, list):
+        if key is not None:
+            return [model(**item[key]) for item in data]
+        return [model(**item) for item in data]
+    return model(**data)
+
+
+def decode_columns(body: bytes, collection: type["ColumnarCollection"], extra: Optional[dict] = None) -> Any:
+    """
+    Разбирает JSON ответа сразу в колоночную коллекцию
+    @param body: тело ответа
+    @param collection: класс коллекции (например ParticipantColumns)
+    @param extra: значения дополнительных колонок для всех строк
+    @return: коллекция или None для пустого ответа
+    """
+    if not body.strip():
+        return None
+    data = json.loads(body)
+    if data is None:
+        return None
+    return collection.from_rows(data, **(extra or {}))
+
+
+def _decode_many(bodies: list[bytes], model: type[BaseModel], key: Optional[str]) -> list:
+    return [decode_models(body, model, key) for body in bodies]
+
+
+class ProcessDecoder:
+    """
+    Разбор JSON и валидация моделей в пуле процессов. Event loop при этом занят только сетевым вводом-выводом.
+    Небольшие ответы (меньше min_size байт) разбираются на месте: передача между процессами дороже разбора.
+    """
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            chunk_size: int = 4,
+            min_size: int = 64 * 1024,
+            mp_context: Optional["multiprocessing.context.BaseContext"] = None,
+    ):
+        """
+        @param max_workers: количество процессов. По умолчанию — количество процессоров
+        @param chunk_size: сколько ответов передаётся в процесс одной задачей в map()
+        @param min_size: ответы меньше этого размера разбираются в текущем процессе
+        @param mp_context: контекст multiprocessing (например, multiprocessing.get_context("spawn"))
+        """
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.min_size = min_size
+        self.mp_context = mp_context
+        self._executor: Optional["ProcessPoolExecutor"] = None
+
+    @property
+    def executor(self) -> "ProcessPoolExecutor":
+        if self._executor is None:
+            # Пул процессов нужен только при разборе больших ответов, модуль загружается вместе с ним
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=self.mp_context)
+        return self._executor
+
+    async def decode(self, body: bytes, model: type[BaseModel], key: Optional[str] = None) -> Any:
+        """
+        Разбирает ответ в модели (см. decode_models)
+        """
+        if len(body) < self.min_size:
+            return decode_models(body, model, key)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, decode_models, body, model, key)
+
+    async def decode_columns(
+            self,
+            body: bytes,
+            collection: type["ColumnarCollection"],
+            extra: Optional[dict] = None,
+    ) -> Any:
+        """
+        Разбирает ответ в колоночную коллекцию (см. decode_columns).
+        Из процесса возвращаются массивы колонок, а не модели, поэтому передача результата дешёвая
+        """
+        if len(body) < self.min_size:
+            return decode_columns(body, collection, extra)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, decode_columns, body, collection, extra)
+
+    async def map(
+            self,
+            bodies: AsyncIterable[bytes],
+            model: type[BaseModel],
+            key: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Разбирает поток ответов пачками по chunk_size, сохраняя порядок.
+        Одновременно в работе не больше max_workers * 2 пачек, чтобы не накапливать тела ответов в памяти
+        @param bodies: асинхронный поток тел ответов
+        @param model: модель
+        @param key: ключ вложенного объекта (см. decode_models)
+        """
+        loop = asyncio.get_running_loop()
+        limit = (self.max_workers or os.cpu_count() or 1) * 2
+        pending: list[asyncio.Future] = []
+        chunk: list[bytes] = []
+        try:
+            async for body in bodies:
+                chunk.append(body)
+                if len(chunk) < self.chunk_size:
+                    continue
+                pending.append(loop.run_in_executor(self.executor, _decode_many, chunk, model, key))
+                chunk = []
+                while len(pending) >= limit or (pending and pending[0].done()):
+                    for result in await pending.pop(0):
+                        yield result
+            if chunk:
+                pending.append(loop.run_in_executor(self.executor, _decode_many, chunk, model, key))
+            while pending:
+                for result in await pending.pop(0):
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self, wait: bool = True):
+        """
+        Останавливает пул процессов
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,132 @@
+import datetime
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Literal, Callable, Iterable, Mapping, Optional
+
+
+__all__ = [
+    "Convert",
+    "Skip",
+    "Field",
+    "ParamSpec",
+]
+
+
+# value — значение как есть; str — str(value); bool — "true"/"false";
+# settings — AccessSettings.to_dict; array — label[0], label[1], ...; mapping — label[key];
+# date — label[date][year], ..., label[time][minute]
+Convert = Literal["value", "str", "bool", "settings", "array", "mapping", "date"]
+# none — параметр пропускается, если равен None; falsy — если ложен; never — передаётся всегда
+Skip = Literal["none", "falsy", "never"]
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    api: str  # имя параметра в API
+    convert: Convert = "value"
+    skip: Skip = "none"
+
+
+@lru_cache(maxsize=512)
+def _array_keys(label: str, size: int) -> tuple[str, ...]:
+    return tuple(f"{label}[{index}]" for index in range(size))
+
+
+def _array(values: Iterable, label: str) -> dict:
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    return dict(zip(_array_keys(label, len(values)), values))
+
+
+def _mapping(values: Mapping, label: str) -> dict:
+    return {f"{label}[{key}]": item for key, item in values.items()}
+
+
+def _date_keys(label: str) -> tuple[str, ...]:
+    return (
+        f"{label}[date][year]",
+        f"{label}[date][month]",
+        f"{label}[date][day]",
+        f"{label}[time][hour]",
+        f"{label}[time][minute]",
+    )
+
+
+def _date(value: datetime.datetime, keys: tuple[str, ...]) -> dict:
+    return dict(zip(keys, (value.year, value.month, value.day, value.hour, value.minute)))
+
+
+def _value(value):
+    return value
+
+
+def _bool(value) -> str:
+    return str(value).lower()
+
+
+def _settings(value) -> dict:
+    return value.to_dict
+
+
+_CONVERTERS: dict[str, Callable] = {"value": _value, "str": str, "bool": _bool, "settings": _settings}
+
+
+class ParamSpec:
+    """
+    Декларативное описание параметров метода API: имя аргумента Python -> имя параметра API,
+    преобразование значения и правило пропуска. По описанию один раз готовится список шагов
+    (аргумент, параметр API, преобразование), и build проходит по нему без повторного форматирования имён.
+    Порядок параметров в результате совпадает с порядком полей.
+
+        EVENTS = ParamSpec(date_from=Field("from", "str"), page="page", status=Field("status", "array"))
+        params = EVENTS.build(date_from=date_from, page=page, status=status)
+    """
+    def __init__(self, **fields: str | Field):
+        """
+        @param fields: имя аргумента -> имя параметра API или Field
+        """
+        self.fields: dict[str, Field] = {
+            name: Field(field) if isinstance(field, str) else field for name, field in fields.items()
+        }
+        self._steps: list[tuple[str, Skip, Optional[str], Callable]] = [
+            self._step(name, field) for name, field in self.fields.items()
+        ]
+
+    @staticmethod
+    def _step(name: str, field: Field) -> tuple[str, Skip, Optional[str], Callable]:
+        # Для раскрываемых преобразований вместо имени параметра — None: результат добавляется целиком
+        if field.skip not in ("none", "falsy", "never"):
+            raise ValueError(f"Unknown skip rule: {field.skip!r}")
+        match field.convert:
+            case "array":
+                return name, field.skip, None, partial(_array, label=field.api)
+            case "mapping":
+                return name, field.skip, None, partial(_mapping, label=field.api)
+            case "date":
+                return name, field.skip, None, partial(_date, keys=_date_keys(field.api))
+            case convert if convert in _CONVERTERS:
+                return name, field.skip, field.api, _CONVERTERS[convert]
+            case _:
+                raise ValueError(f"Unknown converter: {field.convert!r}")
+
+    def build(self, **values) -> dict:
+        """
+        Собрать параметры запроса
+        @param values: значения аргументов по именам полей. Пропущенные считаются равными None
+        @return: словарь параметров API
+        """
+        unknown = values.keys() - self.fields.keys()
+        if unknown:
+            raise TypeError(f"build() got an unexpected keyword argument {min(unknown)!r}")
+        params = {}
+        for name, skip, api, convert in self._steps:
+            value = values.get(name)
+            if skip == "none" and value is None or skip == "falsy" and not value:
+                continue
+            if api is None:
+                params.update(convert(value))
+            else:
+                params[api] = convert(value)
+        return params
+
+    def __repr__(self):
+        return f"ParamSpec({', '.join(f'{name}={field.api!r}' for name, field in self.fields.items())})"
@@ -0,0 +1,263 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Mapping, Iterator
+
+from .ratelimit import RateLimiter
+from .transport import Transport, TransportResponse, AiohttpTransport
+from .webinar_api import WebinarAPI
+
+
+__all__ = [
+    "WeightedScheduler",
+    "TenantTransport",
+    "TenantStats",
+    "ClientPool",
+]
+
+
+class WeightedScheduler:
+    """
+    Общий лимит одновременных запросов, распределяемый между арендаторами взвешенным циклическим
+    обходом (smooth weighted round-robin): когда запросы ждут у нескольких арендаторов,
+    освободившийся слот получает следующий по весам, а не тот, кто поставил в очередь больше.
+    """
+    def __init__(self, concurrency: int):
+        """
+        @param concurrency: общий лимит одновременных запросов
+        """
+        self.concurrency = concurrency
+        self._free = concurrency
+        self._weights: dict[str, int] = {}
+        self._current: dict[str, int] = {}
+        self._queues: dict[str, deque[asyncio.Future]] = {}
+
+    def register(self, tenant: str, weight: int = 1):
+        if weight < 1:
+            raise ValueError("weight must be >= 1")
+        self._weights[tenant] = weight
+        self._current.setdefault(tenant, 0)
+        self._queues.setdefault(tenant, deque())
+
+    def unregister(self, tenant: str):
+        for waiter in self._queues.pop(tenant, ()):
+            waiter.cancel()
+        self._weights.pop(tenant, None)
+        self._current.pop(tenant, None)
+
+    def waiting(self, tenant: str) -> int:
+        """
+        Количество запросов арендатора, ожидающих слот
+        """
+        return sum(1 for waiter in self._queues.get(tenant, ()) if not waiter.done())
+
+    async def acquire(self, tenant: str):
+        """
+        Дождаться слота для запроса арендатора
+        """
+        if self._free > 0 and not any(self._queues.values()):
+            self._free -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[tenant].append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Слот уже выдан, но ожидающий отменён — передаём слот дальше
+                self.release()
+            else:
+                queue = self._queues.get(tenant)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+            raise
+
+    def release(self):
+        """
+        Вернуть слот. Слот сразу передаётся следующему ожидающему по весам
+        """
+        tenant = self._next()
+        if tenant is None:
+            self._free += 1
+            return
+        self._queues[tenant].popleft().set_result(None)
+
+    def _next(self) -> Optional[str]:
+        for queue in self._queues.values():
+            while queue and queue[0].done():
+                queue.popleft()
+        active = [tenant for tenant, queue in self._queues.items() if queue]
+        if not active:
+            return None
+        total = 0
+        best = None
+        for tenant in active:
+            self._current[tenant] += self._weights[tenant]
+            total += self._weights[tenant]
+            if best is None or self._current[tenant] > self._current[best]:
+                best = tenant
+        self._current[best] -= total
+        return best
+
+
+@dataclass
+class TenantStats:
+    requests: int = 0  # выполнено запросов
+    in_flight: int = 0  # выполняется сейчас
+    wait_time: float = 0.0  # суммарное ожидание лимитов, сек
+
+
+class TenantTransport(Transport):
+    """
+    Транспорт арендатора: перед запросом ждёт свой лимит частоты и общий слот планировщика,
+    сам запрос выполняется общим транспортом пула
+    """
+    def __init__(
+            self,
+            inner: Transport,
+            scheduler: WeightedScheduler,
+            tenant: str,
+            rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.inner = inner
+        self.scheduler = scheduler
+        self.tenant = tenant
+        self.rate_limiter = rate_limiter
+        self.stats = TenantStats()
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None) -> TransportResponse:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        await self.scheduler.acquire(self.tenant)
+        self.stats.wait_time += loop.time() - started
+        self.stats.in_flight += 1
+        try:
+            return await self.inner.request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+        finally:
+            self.stats.in_flight -= 1
+            self.stats.requests += 1
+            self.scheduler.release()
+
+    async def close(self):
+        # Общий транспорт закрывает пул
+        pass
+
+    def detach(self):
+        self.inner.detach()
+
+
+@dataclass
+class _Tenant:
+    api: WebinarAPI
+    transport: TenantTransport
+    weight: int = 1
+
+
+class ClientPool:
+    """
+    Клиенты WebinarAPI для нескольких организаций (токенов) с общим пулом соединений.
+    У каждого арендатора свой лимит частоты запросов, общий лимит одновременных запросов
+    делится между арендаторами по весам, поэтому большая выгрузка одной организации не блокирует остальные.
+    """
+    def __init__(
+            self,
+            tokens: Optional[Mapping[str, str]] = None,
+            base_link: str = "https://userapi.webinar.ru/v3",
+            concurrency: int = 20,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+            transport: Optional[Transport] = None,
+            **options,
+    ):
+        """
+        @param tokens: имя арендатора -> токен (добавляются с весом 1)
+        @param base_link: адрес API
+        @param concurrency: общий лимит одновременных запросов
+        @param rate: лимит запросов в секунду для каждого арендатора по умолчанию
+        @param burst: размер корзины лимита по умолчанию
+        @param transport: общий транспорт. По умолчанию — AiohttpTransport с connection_limit=concurrency
+        @param options: параметры WebinarAPI для всех клиентов (strict, timeout, route_timeouts, cache, decoder)
+        """
+        self.base_link = base_link
+        self.rate = rate
+        self.burst = burst
+        self.options = options
+        self._owns_transport = transport is None
+        self.transport = transport if transport is not None else AiohttpTransport(connection_limit=concurrency)
+        self.scheduler = WeightedScheduler(concurrency)
+        self._tenants: dict[str, _Tenant] = {}
+        for name, token in (tokens or {}).items():
+            self.add(name, token)
+
+    def add(
+            self,
+            name: str,
+            token: str,
+            weight: int = 1,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+    ) -> WebinarAPI:
+        """
+        Добавить арендатора
+        @param name: имя арендатора
+        @param token: токен API организации
+        @param weight: вес при распределении слотов
+        @param rate: лимит запросов в секунду. По умолчанию — лимит пула
+        @param burst: размер корзины лимита
+        @return: клиент арендатора
+        """
+        if name in self._tenants:
+            raise ValueError(f"Tenant {name!r} already exists")
+        rate = rate if rate is not None else self.rate
+        limiter = RateLimiter(rate, burst if burst is not None else self.burst) if rate is not None else None
+        self.scheduler.register(name, weight)
+        transport = TenantTransport(self.transport, self.scheduler, name, limiter)
+        api = WebinarAPI(token, base_link=self.base_link, transport=transport, **self.options)
+        self._tenants[name] = _Tenant(api=api, transport=transport, weight=weight)
+        return api
+
+    def remove(self, name: str):
+        """
+        Удалить арендатора. Его ожидающие запросы отменяются
+        """
+        self._tenants.pop(name)
+        self.scheduler.unregister(name)
+
+    def __getitem__(self, name: str) -> WebinarAPI:
+        return self._tenants[name].api
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tenants
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tenants)
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def stats(self) -> dict[str, TenantStats]:
+        """
+        Статистика запросов по арендаторам
+        """
+        return {name: tenant.transport.stats for name, tenant in self._tenants.items()}
+
+    def waiting(self) -> dict[str, int]:
+        """
+        Количество запросов, ожидающих слот, по арендаторам
+        """
+        return {name: self.scheduler.waiting(name) for name in self._tenants}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Закрывает общий транспорт (если он создан пулом)
+        """
+        if self._owns_transport:
+            await self.transport.close()
@@ -0,0 +1,223 @@
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Mapping
+
+from .ratelimit import RateLimiter
+from .transport import Transport, TransportResponse
+
+
+__all__ = [
+    "priority",
+    "current_priority",
+    "ClassStats",
+    "PriorityScheduler",
+    "PriorityTransport",
+]
+
+
+# Класс приоритета запросов текущей задачи. None — класс по умолчанию планировщика
+_priority: ContextVar[Optional[str]] = ContextVar("webinarru_priority", default=None)
+
+
+@contextmanager
+def priority(name: str):
+    """
+    Задаёт класс приоритета запросов внутри блока (в том числе в задачах, созданных в нём):
+
+        with priority("bulk"):
+            await webinar.get_participations_columns(session_ids)
+    @param name: класс приоритета планировщика
+    """
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Optional[str]:
+    return _priority.get()
+
+
+@dataclass
+class ClassStats:
+    in_flight: int = 0  # выполняется сейчас
+    waiting: int = 0  # ожидает слот
+    requests: int = 0  # начато запросов
+    wait_time: float = 0.0  # суммарное ожидание, сек
+    max_wait: float = 0.0  # наибольшее ожидание, сек
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_time / self.requests if self.requests else 0.0
+
+
+class PriorityScheduler:
+    """
+    Общий лимит одновременных запросов и частоты для классов приоритета.
+    Освободившийся слот (и разрешение лимита частоты) получает ожидающий запрос самого приоритетного класса,
+    поэтому интерактивные вызовы не стоят в очереди за тысячами запросов выгрузки.
+    Доля класса ограничивает, какую часть слотов он может занять одновременно:
+    при shares={"interactive": 1.0, "bulk": 0.8} выгрузка оставляет 20% слотов свободными для интерактивных вызовов.
+    """
+    def __init__(
+            self,
+            concurrency: int,
+            shares: Optional[Mapping[str, float]] = None,
+            default: Optional[str] = None,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+    ):
+        """
+        @param concurrency: общий лимит одновременных запросов
+        @param shares: класс -> доля слотов (0..1], от самого приоритетного к наименее приоритетному.
+        По умолчанию {"interactive": 1.0, "bulk": 0.8}
+        @param default: класс запросов вне блока priority(). По умолчанию — первый (самый приоритетный)
+        @param rate: общий лимит запросов в секунду
+        @param burst: размер корзины лимита частоты
+        """
+        shares = dict(shares or {"interactive": 1.0, "bulk": 0.8})
+        if not shares:
+            raise ValueError("at least one priority class is required")
+        for name, share in shares.items():
+            if not 0 < share <= 1:
+                raise ValueError(f"share of {name!r} must be in (0, 1]")
+        self.concurrency = concurrency
+        self.classes = list(shares)
+        self.limits = {name: max(1, int(concurrency * share)) for name, share in shares.items()}
+        self.default = default if default is not None else self.classes[0]
+        if self.default not in shares:
+            raise ValueError(f"Unknown default priority class: {self.default!r}")
+        self.rate_limiter = RateLimiter(rate, burst) if rate is not None else None
+        self._in_flight = 0
+        self._queues: dict[str, deque[asyncio.Future]] = {name: deque() for name in self.classes}
+        self._stats = {name: ClassStats() for name in self.classes}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def resolve(self, name: Optional[str] = None) -> str:
+        """
+        Класс запроса: явно заданный, из блока priority() или класс по умолчанию
+        """
+        name = name if name is not None else _priority.get()
+        if name is None:
+            return self.default
+        if name not in self._queues:
+            raise ValueError(f"Unknown priority class: {name!r}")
+        return name
+
+    def _can_start(self, name: str) -> bool:
+        return self._in_flight < self.concurrency and self._stats[name].in_flight < self.limits[name]
+
+    def _start(self, name: str, waited: float):
+        self._in_flight += 1
+        stats = self._stats[name]
+        stats.in_flight += 1
+        stats.requests += 1
+        stats.wait_time += waited
+        stats.max_wait = max(stats.max_wait, waited)
+
+    def _has_waiters(self, name: str) -> bool:
+        queue = self._queues[name]
+        while queue and queue[0].done():
+            queue.popleft()
+        return bool(queue)
+
+    async def acquire(self, name: Optional[str] = None) -> str:
+        """
+        Дождаться слота
+        @param name: класс приоритета. По умолчанию — из блока priority()
+        @return: класс, который нужно передать в release
+        """
+        name = self.resolve(name)
+        loop = asyncio.get_running_loop()
+        if (
+                not any(self._has_waiters(other) for other in self.classes)
+                and self._can_start(name)
+                and (self.rate_limiter is None or self.rate_limiter.try_acquire())
+        ):
+            self._start(name, 0.0)
+            return name
+        started = loop.time()
+        waiter = loop.create_future()
+        self._queues[name].append(waiter)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Слот уже выдан, но ожидающий отменён — возвращаем слот
+                self.release(name)
+            raise
+        self._stats[name].wait_time += loop.time() - started
+        self._stats[name].max_wait = max(self._stats[name].max_wait, loop.time() - started)
+        return name
+
+    def release(self, name: str):
+        """
+        Вернуть слот
+        """
+        self._in_flight -= 1
+        self._stats[name].in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        for name in self.classes:
+            queue = self._queues[name]
+            while self._has_waiters(name):
+                if self._in_flight >= self.concurrency:
+                    return
+                if self._stats[name].in_flight >= self.limits[name]:
+                    # Класс исчерпал свою долю: слот может получить менее приоритетный класс
+                    break
+                if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+                    # Разрешение лимита частоты достанется самому приоритетному ожидающему
+                    self._schedule(self.rate_limiter.delay())
+                    return
+                self._start(name, 0.0)
+                queue.popleft().set_result(None)
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            return
+
+        def wake():
+            self._timer = None
+            self._dispatch()
+
+        self._timer = asyncio.get_running_loop().call_later(delay, wake)
+
+    def stats(self) -> dict[str, ClassStats]:
+        """
+        Статистика по классам: запросы в работе, глубина очереди, время ожидания
+        """
+        for name, stats in self._stats.items():
+            stats.waiting = sum(1 for waiter in self._queues[name] if not waiter.done())
+        return dict(self._stats)
+
+
+class PriorityTransport(Transport):
+    """
+    Транспорт, выполняющий запросы через PriorityScheduler. Класс запроса берётся из блока priority():
+
+        scheduler = PriorityScheduler(20, rate=10)
+        webinar = WebinarAPI(token, transport=PriorityTransport(AiohttpTransport(), scheduler))
+    """
+    def __init__(self, inner: Transport, scheduler: PriorityScheduler):
+        self.inner = inner
+        self.scheduler = scheduler
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None) -> TransportResponse:
+        name = await self.scheduler.acquire()
+        try:
+            return await self.inner.request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+        finally:
+            self.scheduler.release(name)
+
+    async def close(self):
+        await self.inner.close()
+
+    def detach(self):
+        self.inner.detach()
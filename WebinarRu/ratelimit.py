@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Optional
+
+from .transport import Transport, TransportResponse
+
+
+__all__ = [
+    "RateLimiter",
+    "RateLimitedTransport",
+]
+
+
+class RateLimiter:
+    """
+    Ограничение частоты запросов (token bucket): в среднем rate запросов в секунду,
+    кратковременно — до burst запросов подряд. Ожидающие обслуживаются по очереди.
+    """
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        @param rate: запросов в секунду
+        @param burst: размер корзины. По умолчанию — max(1, rate)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Дождаться разрешения на запрос
+        """
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def try_acquire(self) -> bool:
+        """
+        Взять разрешение без ожидания
+        @return: False, если корзина пуста
+        """
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def delay(self) -> float:
+        """
+        Через сколько секунд появится следующее разрешение
+        """
+        self._refill()
+        return max(1 - self._tokens, 0.0) / self.rate
+
+    @property
+    def available(self) -> float:
+        """
+        Сколько запросов можно выполнить без ожидания
+        """
+        self._refill()
+        return self._tokens
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class RateLimitedTransport(Transport):
+    """
+    Транспорт, ограничивающий частоту запросов клиента:
+
+        api = WebinarAPI(token, transport=RateLimitedTransport(AiohttpTransport(), RateLimiter(5)))
+    """
+    def __init__(self, inner: Transport, rate_limiter: RateLimiter):
+        self.inner = inner
+        self.rate_limiter = rate_limiter
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None) -> TransportResponse:
+        await self.rate_limiter.acquire()
+        return await self.inner.request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+
+    async def close(self):
+        await self.inner.close()
+
+    def detach(self):
+        self.inner.detach()
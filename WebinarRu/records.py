@@ -0,0 +1,196 @@
+import asyncio
+import datetime
+from typing import Optional, Iterable, Literal
+
+from .models import File
+
+
+__all__ = [
+    "RecordIndex",
+]
+
+
+RECORDS_PAGE = 100
+
+
+class RecordIndex:
+    """
+    Индекс онлайн-записей за период: список /records выгружается один раз постранично,
+    после чего ссылки и записи вебинаров берутся из памяти по id записи или id вебинара.
+    При промахе индекс перезагружается (не чаще refresh_interval), а если записи нет и после этого,
+    она запрашивается по id отдельно. Одновременные перезагрузки объединяются в одну.
+
+        index = RecordIndex(webinar, date_from=datetime.datetime(2024, 1, 1), date_to=datetime.datetime(2024, 2, 1))
+        links = await index.links(record_ids)
+    """
+    def __init__(
+            self,
+            api,
+            date_from: Optional[datetime.datetime] = None,
+            date_to: Optional[datetime.datetime] = None,
+            period: Optional[Literal['day', 'week', 'month', 'year']] = None,
+            user_id: Optional[int] = None,
+            page_size: int = RECORDS_PAGE,
+            refresh_interval: float = 60.0,
+            concurrency: int = 10,
+    ):
+        """
+        @param api: экземпляр WebinarAPI
+        @param date_from: дата начала периода выборки
+        @param date_to: дата окончания периода выборки
+        @param period: период выборки
+        @param user_id: ID сотрудника Организации
+        @param page_size: размер страницы при выгрузке
+        @param refresh_interval: минимальный интервал между перезагрузками индекса при промахах, сек
+        @param concurrency: максимальное количество одновременных запросов отдельных записей
+        """
+        self.api = api
+        self.date_from = date_from
+        self.date_to = date_to
+        self.period = period
+        self.user_id = user_id
+        self.page_size = page_size
+        self.refresh_interval = refresh_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._by_id: dict[int, File] = {}
+        self._by_session: dict[int, list[File]] = {}
+        # id, которых нет ни в индексе, ни в ответе на отдельный запрос (до следующей перезагрузки)
+        self._missing: set[int] = set()
+        self._loaded_at: Optional[float] = None
+        self._refreshing: Optional[asyncio.Future] = None
+
+    async def _fetch(self) -> Optional[list[File]]:
+        result = []
+        offset = 0
+        while True:
+            chunk = await self.api.get_records(
+                date_from=self.date_from,
+                date_to=self.date_to,
+                period=self.period,
+                user_id=self.user_id,
+                offset=offset,
+                limit=self.page_size,
+            )
+            if chunk is None:
+                return None
+            result.extend(chunk)
+            if len(chunk) < self.page_size:
+                return result
+            offset += self.page_size
+
+    async def _load(self) -> bool:
+        records = await self._fetch()
+        if records is None:
+            return False
+        self._by_id = {}
+        self._by_session = {}
+        self._missing = set()
+        for record in records:
+            self._add(record)
+        self._loaded_at = asyncio.get_running_loop().time()
+        return True
+
+    def _add(self, record: File):
+        if record.id is None:
+            return
+        self._by_id[record.id] = record
+        if record.eventSession is not None and record.eventSession.id is not None:
+            self._by_session.setdefault(record.eventSession.id, []).append(record)
+
+    async def refresh(self) -> bool:
+        """
+        Перезагрузить индекс
+        @return: False, если выгрузка не удалась (индекс остаётся прежним)
+        """
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._load())
+            self._refreshing.add_done_callback(lambda _: setattr(self, "_refreshing", None))
+        return await asyncio.shield(self._refreshing)
+
+    async def _ensure_loaded(self) -> bool:
+        # True, если выгрузка запускалась в этом вызове (даже неудачная): повторять её на промахах не нужно
+        if self._loaded_at is None:
+            await self.refresh()
+            return True
+        return False
+
+    async def _refresh_on_miss(self):
+        if self._refreshing is not None:
+            await asyncio.shield(self._refreshing)
+            return
+        if self._loaded_at is None or asyncio.get_running_loop().time() - self._loaded_at >= self.refresh_interval:
+            await self.refresh()
+
+    async def _fetch_one(self, record_id: int) -> Optional[File]:
+        async with self._semaphore:
+            records = await self.api.get_records(record_id=record_id)
+        record = next((record for record in records or () if record.id == record_id), None)
+        if record is None:
+            if records is not None:
+                self._missing.add(record_id)
+            return None
+        self._add(record)
+        return record
+
+    async def get_many(self, record_ids: Iterable[int]) -> dict[int, Optional[File]]:
+        """
+        Найти записи по id. За один вызов список записей выгружается не больше одного раза:
+        если выгрузка не удалась, промахи запрашиваются по id отдельно
+        @param record_ids: id онлайн-записей
+        @return: id -> запись или None, если запись не найдена
+        """
+        record_ids = list(dict.fromkeys(record_ids))
+        loaded = await self._ensure_loaded()
+        misses = [record_id for record_id in record_ids if self._is_miss(record_id)]
+        if misses:
+            if not loaded:
+                await self._refresh_on_miss()
+                misses = [record_id for record_id in misses if self._is_miss(record_id)]
+            await asyncio.gather(*(self._fetch_one(record_id) for record_id in misses))
+        return {record_id: self._by_id.get(record_id) for record_id in record_ids}
+
+    def _is_miss(self, record_id: int) -> bool:
+        return record_id not in self._by_id and record_id not in self._missing
+
+    async def get(self, record_id: int) -> Optional[File]:
+        """
+        Найти запись по id
+        @param record_id: id онлайн-записи
+        @return: запись или None
+        """
+        return (await self.get_many((record_id,)))[record_id]
+
+    async def link(self, record_id: int) -> Optional[str]:
+        """
+        Ссылка на онлайн-запись
+        @param record_id: id онлайн-записи
+        @return: ссылка или None
+        """
+        record = await self.get(record_id)
+        return record.link or None if record is not None else None
+
+    async def links(self, record_ids: Iterable[int]) -> dict[int, Optional[str]]:
+        """
+        Ссылки на онлайн-записи
+        @param record_ids: id онлайн-записей
+        @return: id -> ссылка или None
+        """
+        records = await self.get_many(record_ids)
+        return {
+            record_id: record.link or None if record is not None else None for record_id, record in records.items()
+        }
+
+    async def for_session(self, event_session_id: int) -> list[File]:
+        """
+        Записи вебинара из индекса. Промах не вызывает перезагрузку: у вебинара может не быть записей
+        @param event_session_id: id вебинара
+        @return: записи вебинара
+        """
+        await self._ensure_loaded()
+        return list(self._by_session.get(event_session_id, ()))
+
+    def __contains__(self, record_id: int) -> bool:
+        return record_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
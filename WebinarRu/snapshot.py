@@ -0,0 +1,201 @@
+import asyncio
+import datetime
+from typing import Optional, Sequence, Literal, Callable, Awaitable, Any, Hashable, AsyncIterator
+
+from .models import Event, EventSession, EventSnapshot, EventSessionSnapshot, File
+
+
+__all__ = [
+    "SnapshotPart",
+    "ALL_PARTS",
+    "SharedLookups",
+    "SnapshotBuilder",
+]
+
+
+SnapshotPart = Literal["sessions", "participations", "files", "records"]
+ALL_PARTS: tuple[SnapshotPart, ...] = ("sessions", "participations", "files", "records")
+
+RECORDS_PAGE = 100
+PARTICIPATIONS_PAGE = 500
+
+
+class SharedLookups:
+    """
+    Общий реестр запросов: одинаковые запросы (по ключу) выполняются один раз,
+    остальные вызовы ждут результат уже запущенной задачи.
+    """
+    def __init__(self):
+        self._tasks: dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+        return await asyncio.shield(task)
+
+    def cancel(self):
+        """
+        Отменяет незавершённые запросы
+        """
+        for task in self._tasks.values():
+            task.cancel()
+
+
+class SnapshotBuilder:
+    """
+    Собирает дерево мероприятия (Event → EventSession → участники, файлы, записи) конкретными запросами
+    с учётом зависимостей: сначала серия, затем параллельно файлы серии, записи за период и данные каждого вебинара.
+    Одинаковые запросы (например, записи за один и тот же день у разных вебинаров) выполняются один раз.
+    """
+    def __init__(
+            self,
+            api,
+            include: Sequence[SnapshotPart] = ALL_PARTS,
+            concurrency: int = 10,
+    ):
+        """
+        @param api: экземпляр WebinarAPI
+        @param include: какие части дерева загружать
+        @param concurrency: максимальное количество одновременных запросов
+        """
+        unknown = set(include) - set(ALL_PARTS)
+        if unknown:
+            raise ValueError(f"Unknown snapshot parts: {', '.join(sorted(unknown))}")
+        self.api = api
+        self.include = frozenset(include)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lookups = SharedLookups()
+
+    async def _call(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        async def limited():
+            async with self._semaphore:
+                return await factory()
+        return await self._lookups.get(key, limited)
+
+    async def _participations(self, session_id: int):
+        result = []
+        page = 1
+        while True:
+            chunk = await self._call(
+                ("participations", session_id, page),
+                lambda page=page: self.api.get_event_session_participations(
+                    session_id, per_page=PARTICIPATIONS_PAGE, page=page
+                ),
+            )
+            if chunk is None:
+                return None
+            result.extend(chunk)
+            if len(chunk) < PARTICIPATIONS_PAGE:
+                return result
+            page += 1
+
+    async def _records_for_day(self, day: datetime.date) -> Optional[list[File]]:
+        async def fetch():
+            date_from = datetime.datetime.combine(day, datetime.time.min)
+            date_to = date_from + datetime.timedelta(days=1)
+            result = []
+            offset = 0
+            while True:
+                async with self._semaphore:
+                    chunk = await self.api.get_records(
+                        date_from=date_from, date_to=date_to, offset=offset, limit=RECORDS_PAGE
+                    )
+                if chunk is None:
+                    return None
+                result.extend(chunk)
+                if len(chunk) < RECORDS_PAGE:
+                    return result
+                offset += RECORDS_PAGE
+        return await self._lookups.get(("records", day), fetch)
+
+    async def _session_records(self, session: EventSession) -> Optional[list[File]]:
+        if session.startsAt is None:
+            return None
+        first = session.startsAt.date()
+        last = max(session.endsAt.date(), first) if session.endsAt is not None else first
+        days = [first + datetime.timedelta(days=offset) for offset in range((last - first).days + 1)]
+        found = await asyncio.gather(*(self._records_for_day(day) for day in days))
+        if any(records is None for records in found):
+            return None
+        return [
+            record for records in found for record in records
+            if record.eventSession is not None and record.eventSession.id == session.id
+        ]
+
+    async def _session(self, session: EventSession) -> EventSessionSnapshot:
+        async def nothing():
+            return None
+
+        participations, files, records = await asyncio.gather(
+            self._participations(session.id) if "participations" in self.include else nothing(),
+            self._call(
+                ("session_files", session.id),
+                lambda: self.api.get_event_session_files(session.id),
+            ) if "files" in self.include else nothing(),
+            self._session_records(session) if "records" in self.include else nothing(),
+        )
+        return EventSessionSnapshot(session=session, participations=participations, files=files, records=records)
+
+    async def from_event(self, event: Event) -> EventSnapshot:
+        """
+        Собирает снимок по уже загруженной серии (например, из get_events)
+        @param event: серия мероприятий
+        @return: снимок серии
+        """
+        async def nothing():
+            return None
+
+        wants_sessions = bool(self.include & {"sessions", "participations", "records"})
+        sessions = (event.eventSessions or []) if wants_sessions else []
+        files, session_snapshots = await asyncio.gather(
+            self._call(("event_files", event.id), lambda: self.api.get_event_files(event.id))
+            if "files" in self.include else nothing(),
+            asyncio.gather(*(self._session(session) for session in sessions)),
+        )
+        return EventSnapshot(event=event, files=files, sessions=list(session_snapshots))
+
+    async def event(self, event_id: int) -> Optional[EventSnapshot]:
+        """
+        Собирает снимок серии по идентификатору
+        @param event_id: идентификатор серии (eventID)
+        @return: снимок серии или None, если серия не получена
+        """
+        event = await self._call(("event", event_id), lambda: self.api.get_event_info(event_id))
+        if event is None:
+            return None
+        return await self.from_event(event)
+
+    async def organization(
+            self,
+            date_from: Optional[datetime.datetime] = None,
+            date_to: Optional[datetime.datetime] = None,
+            per_page: int = 250,
+    ) -> AsyncIterator[EventSnapshot]:
+        """
+        Потоково собирает снимки всех серий организации. Одновременно обрабатывается не больше одной страницы
+        get_events, снимки отдаются по мере готовности. При выходе из цикла незавершённые запросы отменяются.
+        @param date_from: дата начала периода выборки
+        @param date_to: дата окончания периода выборки
+        @param per_page: размер страницы get_events
+        """
+        page = 1
+        while True:
+            async with self._semaphore:
+                events = await self.api.get_events(date_from=date_from, date_to=date_to, page=page, per_page=per_page)
+            if not events:
+                return
+            tasks = [asyncio.ensure_future(self.from_event(event)) for event in events]
+            try:
+                for snapshot in asyncio.as_completed(tasks):
+                    yield await snapshot
+            finally:
+                # Если потребитель прервал обход, запросы страницы не должны продолжаться в фоне
+                for task in tasks:
+                    task.cancel()
+                self._lookups.cancel()
+            self._lookups = SharedLookups()
+            if len(events) < per_page:
+                return
+            page += 1
@@ -0,0 +1,182 @@
+import asyncio
+import functools
+import inspect
+import os
+import threading
+from typing import Optional, Any, Iterable, Iterator, Callable, Awaitable
+
+from .webinar_api import WebinarAPI
+
+
+__all__ = [
+    "SyncWebinarAPI",
+]
+
+
+# Event loop родителя после fork: его закрытие сняло бы сокеты с общего с родителем epoll
+_DETACHED_LOOPS: list = []
+
+
+class SyncWebinarAPI:
+    """
+    Синхронный фасад WebinarAPI для Django, Celery и других синхронных сервисов.
+    Все запросы выполняются в одном фоновом потоке с собственным event loop, поэтому пул соединений
+    переиспользуется между вызовами. Методы можно вызывать одновременно из разных потоков.
+    После fork (например, в воркерах Celery) фоновый поток и пул соединений создаются заново.
+
+        webinar = SyncWebinarAPI("YOUR_API_TOKEN")
+        events = webinar.get_events(per_page=50)
+        infos = webinar.map("get_event_info", [1, 2, 3], concurrency=10)
+    """
+    def __init__(
+            self,
+            token: Optional[str] = None,
+            api: Optional[WebinarAPI] = None,
+            call_timeout: Optional[float] = None,
+            **options,
+    ):
+        """
+        @param token: токен API
+        @param api: готовый клиент WebinarAPI (вместо token и options)
+        @param call_timeout: максимальное время ожидания результата одного вызова, сек
+        @param options: параметры WebinarAPI (base_link, strict, timeout, transport, cache, ...)
+        """
+        if api is None:
+            if token is None:
+                raise ValueError("token or api is required")
+            api = WebinarAPI(token, **options)
+        self.api = api
+        self.call_timeout = call_timeout
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        loop = self._loop
+        if loop is not None and self._pid == os.getpid():
+            return loop
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                if self._pid is not None and self._pid != os.getpid():
+                    # Процесс создан через fork: loop и соединения родителя здесь не работают.
+                    # Закрывать их нельзя — сокеты общие с родителем, поэтому клиент просто их забывает
+                    _DETACHED_LOOPS.append(self._loop)
+                    self.api.transport.detach()
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="WebinarAPI-loop", daemon=True)
+                thread.start()
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            return self._loop
+
+    def run(self, coroutine: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Выполнить корутину в фоновом event loop и дождаться результата
+        @param coroutine: корутина
+        @param timeout: максимальное время ожидания. По умолчанию — call_timeout
+        @return: результат корутины
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+        try:
+            return future.result(timeout if timeout is not None else self.call_timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, iterator: Any) -> Iterator:
+        """
+        Блокирующий обход асинхронного итератора (например, iter_event_snapshots)
+        """
+        try:
+            while True:
+                try:
+                    yield self.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if hasattr(iterator, "aclose"):
+                self.run(iterator.aclose())
+
+    def map(
+            self,
+            method: str | Callable[..., Awaitable],
+            *iterables: Iterable,
+            concurrency: int = 10,
+            return_exceptions: bool = False,
+    ) -> list:
+        """
+        Параллельно вызвать метод для каждого набора аргументов (как встроенный map)
+        @param method: имя метода WebinarAPI или асинхронная функция
+        @param iterables: позиционные аргументы вызовов
+        @param concurrency: максимальное количество одновременных вызовов
+        @param return_exceptions: вернуть исключения в списке результатов вместо выброса первого
+        @return: результаты в порядке аргументов
+        """
+        func = getattr(self.api, method) if isinstance(method, str) else method
+        arguments = list(zip(*iterables))
+
+        async def run_all():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def call(args):
+                async with semaphore:
+                    return await func(*args)
+
+            return await asyncio.gather(*(call(args) for args in arguments), return_exceptions=return_exceptions)
+
+        return self.run(run_all())
+
+    def gather(self, *calls: Callable[[WebinarAPI], Awaitable], return_exceptions: bool = False) -> list:
+        """
+        Параллельно выполнить несколько разных вызовов
+        @param calls: функции от WebinarAPI, например lambda api: api.get_event_info(1)
+        @param return_exceptions: вернуть исключения в списке результатов вместо выброса первого
+        @return: результаты в порядке вызовов
+        """
+        async def run_all():
+            return await asyncio.gather(*(call(self.api) for call in calls), return_exceptions=return_exceptions)
+
+        return self.run(run_all())
+
+    def close(self):
+        """
+        Закрывает соединения и останавливает фоновый поток
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid():
+                return
+            asyncio.run_coroutine_threadsafe(self.api.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            self._loop = self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _blocking(name: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def method(self: SyncWebinarAPI, *args, **kwargs):
+        return self.run(getattr(self.api, name)(*args, **kwargs))
+    return method
+
+
+def _blocking_iterator(name: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def method(self: SyncWebinarAPI, *args, **kwargs):
+        return self.iterate(getattr(self.api, name)(*args, **kwargs))
+    return method
+
+
+for _name, _function in inspect.getmembers(WebinarAPI, inspect.isfunction):
+    if _name.startswith("_") or _name == "close" or hasattr(SyncWebinarAPI, _name):
+        continue
+    if inspect.iscoroutinefunction(_function):
+        setattr(SyncWebinarAPI, _name, _blocking(_name, _function))
+    elif inspect.isasyncgenfunction(_function):
+        setattr(SyncWebinarAPI, _name, _blocking_iterator(_name, _function))
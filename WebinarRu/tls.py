@@ -0,0 +1,69 @@
+import hashlib
+import ssl
+from typing import Optional, Sequence
+
+
+__all__ = [
+    "make_ssl_context",
+    "pin_ssl_context",
+]
+
+
+def make_ssl_context(
+        cafile: Optional[str] = None,
+        capath: Optional[str] = None,
+        cadata: Optional[str | bytes] = None,
+        verify: bool = True,
+) -> ssl.SSLContext:
+    """
+    Создаёт SSL контекст для клиента. Контекст создаётся один раз и используется всеми запросами клиента.
+    @param cafile: путь к файлу с корневыми сертификатами. По умолчанию используется системное хранилище
+    @param capath: путь к каталогу с корневыми сертификатами
+    @param cadata: корневые сертификаты в формате PEM/DER
+    @param verify: проверять сертификат сервера. Отключать только для отладки
+    @return: SSL контекст
+    """
+    context = ssl.create_default_context(cafile=cafile, capath=capath, cadata=cadata)
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class _PinnedSSLObject(ssl.SSLObject):
+    """
+    SSLObject, который после рукопожатия сверяет отпечаток сертификата сервера с допустимыми
+    """
+    pins: frozenset[bytes] = frozenset()
+
+    def do_handshake(self):
+        super().do_handshake()
+        certificate = self.getpeercert(binary_form=True)
+        got = hashlib.sha256(certificate).digest() if certificate is not None else b""
+        if got not in self.pins:
+            raise ssl.SSLCertVerificationError(
+                f"certificate fingerprint mismatch for {self.server_hostname}: sha256 {got.hex()}"
+            )
+
+
+def _normalize_pin(pin: str | bytes) -> bytes:
+    if isinstance(pin, bytes):
+        return pin
+    return bytes.fromhex(pin.replace(":", ""))
+
+
+def pin_ssl_context(context: ssl.SSLContext, pins: Sequence[str | bytes]) -> ssl.SSLContext:
+    """
+    Добавляет к SSL контексту проверку отпечатка (SHA-256) сертификата сервера поверх обычной проверки цепочки.
+    В отличие от aiohttp.Fingerprint не отключает проверку сертификата и допускает несколько
+    отпечатков (текущий и резервный). Проверка выполняется сразу после рукопожатия, до отправки запроса,
+    через SSLContext.sslobject_class и работает с любым клиентом на asyncio.
+    Контекст изменяется на месте: не используйте его для соединений без закрепления
+    @param context: SSL контекст
+    @param pins: допустимые отпечатки (hex строка, можно с двоеточиями, или bytes)
+    @return: тот же контекст
+    """
+    context.sslobject_class = type(
+        "PinnedSSLObject", (_PinnedSSLObject,), {"pins": frozenset(_normalize_pin(pin) for pin in pins)}
+    )
+    return context
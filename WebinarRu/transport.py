@@ -0,0 +1,242 @@
+import asyncio
+import json
+import ssl
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Mapping, Any
+
+import aiohttp
+
+from .tls import make_ssl_context, pin_ssl_context
+
+
+__all__ = [
+    "TransportResponse",
+    "Transport",
+    "AiohttpTransport",
+    "HttpxTransport",
+]
+
+
+@dataclass(slots=True)
+class TransportResponse:
+    status: int  # HTTP статус
+    headers: Mapping[str, str] = field(default_factory=dict)  # заголовки ответа
+    body: bytes = b""  # тело ответа
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+    def json(self) -> Any:
+        if not self.body.strip():
+            return None
+        return json.loads(self.body)
+
+
+class Transport(ABC):
+    """
+    Транспорт, через который BaseAPI выполняет HTTP запросы.
+    Реализация должна бросать asyncio.TimeoutError при истечении таймаута
+    и ConnectionError (или aiohttp.ClientConnectionError) при недоступности сервера.
+    """
+    @abstractmethod
+    async def request(
+            self,
+            method: str,
+            url: str,
+            params: Optional[dict] = None,
+            data: Optional[dict] = None,
+            headers: Optional[Mapping[str, str]] = None,
+            timeout: Optional[aiohttp.ClientTimeout] = None,
+    ) -> TransportResponse:
+        ...
+
+    async def close(self):
+        pass
+
+    def detach(self):
+        """
+        Забыть открытые соединения, не закрывая их. Нужен в дочернем процессе после fork:
+        сокеты принадлежат родителю, а новые соединения создаются при следующем запросе
+        """
+
+
+# Сессии и клиенты, брошенные после fork. Их нельзя закрывать и нельзя отдавать сборщику мусора:
+# при закрытии сокеты снимаются с epoll, который общий с родительским процессом
+_DETACHED: list = []
+
+
+def _check_loop(name: str, bound: Optional[asyncio.AbstractEventLoop], loop: asyncio.AbstractEventLoop):
+    """
+    Открытые соединения принадлежат event loop, в котором они созданы, и не могут быть закрыты из другого.
+    Вместо того чтобы бросить их незакрытыми, транспорт требует закрыть себя до смены loop
+    """
+    if bound is not None and bound is not loop:
+        raise RuntimeError(
+            f"{name} is bound to another event loop. Close the client (await webinar.close()) "
+            "before using it in a new loop, or use SyncWebinarAPI to share one loop between calls"
+        )
+
+
+class AiohttpTransport(Transport):
+    """
+    Транспорт на aiohttp (HTTP/1.1) с пулом keep-alive соединений.
+    Сессия и коннектор создаются при первом запросе и привязаны к его event loop до close().
+    """
+    def __init__(
+            self,
+            ssl_context: Optional[ssl.SSLContext] = None,
+            ssl_pins: Optional[Sequence[str | bytes]] = None,
+            connection_limit: int = 100,
+    ):
+        """
+        @param ssl_context: SSL контекст. По умолчанию — системные сертификаты
+        @param ssl_pins: допустимые SHA-256 отпечатки сертификата сервера. Проверка добавляется в ssl_context
+        (см. pin_ssl_context)
+        @param connection_limit: максимальное количество одновременных соединений
+        """
+        self.ssl_context = ssl_context if ssl_context is not None else make_ssl_context()
+        self.ssl_pins = list(ssl_pins) if ssl_pins else None
+        if self.ssl_pins:
+            pin_ssl_context(self.ssl_context, self.ssl_pins)
+        self.connection_limit = connection_limit
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed:
+            _check_loop(type(self).__name__, self._session_loop, loop)
+        else:
+            connector = aiohttp.TCPConnector(ssl=self.ssl_context, limit=self.connection_limit, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            params: Optional[dict] = None,
+            data: Optional[dict] = None,
+            headers: Optional[Mapping[str, str]] = None,
+            timeout: Optional[aiohttp.ClientTimeout] = None,
+    ) -> TransportResponse:
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        async with self._get_session().request(
+            method,
+            url=url,
+            params=params,
+            data=data,
+            headers=headers,
+            **kwargs,
+        ) as resp:
+            return TransportResponse(resp.status, resp.headers, await resp.read())
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            _check_loop(type(self).__name__, self._session_loop, asyncio.get_running_loop())
+            await self._session.close()
+        self.detach()
+
+    def detach(self):
+        if self._session is not None:
+            _DETACHED.append(self._session)
+        self._session = None
+        self._session_loop = None
+
+
+class HttpxTransport(Transport):
+    """
+    Транспорт на httpx с поддержкой HTTP/2: все запросы мультиплексируются
+    в небольшом количестве соединений. Требует установленных httpx и h2 (pip install "httpx[http2]").
+    Закрепление сертификата (ssl_pins) не поддерживается: для него используйте AiohttpTransport.
+    """
+    def __init__(
+            self,
+            ssl_context: Optional[ssl.SSLContext] = None,
+            http2: bool = True,
+            connection_limit: int = 10,
+    ):
+        """
+        @param ssl_context: SSL контекст. По умолчанию — системные сертификаты
+        @param http2: использовать HTTP/2
+        @param connection_limit: максимальное количество соединений
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError('HttpxTransport requires httpx: pip install "httpx[http2]"') from e
+        self._httpx = httpx
+        self.ssl_context = ssl_context if ssl_context is not None else make_ssl_context()
+        self.http2 = http2
+        self.connection_limit = connection_limit
+        self._client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is not None and not self._client.is_closed:
+            _check_loop(type(self).__name__, self._client_loop, loop)
+        else:
+            self._client = self._httpx.AsyncClient(
+                http2=self.http2,
+                verify=self.ssl_context,
+                limits=self._httpx.Limits(
+                    max_connections=self.connection_limit,
+                    max_keepalive_connections=self.connection_limit,
+                ),
+                timeout=None,
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            params: Optional[dict] = None,
+            data: Optional[dict] = None,
+            headers: Optional[Mapping[str, str]] = None,
+            timeout: Optional[aiohttp.ClientTimeout] = None,
+    ) -> TransportResponse:
+        httpx = self._httpx
+        request_timeout = None
+        if timeout is not None:
+            request_timeout = httpx.Timeout(
+                None,
+                connect=timeout.sock_connect or timeout.connect,
+                read=timeout.sock_read,
+                pool=timeout.connect,
+            )
+        try:
+            async with asyncio.timeout(timeout.total if timeout is not None else None):
+                resp = await self._get_client().request(
+                    method,
+                    url,
+                    params=params,
+                    data=data,
+                    headers=dict(headers) if headers is not None else None,
+                    timeout=request_timeout,
+                )
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError from e
+        except httpx.TransportError as e:
+            raise ConnectionError(str(e)) from e
+        return TransportResponse(resp.status_code, resp.headers, resp.content)
+
+    async def close(self):
+        if self._client is not None and not self._client.is_closed:
+            _check_loop(type(self).__name__, self._client_loop, asyncio.get_running_loop())
+            await self._client.aclose()
+        self.detach()
+
+    def detach(self):
+        if self._client is not None:
+            _DETACHED.append(self._client)
+        self._client = None
+        self._client_loop = None
@@ -1,20 +1,229 @@
+import asyncio
 import datetime
+import os
+import ssl
+from contextlib import aclosing
+
+import aiohttp
+
 from .base_api import BaseAPI
+from .breaker import CircuitBreakers
+from .transport import Transport
 from .models import *
-from typing import Optional, Literal, Sequence
+from .models import REGISTRATION_FIELDS
+from .params import ParamSpec, Field
+from typing import Optional, Literal, Sequence, AsyncIterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .bulk import BulkJournal, RollbackMode
+    from .cache import DiskCache
+    from .columns import ParticipantColumns, UserStatsColumns
+    from .diff import FingerprintStore, ParticipantDiff
+    from .parallel import ProcessDecoder
+    from .snapshot import SnapshotPart
+
+
+_PAGE = ParamSpec(per_page="perPage", page="page")
+_MEMBERS = ParamSpec(
+    per_page="perPage",
+    page="page",
+    user_id="id",
+    role="role",
+    email="email",
+    position="position",
+)
+_CONTACTS = ParamSpec(
+    contact_ids=Field("contactIds", "array", "falsy"),
+    tags=Field("tags", "array", "falsy"),
+    contact_data=Field("contactsData", "mapping", "falsy"),
+    user_ids=Field("userIds", "array", "falsy"),
+    per_page="perPage",
+    page="page",
+)
+_REGISTER = ParamSpec(
+    email=Field("email", skip="never"),
+    name=Field("name", skip="never"),
+    second_name=Field("secondName", skip="never"),
+    nickname=Field("nickname", skip="falsy"),
+    role=Field("role", skip="falsy"),
+    is_auto_enter=Field("isAutoEnter", "bool", "falsy"),
+    is_accepted=Field("isAccepted", "bool", "falsy"),
+    send_email=Field("sendEmail", "bool", "falsy"),
+    avatar=Field("avatar", skip="falsy"),
+    pattr_name=Field("pattrName", skip="falsy"),
+    phone=Field("phone", skip="falsy"),
+    description=Field("description", skip="falsy"),
+    organization=Field("organization", skip="falsy"),
+    position=Field("position", skip="falsy"),
+    sex=Field("sex", skip="falsy"),
+)
+_INVITE = ParamSpec(
+    is_auto_enter=Field("isAutoEnter", "bool", "falsy"),
+    send_email=Field("sendEmail", "bool", "falsy"),
+)
+_EVENTS = ParamSpec(
+    date_from=Field("from", "str"),
+    name="name",
+    status=Field("status", "array"),
+    date_to=Field("to", "str"),
+    access_settings=Field("accessSettings", "settings"),
+    access="access",
+    page="page",
+    per_page="perPage",
+)
+_DELETE_SESSION = ParamSpec(send_email=Field("sendEmail", "bool"))
+_CREATE_EVENT = ParamSpec(
+    name=Field("name", skip="never"),
+    access_settings=Field("AccessSettings", "settings", "never"),
+    access=Field("access", skip="never"),
+    password="password",
+    description="description",
+    rule="rule",
+    is_event_reg_allowed=Field("isEventRegAllowed", "bool"),
+    starts_at=Field("startsAt", "date"),
+    ends_at=Field("endsAt", "date"),
+    timezone="timezone",
+    image="image",
+    event_type="type",
+    lang="lang",
+    url_alias="urlAlias",
+    lector_ids=Field("lectorIds", "array"),
+    tags=Field("tags", "array"),
+    duration="duration",
+    owner_id="ownerId",
+    default_reminders_enabled=Field("defaultRemindersEnabled", "bool"),
+    branding_id="brandingId",
+)
+_EDIT_EVENT = ParamSpec(
+    name="name",
+    access_settings=Field("AccessSettings", "settings"),
+    access="access",
+    status="status",
+    password="password",
+    description="description",
+    lang="lang",
+    url_alias="urlAlias",
+    starts_at=Field("startsAt", "date"),
+    timezone="timezone",
+    image="image",
+    duration="duration",
+    owner_id="ownerId",
+    branding_id="brandingId",
+)
+_CREATE_SESSION = ParamSpec(
+    name="name",
+    access_settings=Field("accessSettings", "settings"),
+    access="access",
+    start_type="startType",
+    description="description",
+    lang="lang",
+    starts_at=Field("startsAt", "date"),
+    timezone="timezone",
+    image="image",
+)
+_EDIT_SESSION = ParamSpec(
+    name="name",
+    access_settings=Field("AccessSettings", "settings"),
+    access="access",
+    start_type="startType",
+    description="description",
+    lang="lang",
+    starts_at=Field("startsAt", "date"),
+    timezone="timezone",
+    image="image",
+    duration="duration",
+    send_email=Field("sendEmail", "bool"),
+    update_context="updateContext",
+)
+_CHAT = ParamSpec(
+    is_moderated=Field("isModerated", "bool"),
+    limit="limit",
+    author_id="author_id",
+    private_chat=Field("privateChat", "bool"),
+)
+_FILES = ParamSpec(
+    user="user",
+    parent="parent",
+    file_format="format",
+    is_shared=Field("isShared", "bool"),
+)
+_FILE = ParamSpec(name="name")
+_ATTACHED_FILES = ParamSpec(file_id="fileId")
+_RECORDS = ParamSpec(
+    date_from=Field("from", "str"),
+    record_id="id",
+    period="period",
+    date_to=Field("to", "str"),
+    user_id="userId",
+    offset="offset",
+    limit="limit",
+)
+_SHARE_RECORD = ParamSpec(
+    is_viewable=Field("isViewable", "bool"),
+    password="password",
+    view_access="viewAccess",
+)
+_EVENTS_STATS = ParamSpec(
+    date_from=Field("from", "str"),
+    date_to=Field("to", "str"),
+    user_id=Field("userId", "str"),
+    event_id=Field("eventId", "str"),
+)
+_USERS_STATS = ParamSpec(
+    date_from=Field("from", "str"),
+    date_to=Field("to", "str"),
+    event_id=Field("eventId", "str"),
+)
 
 
 class WebinarAPI(BaseAPI):
     def __init__(
             self,
             token: str,
-            base_link: str = "https://userapi.webinar.ru/v3"
+            base_link: str = "https://userapi.webinar.ru/v3",
+            strict: bool = False,
+            timeout: Optional[aiohttp.ClientTimeout] = None,
+            route_timeouts: Optional[dict[str, aiohttp.ClientTimeout]] = None,
+            ssl_context: Optional[ssl.SSLContext] = None,
+            ssl_pins: Optional[Sequence[str | bytes]] = None,
+            connection_limit: int = 100,
+            transport: Optional[Transport] = None,
+            cache: Optional["DiskCache"] = None,
+            decoder: Optional["ProcessDecoder"] = None,
+            breakers: Optional[CircuitBreakers] = None,
     ):
-        super().__init__(base_link)
-        self.headers = {
-            "x-auth-token": token,
-            "Accept": "*/*",
-        }
+        """
+        @param token: токен API (x-auth-token)
+        @param base_link: адрес API
+        @param strict: строгий режим. При ошибках запросов бросаются исключения
+        из WebinarRu.exceptions вместо возврата None
+        @param timeout: таймауты запросов по умолчанию
+        @param route_timeouts: таймауты для отдельных маршрутов (шаблоны fnmatch)
+        @param ssl_context: SSL контекст (см. WebinarRu.tls.make_ssl_context)
+        @param ssl_pins: допустимые SHA-256 отпечатки сертификата сервера
+        @param connection_limit: максимальное количество одновременных соединений
+        @param transport: транспорт HTTP запросов, например HttpxTransport для HTTP/2
+        @param cache: дисковый кэш GET ответов (WebinarRu.cache.DiskCache)
+        @param decoder: пул процессов для разбора ответов (WebinarRu.parallel.ProcessDecoder)
+        @param breakers: предохранители маршрутов (WebinarRu.breaker.CircuitBreakers)
+        """
+        super().__init__(
+            base_link,
+            strict=strict,
+            timeout=timeout,
+            route_timeouts=route_timeouts,
+            ssl_context=ssl_context,
+            ssl_pins=ssl_pins,
+            connection_limit=connection_limit,
+            transport=transport,
+            cache=cache,
+            decoder=decoder,
+            breakers=breakers,
+            headers={
+                "x-auth-token": token,
+                "Accept": "*/*",
+            },
+        )
 
     async def get_members(
             self,
@@ -38,13 +247,9 @@ class WebinarAPI(BaseAPI):
         @param position: должность, указанная в профиле
         @return: Коллекция сотрудников
         """
-        params = {}
-        params.update({"perPage": per_page}) if per_page is not None else ...
-        params.update({"page": page}) if page is not None else ...
-        params.update({"id": user_id}) if user_id is not None else ...
-        params.update({"role": role}) if role is not None else ...
-        params.update({"email": email}) if email is not None else ...
-        params.update({"position": position}) if position is not None else ...
+        params = _MEMBERS.build(
+            per_page=per_page, page=page, user_id=user_id, role=role, email=email, position=position
+        )
 
         members = await self.get_json("/organization/members", params)
         if members is not None:
@@ -60,6 +265,8 @@ class WebinarAPI(BaseAPI):
                 ]
             ] = None,
             user_ids: Optional[list] = None,
+            per_page: Optional[Literal[10, 50, 100, 250, 500]] = None,  # perPage
+            page: Optional[int] = None,
     ) -> Optional[Sequence[Contact]]:
         """
         Поиск контактов по различным критериям.
@@ -67,13 +274,18 @@ class WebinarAPI(BaseAPI):
         :param tags: теги контактов
         :param contact_data: данные контактов
         :param user_ids: массив ID пользователей. Можно передать несколько userID.
+        :param per_page: количество контактов на одной странице
+        :param page: номер страницы
         :return: Коллекция контактов
         """
-        params = {}
-        params.update(self._make_massive(contact_ids, "contactIds")) if contact_ids else ...
-        params.update(self._make_massive(tags, "tags")) if tags else ...
-        params.update(self._make_data_massive(contact_data, "contactsData")) if contact_data else ...
-        params.update(self._make_massive(user_ids, "userIds")) if user_ids else ...
+        params = _CONTACTS.build(
+            contact_ids=contact_ids,
+            tags=tags,
+            contact_data=contact_data,
+            user_ids=user_ids,
+            per_page=per_page,
+            page=page,
+        )
         contacts = await self.get_json("/contacts/search", params)
         if contacts is not None:
             return [Contact(**contact) for contact in contacts]
@@ -117,22 +329,23 @@ class WebinarAPI(BaseAPI):
         :param sex: должность участника;
         :return: Данные зарегистрированного участника.
         """
-        data = {}
-        data.update({"email": email})
-        data.update({"name": name})
-        data.update({"secondName": second_name})
-        data.update({"nickname": nickname}) if nickname else ...
-        data.update({"role": role}) if role else ...
-        data.update({"isAutoEnter": str(is_auto_enter).lower()}) if is_auto_enter else ...
-        data.update({"isAccepted": str(is_accepted).lower()}) if is_accepted else ...
-        data.update({"sendEmail": str(send_email).lower()}) if send_email else ...
-        data.update({"avatar": avatar}) if avatar else ...
-        data.update({"pattrName": pattr_name}) if pattr_name else ...
-        data.update({"phone": phone}) if phone else ...
-        data.update({"description": description}) if description else ...
-        data.update({"organization": organization}) if organization else ...
-        data.update({"position": position}) if position else ...
-        data.update({"sex": sex}) if sex else ...
+        data = _REGISTER.build(
+            email=email,
+            name=name,
+            second_name=second_name,
+            nickname=nickname,
+            role=role,
+            is_auto_enter=is_auto_enter,
+            is_accepted=is_accepted,
+            send_email=send_email,
+            avatar=avatar,
+            pattr_name=pattr_name,
+            phone=phone,
+            description=description,
+            organization=organization,
+            position=position,
+            sex=sex,
+        )
         registered_participant = await self.post_json(f"/events/{event_id}/register", data)
         if registered_participant is not None:
             return RegisteredParticipant(**registered_participant)
@@ -152,11 +365,8 @@ class WebinarAPI(BaseAPI):
         :param event_id: Идентификатор серии;
         :return: Данные зарегистрированного участника.
         """
-        data = {}
-        users = self._make_data_massive_list([user.dict() for user in users], "users")
-        data.update(users)
-        data.update({"isAutoEnter": str(is_auto_enter).lower()}) if is_auto_enter else ...
-        data.update({"sendEmail": str(send_email).lower()}) if send_email else ...
+        data = self._make_data_massive_list([user.dict() for user in users], "users")
+        data.update(_INVITE.build(is_auto_enter=is_auto_enter, send_email=send_email))
         registered_participants = await self.post_json(f"/events/{event_id}/invite", data)
         if registered_participants is not None:
             return [
@@ -193,15 +403,16 @@ class WebinarAPI(BaseAPI):
         @param per_page: количество элементов на одной странице выборки
         @return: Коллекция мероприятий
         """
-        params = {}
-        params.update({"from": str(date_from)}) if date_from is not None else ...
-        params.update({"name": name}) if name is not None else ...
-        params.update(self._make_massive(status, "status")) if status is not None else ...
-        params.update({"to": str(date_to)}) if date_to is not None else ...
-        params.update({"accessSettings": access_settings.to_dict}) if access_settings is not None else ...
-        params.update({"access": access}) if access is not None else ...
-        params.update({"page": page}) if page is not None else ...
-        params.update({"perPage": per_page}) if per_page is not None else ...
+        params = _EVENTS.build(
+            date_from=date_from,
+            name=name,
+            status=status,
+            date_to=date_to,
+            access_settings=access_settings,
+            access=access,
+            page=page,
+            per_page=per_page,
+        )
 
         events = await self.get_json(
             f"/users/{user_id}/events/schedule",
@@ -236,22 +447,18 @@ class WebinarAPI(BaseAPI):
         @param per_page: количество элементов на одной странице выборки
         @return: Коллекция мероприятий
         """
-        params = {}
-        params.update({"from": str(date_from)}) if date_from is not None else ...
-        params.update({"name": name}) if name is not None else ...
-        params.update(self._make_massive(status, "status")) if status is not None else ...
-        params.update({"to": str(date_to)}) if date_to is not None else ...
-        params.update({"accessSettings": access_settings.to_dict}) if access_settings is not None else ...
-        params.update({"access": access}) if access is not None else ...
-        params.update({"page": page}) if page is not None else ...
-        params.update({"perPage": per_page}) if per_page is not None else ...
-
-        events = await self.get_json(
-            "/organization/events/schedule",
-            params=params
+        params = _EVENTS.build(
+            date_from=date_from,
+            name=name,
+            status=status,
+            date_to=date_to,
+            access_settings=access_settings,
+            access=access,
+            page=page,
+            per_page=per_page,
         )
-        if events is not None:
-            return [Event(**event) for event in events]
+
+        return await self.get_models("/organization/events/schedule", Event, params)
 
     async def get_event_info(self, event_id: int) -> Optional[Event]:
         """
@@ -278,12 +485,8 @@ class WebinarAPI(BaseAPI):
         @param page: номер страницы
         @return: коллекция участников
         """
-        params = {}
-        params.update({"perPage": per_page}) if per_page is not None else ...
-        params.update({"page": page}) if page is not None else ...
-        participants = await self.get_json(f"/events/{event_id}/participations", params)
-        if participants is not None:
-            return [EventParticipant(**participant) for participant in participants]
+        params = _PAGE.build(per_page=per_page, page=page)
+        return await self.get_models(f"/events/{event_id}/participations", EventParticipant, params)
 
     async def get_event_session_participations(
             self,
@@ -299,12 +502,90 @@ class WebinarAPI(BaseAPI):
         :param page: номер страницы
         :rtype: коллекция участников
         """
-        params = {}
-        params.update({"perPage": per_page}) if per_page is not None else ...
-        params.update({"page": page}) if page is not None else ...
-        participants = await self.get_json(f"/eventsessions/{event_session_id}/participations", params)
-        if participants is not None:
-            return [EventSessionParticipant(**participant) for participant in participants]
+        params = _PAGE.build(per_page=per_page, page=page)
+        return await self.get_models(
+            f"/eventsessions/{event_session_id}/participations", EventSessionParticipant, params
+        )
+
+    async def iter_event_session_participations(
+            self,
+            event_session_id: int,
+            per_page: Literal[10, 50, 100, 250, 500] = 500,
+    ) -> AsyncIterator[Sequence[EventSessionParticipant]]:
+        """
+        Постранично выгрузить всех участников вебинара. Следующая страница загружается,
+        пока разбирается текущая (с decoder — в пуле процессов).
+        :param event_session_id: Идентификатор вебинара
+        :param per_page: количество участников на одной странице
+        """
+        async for participants in self.iter_pages(
+                f"/eventsessions/{event_session_id}/participations", EventSessionParticipant, per_page=per_page
+        ):
+            yield participants
+
+    async def diff_event_session_participations(
+            self,
+            event_session_id: int,
+            store: "FingerprintStore",
+            fields: Optional[Sequence[str]] = REGISTRATION_FIELDS,
+    ) -> Optional["ParticipantDiff"]:
+        """
+        Новые, удалённые и изменённые участники вебинара с момента предыдущего вызова.
+        Сравниваются хэши полей участников из store, страницы выгрузки сравниваются по мере загрузки.
+        Снимок в store обновляется только после полной выгрузки; чтобы сохранить его в файл, вызовите store.save()
+        :param event_session_id: Идентификатор вебинара
+        :param store: хранилище снимков
+        :param fields: поля, изменение которых считается изменением участника. None — все поля
+        :return: различия или None, если выгрузка не удалась
+        """
+        key = f"eventsession:{event_session_id}"
+        differ = store.get(key, fields).differ()
+        route = f"/eventsessions/{event_session_id}/participations"
+        if not await self._feed_pages(differ, route, EventSessionParticipant):
+            return None
+        diff, snapshot = differ.finish()
+        store.put(key, snapshot)
+        return diff
+
+    async def diff_event_participations(
+            self,
+            event_id: int,
+            store: "FingerprintStore",
+            fields: Optional[Sequence[str]] = REGISTRATION_FIELDS,
+    ) -> Optional["ParticipantDiff"]:
+        """
+        Новые, удалённые и изменённые участники серии с регистрацией на всю серию с момента предыдущего вызова
+        :param event_id: Идентификатор мероприятия (eventID)
+        :param store: хранилище снимков
+        :param fields: поля, изменение которых считается изменением участника. None — все поля
+        :return: различия или None, если выгрузка не удалась
+        """
+        key = f"event:{event_id}"
+        differ = store.get(key, fields).differ()
+        if not await self._feed_pages(differ, f"/events/{event_id}/participations", EventParticipant):
+            return None
+        diff, snapshot = differ.finish()
+        store.put(key, snapshot)
+        return diff
+
+    async def _feed_pages(self, differ, route: str, model, per_page: int = 500) -> bool:
+        """
+        Передаёт страницы списка в differ. В отличие от iter_pages, ошибка запроса отличается от конца списка:
+        неполная выгрузка дала бы ложные удаления
+        @return: True, если выгружены все страницы
+        """
+        page = 1
+        while True:
+            body = await self.get_data(route, {"perPage": per_page, "page": page})
+            if body is None:
+                return False
+            items = await self._decode_body(route, body, model)
+            if items is None:
+                return False
+            differ.feed(items)
+            if len(items) < per_page:
+                return True
+            page += 1
 
     async def get_event_session_info(self, event_session_id: int) -> Optional[EventSession]:
         """
@@ -353,8 +634,7 @@ class WebinarAPI(BaseAPI):
         @param event_session_id: идентификатор вебинара (eventsessionID)
         @return: True если удаление успешно
         """
-        params = {}
-        params.update({"sendEmail": str(send_email).lower()}) if send_email is not None else ...
+        params = _DELETE_SESSION.build(send_email=send_email)
         delete_event = await self.delete(f"/eventsessions/{event_session_id}", params)
         if delete_event is not None:
             return True if delete_event == 204 else False
@@ -414,32 +694,28 @@ class WebinarAPI(BaseAPI):
         @param branding_id: выбрать шаблон брендирования для мероприятия. Указывается идентификатор шаблона
         @return: eventId — идентификатор шаблона, link — публичная ссылка на лендинг мероприятия
         """
-        data = {
-            "name": name,
-            "AccessSettings": access_settings.to_dict,
-            "access": access,
-        }
-        data.update({"password": password}) if password is not None else ...
-        data.update({"description": description}) if description is not None else ...
-        data.update({"rule": rule}) if rule is not None else ...
-        data.update(
-            {"isEventRegAllowed": str(is_event_reg_allowed).lower()}
-        ) if is_event_reg_allowed is not None else ...
-        data.update(self._datetime_to_dict("startsAt", starts_at)) if starts_at is not None else ...
-        data.update(self._datetime_to_dict("endsAt", ends_at)) if ends_at is not None else ...
-        data.update({"timezone": timezone}) if timezone is not None else ...
-        data.update({"image": image}) if image is not None else ...
-        data.update({"type": event_type}) if event_type is not None else ...
-        data.update({"lang": lang}) if lang is not None else ...
-        data.update({"urlAlias": url_alias}) if url_alias is not None else ...
-        data.update(self._make_massive(lector_ids, "lectorIds")) if lector_ids is not None else ...
-        data.update(self._make_massive(tags, "tags")) if tags is not None else ...
-        data.update({"duration": duration}) if duration is not None else ...
-        data.update({"ownerId": owner_id}) if owner_id is not None else ...
-        data.update(
-            {"defaultRemindersEnabled": str(default_reminders_enabled).lower()}
-        ) if default_reminders_enabled is not None else ...
-        data.update({"brandingId": branding_id}) if branding_id is not None else ...
+        data = _CREATE_EVENT.build(
+            name=name,
+            access_settings=access_settings,
+            access=access,
+            password=password,
+            description=description,
+            rule=rule,
+            is_event_reg_allowed=is_event_reg_allowed,
+            starts_at=starts_at,
+            ends_at=ends_at,
+            timezone=timezone,
+            image=image,
+            event_type=event_type,
+            lang=lang,
+            url_alias=url_alias,
+            lector_ids=lector_ids,
+            tags=tags,
+            duration=duration,
+            owner_id=owner_id,
+            default_reminders_enabled=default_reminders_enabled,
+            branding_id=branding_id,
+        )
 
         new_event = await self.post_json("/events", data)
         if new_event is not None:
@@ -486,21 +762,22 @@ class WebinarAPI(BaseAPI):
         @param branding_id: выбрать шаблон брендирования для мероприятия. Указывается идентификатор шаблона
         @return: True если изменено
         """
-        data = {}
-        data.update({"name": name}) if name is not None else ...
-        data.update({"AccessSettings": access_settings.to_dict}) if access_settings is not None else ...
-        data.update({"access": access}) if access is not None else ...
-        data.update({"status": status}) if status is not None else ...
-        data.update({"password": password}) if password is not None else ...
-        data.update({"description": description}) if description is not None else ...
-        data.update({"lang": lang}) if lang is not None else ...
-        data.update({"urlAlias": url_alias}) if url_alias is not None else ...
-        data.update(self._datetime_to_dict("startsAt", starts_at)) if starts_at is not None else ...
-        data.update({"timezone": timezone}) if timezone is not None else ...
-        data.update({"image": image}) if image is not None else ...
-        data.update({"duration": duration}) if duration is not None else ...
-        data.update({"ownerId": owner_id}) if owner_id is not None else ...
-        data.update({"brandingId": branding_id}) if branding_id is not None else ...
+        data = _EDIT_EVENT.build(
+            name=name,
+            access_settings=access_settings,
+            access=access,
+            status=status,
+            password=password,
+            description=description,
+            lang=lang,
+            url_alias=url_alias,
+            starts_at=starts_at,
+            timezone=timezone,
+            image=image,
+            duration=duration,
+            owner_id=owner_id,
+            branding_id=branding_id,
+        )
 
         edited_event = await self.put(f"/events/{event_id}", data)
         if edited_event is not None:
@@ -538,16 +815,17 @@ class WebinarAPI(BaseAPI):
         @return: eventsessionId — идентификатор вебинара. Используется для регистрации на вебинары, работы с записью;
         link — ссылка на сессию. В пользовательских сценариях не используется.
         """
-        data = {}
-        data.update({"name": name}) if name is not None else ...
-        data.update({"accessSettings": access_settings.to_dict}) if access_settings is not None else ...
-        data.update({"access": access}) if access is not None else ...
-        data.update({"startType": start_type}) if start_type is not None else ...
-        data.update({"description": description}) if description is not None else ...
-        data.update({"lang": lang}) if lang is not None else ...
-        data.update(self._datetime_to_dict("startsAt", starts_at)) if starts_at is not None else ...
-        data.update({"timezone": timezone}) if timezone is not None else ...
-        data.update({"image": image}) if image is not None else ...
+        data = _CREATE_SESSION.build(
+            name=name,
+            access_settings=access_settings,
+            access=access,
+            start_type=start_type,
+            description=description,
+            lang=lang,
+            starts_at=starts_at,
+            timezone=timezone,
+            image=image,
+        )
         new_event_session = await self.post_json(f"/events/{event_id}/sessions", data)
         if new_event_session is not None:
             return CreatedEventSession(**new_event_session)
@@ -589,19 +867,20 @@ class WebinarAPI(BaseAPI):
         в рамках серийного мероприятия для конкретного события в определенную дату
         @return True если изменено
         """
-        data = {}
-        data.update({"name": name}) if name is not None else ...
-        data.update({"AccessSettings": access_settings.to_dict}) if access_settings is not None else ...
-        data.update({"access": access}) if access is not None else ...
-        data.update({"startType": start_type}) if start_type is not None else ...
-        data.update({"description": description}) if description is not None else ...
-        data.update({"lang": lang}) if lang is not None else ...
-        data.update(self._datetime_to_dict("startsAt", starts_at)) if starts_at is not None else ...
-        data.update({"timezone": timezone}) if timezone is not None else ...
-        data.update({"image": image}) if image is not None else ...
-        data.update({"duration": duration}) if duration is not None else ...
-        data.update({"sendEmail": str(send_email).lower()}) if send_email is not None else ...
-        data.update({"updateContext": update_context}) if update_context is not None else ...
+        data = _EDIT_SESSION.build(
+            name=name,
+            access_settings=access_settings,
+            access=access,
+            start_type=start_type,
+            description=description,
+            lang=lang,
+            starts_at=starts_at,
+            timezone=timezone,
+            image=image,
+            duration=duration,
+            send_email=send_email,
+            update_context=update_context,
+        )
 
         edited_event_session = await self.put(f"/eventsessions/{event_session_id}", data)
         if edited_event_session is not None:
@@ -694,6 +973,29 @@ class WebinarAPI(BaseAPI):
             )
             return new_event
 
+    async def create_webinars(
+            self,
+            specs: Sequence[WebinarSpec],
+            concurrency: int = 10,
+            journal: Optional["BulkJournal | str | os.PathLike"] = None,
+            rollback: "RollbackMode" = "item",
+    ) -> list[BulkItemResult]:
+        """
+        Массовое создание мероприятий: параллельно создаются серии, затем их вебинары.
+        :param specs: описания мероприятий (WebinarSpec) с уникальными клиентскими ключами
+        :param concurrency: максимальное количество одновременных запросов
+        :param journal: журнал идемпотентности (BulkJournal или путь к JSON файлу). Повторный запуск с тем же
+        журналом пропускает созданные мероприятия и досоздаёт незавершённые
+        :param rollback: item — удалить серию при ошибке создания её вебинаров; all — при любой ошибке удалить
+        все серии, созданные в этом запуске; none — ничего не удалять
+        :return: результат по каждому элементу в порядке specs
+        """
+        from .bulk import BulkWebinarCreator, BulkJournal
+
+        if isinstance(journal, (str, os.PathLike)):
+            journal = BulkJournal(journal)
+        return await BulkWebinarCreator(self, concurrency, journal, rollback).run(specs)
+
     async def get_chat_messages(
             self,
             event_session_id: int,  # eventsessionID
@@ -711,16 +1013,9 @@ class WebinarAPI(BaseAPI):
         :param private_chat: получить приватный чат. Параметр используется только с указанием authorId
         :return: массив сообщений
         """
-        params = {}
-        params.update({"isModerated": str(is_moderated).lower()}) if is_moderated is not None else ...
-        params.update({"limit": limit}) if limit is not None else ...
-        params.update({"author_id": author_id}) if author_id is not None else ...
-        params.update({"privateChat": str(private_chat).lower()}) if private_chat is not None else ...
+        params = _CHAT.build(is_moderated=is_moderated, limit=limit, author_id=author_id, private_chat=private_chat)
 
-        messages = await self.get_json(f"/eventsessions/{event_session_id}/chat", params)
-        # print(messages)
-        if messages is not None:
-            return [ChatMessage(**message) for message in messages]
+        return await self.get_models(f"/eventsessions/{event_session_id}/chat", ChatMessage, params)
 
     async def get_files(
             self,
@@ -736,16 +1031,33 @@ class WebinarAPI(BaseAPI):
         :param file_format: расширение файла
         :param is_shared: поиск по общей папке
         """
-        params = {}
-        params.update({"user": user}) if user is not None else ...
-        params.update({"parent": parent}) if parent is not None else ...
-        params.update({"format": file_format}) if file_format is not None else ...
-        params.update({"isShared": str(is_shared).lower()}) if is_shared is not None else ...
+        params = _FILES.build(user=user, parent=parent, file_format=file_format, is_shared=is_shared)
 
-        files = await self.get_json("/fileSystem/files", params)
-        # pprint(files)
-        if files is not None:
-            return [File(**file) for file in files]
+        return await self.get_models("/fileSystem/files", File, params)
+
+    async def iter_files(
+            self,
+            root: Optional[int] = None,
+            formats: Optional[Sequence[str]] = None,
+            created_from: Optional[datetime.datetime] = None,
+            created_to: Optional[datetime.datetime] = None,
+            concurrency: int = 10,
+    ) -> AsyncIterator[File]:
+        """
+        Обойти папку и все вложенные папки файлового хранилища. Папки одного уровня запрашиваются параллельно,
+        файлы отдаются по мере загрузки. Дополнительные фильтры и статистика обхода — в WebinarRu.files.FileCrawler
+        :param root: id папки. По умолчанию — корневая папка
+        :param formats: расширения файлов, например ["mp4", "pdf"]
+        :param created_from: только файлы, созданные не раньше
+        :param created_to: только файлы, созданные раньше
+        :param concurrency: максимальное количество одновременных запросов
+        """
+        from .files import FileCrawler
+
+        crawler = FileCrawler(self, concurrency, formats=formats, created_from=created_from, created_to=created_to)
+        async with aclosing(crawler.crawl(root)) as files:
+            async for file in files:
+                yield file
 
     async def get_file(
             self,
@@ -757,8 +1069,7 @@ class WebinarAPI(BaseAPI):
         :param file_id: Идентификатор файла
         :param name: имя файла
         """
-        params = {}
-        params.update({"name": name}) if name is not None else ...
+        params = _FILE.build(name=name)
 
         file = await self.get_json(f"/fileSystem/file/{file_id}", params)
         # print(file)
@@ -776,8 +1087,7 @@ class WebinarAPI(BaseAPI):
         :param file_id: ID файла
         :return: коллекция файлов
         """
-        params = {}
-        params.update({"fileId": file_id}) if file_id is not None else ...
+        params = _ATTACHED_FILES.build(file_id=file_id)
         files = await self.get_json(f"/events/{event_id}/files", params)
         # print(files)
         if files is not None:
@@ -794,8 +1104,7 @@ class WebinarAPI(BaseAPI):
         :param file_id: ID файла
         :return: коллекция файлов
         """
-        params = {}
-        params.update({"fileId": file_id}) if file_id is not None else ...
+        params = _ATTACHED_FILES.build(file_id=file_id)
         files = await self.get_json(f"/eventsessions/{event_session_id}/files", params)
         # print(files)
         if files is not None:
@@ -822,19 +1131,17 @@ class WebinarAPI(BaseAPI):
         :param limit: параметр для определения количества отображаемых результатов
         :return: Коллекция записей
         """
-        params = {}
-        params.update({"from": str(date_from)}) if date_from is not None else ...
-        params.update({"id": record_id}) if record_id is not None else ...
-        params.update({"period": period}) if period is not None else ...
-        params.update({"to": str(date_to)}) if date_to is not None else ...
-        params.update({"userId": user_id}) if user_id is not None else ...
-        params.update({"offset": offset}) if offset is not None else ...
-        params.update({"limit": limit}) if limit is not None else ...
+        params = _RECORDS.build(
+            date_from=date_from,
+            record_id=record_id,
+            period=period,
+            date_to=date_to,
+            user_id=user_id,
+            offset=offset,
+            limit=limit,
+        )
 
-        records = await self.get_json("/records", params)
-        # pprint(records)
-        if records is not None:
-            return [File(**record) for record in records]
+        return await self.get_models("/records", File, params)
 
     async def share_online_record_by_id(
             self,
@@ -850,10 +1157,7 @@ class WebinarAPI(BaseAPI):
         :param password: пароль на запись;
         :param view_access: настройка доступа для показа записи.
         """
-        params = {}
-        params.update({"isViewable": str(is_viewable).lower()}) if is_viewable is not None else ...
-        params.update({"password": password}) if password is not None else ...
-        params.update({"viewAccess": view_access}) if view_access is not None else ...
+        params = _SHARE_RECORD.build(is_viewable=is_viewable, password=password, view_access=view_access)
 
         await self.put(f"/records/{record_id}", params)
 
@@ -872,10 +1176,7 @@ class WebinarAPI(BaseAPI):
         :param password: пароль на запись;
         :param view_access: настройка доступа для показа записи.
         """
-        params = {}
-        params.update({"isViewable": str(is_viewable).lower()}) if is_viewable is not None else ...
-        params.update({"password": password}) if password is not None else ...
-        params.update({"viewAccess": view_access}) if view_access is not None else ...
+        params = _SHARE_RECORD.build(is_viewable=is_viewable, password=password, view_access=view_access)
 
         await self.put(f"/eventsessions/{event_session_id}/records", params)
 
@@ -898,9 +1199,33 @@ class WebinarAPI(BaseAPI):
         :param record_id: id онлайн-записи
         :return: ссылка на онлайн-запись
         """
-        record_link = (await self.get_records(record_id=record_id))[0].link
-        if record_link:
-            return record_link
+        records = await self.get_records(record_id=record_id)
+        if records:
+            return records[0].link or None
+
+    async def get_online_record_links(
+            self,
+            record_ids: Sequence[int],
+            date_from: Optional[datetime.datetime] = None,
+            date_to: Optional[datetime.datetime] = None,
+            period: Optional[Literal['day', 'week', 'month', 'year']] = None,
+            concurrency: int = 10,
+    ) -> dict[int, Optional[str]]:
+        """
+        Получить ссылки на много записей: список записей за период выгружается один раз,
+        отдельными запросами загружаются только записи, которых нет в выгрузке.
+        Для повторных запросов используйте RecordIndex
+        :param record_ids: id онлайн-записей
+        :param date_from: дата начала периода выборки
+        :param date_to: дата окончания периода выборки
+        :param period: период выборки
+        :param concurrency: максимальное количество одновременных запросов отдельных записей
+        :return: id записи -> ссылка или None
+        """
+        from .records import RecordIndex
+
+        index = RecordIndex(self, date_from=date_from, date_to=date_to, period=period, concurrency=concurrency)
+        return await index.links(record_ids)
 
     async def get_events_stats(
             self,
@@ -909,14 +1234,10 @@ class WebinarAPI(BaseAPI):
             user_id: Optional[int] = None,  # userId
             event_id: Optional[int] = None,  # eventId
     ) -> Optional[Sequence[EventStats]]:
-        params = {}
-        params.update({"from": str(date_from)}) if date_from is not None else ...
-        params.update({"to": str(date_to)}) if date_to is not None else ...
-        params.update({"userId": str(user_id)}) if user_id is not None else ...
-        params.update({"eventId": str(event_id)}) if event_id is not None else ...
-        event_stats = await self.get_json("/stats/events", params)
+        params = _EVENTS_STATS.build(date_from=date_from, date_to=date_to, user_id=user_id, event_id=event_id)
+        event_stats = await self.get_models("/stats/events", EventStats, params)
         if event_stats:
-            return [EventStats(**event_stat) for event_stat in event_stats]
+            return event_stats
 
     async def get_users_stats(
             self,
@@ -933,13 +1254,115 @@ class WebinarAPI(BaseAPI):
         :param date_to: Дата окончания периода выборки. По умолчанию: from +1 год.
         :param event_id: EventID вебинара. Позволяет получить данные о конкретном мероприятии.
         """
-        params = {}
-        params.update({"from": str(date_from)}) if date_from is not None else ...
-        params.update({"to": str(date_to)}) if date_to is not None else ...
-        params.update({"eventId": str(event_id)}) if event_id is not None else ...
-        users_stats = await self.get_json("/stats/users", params)
-        if users_stats is not None:
-            return [UserStats(**user_stats) for user_stats in users_stats]
+        params = _USERS_STATS.build(date_from=date_from, date_to=date_to, event_id=event_id)
+        return await self.get_models("/stats/users", UserStats, params)
+
+    async def snapshot_event(
+            self,
+            event_id: int,
+            include: Optional[Sequence["SnapshotPart"]] = None,
+            concurrency: int = 10,
+    ) -> Optional[EventSnapshot]:
+        """
+        Собрать полный снимок серии: вебинары, их участников, файлы и онлайн-записи.
+        Независимые запросы выполняются параллельно, повторяющиеся — один раз.
+        :param event_id: идентификатор мероприятия (eventID)
+        :param include: загружаемые части: sessions, participations, files, records. По умолчанию — все
+        :param concurrency: максимальное количество одновременных запросов
+        :return: снимок серии
+        """
+        from .snapshot import SnapshotBuilder, ALL_PARTS
+
+        builder = SnapshotBuilder(self, include if include is not None else ALL_PARTS, concurrency)
+        return await builder.event(event_id)
+
+    async def iter_event_snapshots(
+            self,
+            date_from: Optional[datetime.datetime] = None,
+            date_to: Optional[datetime.datetime] = None,
+            include: Optional[Sequence["SnapshotPart"]] = None,
+            concurrency: int = 10,
+    ) -> AsyncIterator[EventSnapshot]:
+        """
+        Потоковая выгрузка снимков всех серий организации за период.
+        Снимки отдаются по мере готовности, в памяти держится не больше одной страницы мероприятий.
+        :param date_from: дата начала периода выборки
+        :param date_to: дата окончания периода выборки
+        :param include: загружаемые части: sessions, participations, files, records. По умолчанию — все
+        :param concurrency: максимальное количество одновременных запросов
+        """
+        from .snapshot import SnapshotBuilder, ALL_PARTS
+
+        builder = SnapshotBuilder(self, include if include is not None else ALL_PARTS, concurrency)
+        async with aclosing(builder.organization(date_from, date_to)) as snapshots:
+            async for snapshot in snapshots:
+                yield snapshot
+
+    async def get_users_stats_columns(
+            self,
+            date_from: Optional[datetime.datetime],  # from
+            date_to: Optional[datetime.datetime] = None,  # to
+            event_id: Optional[int] = None,  # eventId
+    ) -> Optional["UserStatsColumns"]:
+        """
+        То же, что get_users_stats, но результат сразу складывается в компактную колоночную коллекцию
+        без создания моделей на каждую строку.
+        :param date_from: Дата начала периода выборки.
+        :param date_to: Дата окончания периода выборки. По умолчанию: from +1 год.
+        :param event_id: EventID вебинара.
+        :return: коллекция UserStatsColumns (вебинары участников — в её поле sessions)
+        """
+        from .columns import UserStatsColumns
+
+        params = _USERS_STATS.build(date_from=date_from, date_to=date_to, event_id=event_id)
+        return await self.get_columns("/stats/users", UserStatsColumns, params)
+
+    async def get_participations_columns(
+            self,
+            event_session_ids: Sequence[int],
+            per_page: Literal[10, 50, 100, 250, 500] = 500,
+            columns: Optional["ParticipantColumns"] = None,
+            concurrency: int = 10,
+    ) -> Optional["ParticipantColumns"]:
+        """
+        Выгрузить всех участников нескольких вебинаров (со всеми страницами) в компактную колоночную коллекцию.
+        Вебинары выгружаются параллельно, страницы одного вебинара — по порядку.
+        :param event_session_ids: идентификаторы вебинаров
+        :param per_page: количество участников на одной странице
+        :param columns: коллекция для дозаписи. По умолчанию создаётся новая
+        :param concurrency: максимальное количество одновременных запросов
+        :return: коллекция ParticipantColumns с колонкой eventSessionId (строки в порядке event_session_ids)
+        """
+        from .columns import ParticipantColumns
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(event_session_id: int) -> Optional[list[ParticipantColumns]]:
+            pages = []
+            page = 1
+            while True:
+                async with semaphore:
+                    participants = await self.get_columns(
+                        f"/eventsessions/{event_session_id}/participations",
+                        ParticipantColumns,
+                        {"perPage": per_page, "page": page},
+                        extra={"eventSessionId": event_session_id},
+                    )
+                if participants is None:
+                    return None
+                pages.append(participants)
+                if len(participants) < per_page:
+                    return pages
+                page += 1
+
+        loaded = await asyncio.gather(*(load(event_session_id) for event_session_id in event_session_ids))
+        if any(pages is None for pages in loaded):
+            return None
+        columns = columns if columns is not None else ParticipantColumns()
+        for pages in loaded:
+            for participants in pages:
+                columns.concat(participants)
+        return columns
 
     @staticmethod
     def _datetime_to_dict(title: Literal['startsAt', 'endsAt'], input_datetime: datetime.datetime) -> dict:
@@ -0,0 +1,135 @@
+"""
+Время импорта WebinarRu по сценариям использования (python -X importtime в отдельном процессе).
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --json current.json --compare baseline.json
+
+Для каждого сценария выводятся: медиана суммарного времени импорта всех модулей (по -X importtime),
+медиана времени выполнения сценария целиком (импорт и первая валидация модели) и то, загружены ли
+aiohttp и pydantic. С --compare сценарий считается регрессией, если время выросло больше порога,
+и процесс завершается с кодом 1.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, asdict
+
+
+_WEBHOOK = {
+    "event": "eventSession.started",
+    "occurredAt": "2024-01-01T10:00:00+03:00",
+    "data": {"eventSessionId": 1, "eventName": "Webinar"},
+}
+
+# Имя сценария -> код, выполняемый в чистом интерпретаторе
+SCENARIOS = {
+    "package": "import WebinarRu",
+    "webhook": "from WebinarRu import WebhookMessage\n"
+               f"WebhookMessage.model_validate({_WEBHOOK!r})",
+    "client": "from WebinarRu import WebinarAPI\n"
+              "WebinarAPI('token')",
+    "star": "from WebinarRu import *",
+}
+
+_PROBE = """
+import sys, time
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+print(elapsed, 'aiohttp' in sys.modules, 'pydantic' in sys.modules)
+"""
+
+
+@dataclass
+class Result:
+    name: str
+    import_ms: float
+    total_ms: float
+    aiohttp: bool
+    pydantic: bool
+
+
+def import_time(stderr: str) -> float:
+    """
+    Суммарное время импорта по выводу -X importtime: сумма cumulative для модулей верхнего уровня
+    """
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total / 1000
+
+
+def run_scenario(name: str, repeat: int) -> Result:
+    imports, totals = [], []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE.format(code=SCENARIOS[name])],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed, aiohttp, pydantic = process.stdout.split()
+        imports.append(import_time(process.stderr))
+        totals.append(float(elapsed) * 1000)
+    return Result(
+        name=name,
+        import_ms=statistics.median(imports),
+        total_ms=statistics.median(totals),
+        aiohttp=aiohttp == "True",
+        pydantic=pydantic == "True",
+    )
+
+
+def compare(results: list[Result], baseline_path: str, threshold: float) -> list[str]:
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {row["name"]: row for row in json.load(file)}
+    regressions = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None or not before["total_ms"]:
+            continue
+        ratio = result.total_ms / before["total_ms"]
+        if ratio > threshold:
+            regressions.append(f"{result.name}: import time x{ratio:.2f}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help=f"subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--json", help="save results to a JSON file")
+    parser.add_argument("--compare", help="baseline JSON produced with --json")
+    parser.add_argument("--threshold", type=float, default=1.2, help="allowed slowdown ratio")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = []
+    print(f"{'scenario':<10} {'import ms':>10} {'total ms':>10} {'aiohttp':>8} {'pydantic':>9}")
+    for name in args.scenarios or SCENARIOS:
+        result = run_scenario(name, args.repeat)
+        results.append(result)
+        print(f"{result.name:<10} {result.import_ms:>10.1f} {result.total_ms:>10.1f} "
+              f"{'yes' if result.aiohttp else 'no':>8} {'yes' if result.pydantic else 'no':>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump([asdict(result) for result in results], file, indent=1)
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
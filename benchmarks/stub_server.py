@@ -0,0 +1,657 @@
+"""
+Локальная заглушка API webinar.ru для бенчмарков и офлайн проверок.
+
+    python -m benchmarks.stub_server --events 100 --sessions 3 --participants 500 --latency 0.02 --rate-429 0.01
+
+Данные синтетические и детерминированные: каждая строка вычисляется из идентификаторов, поэтому
+объём набора не ограничен памятью. Заглушка учитывает пагинацию (page/perPage, offset/limit),
+может добавлять задержку, ответы 429 и 5xx. Ответы можно зафиксировать в JSON (см. RecordingTransport)
+и воспроизводить их вместо синтетических данных.
+"""
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import random
+import ssl
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Mapping
+from urllib.parse import urlencode, urlsplit
+
+from aiohttp import web
+
+from WebinarRu.transport import Transport, TransportResponse
+
+
+BASE_DATE = datetime.datetime(2024, 1, 1, 10, 0)
+SESSION_FACTOR = 1000  # eventSessionId = eventId * SESSION_FACTOR + номер сессии
+PARTICIPANT_FACTOR = 1_000_000  # participationId = eventSessionId * PARTICIPANT_FACTOR + номер участника
+STATS = web.AppKey("stats", dict)  # счётчики запросов заглушки
+
+
+@dataclass
+class StubConfig:
+    events: int = 10  # количество мероприятий
+    sessions: int = 2  # сессий на мероприятие
+    participants: int = 100  # участников на сессию
+    users: int = 1000  # размер пула пользователей
+    members: int = 20  # сотрудников организации
+    files: int = 50  # файлов в каждой папке
+    folders: int = 3  # вложенных папок в каждой папке
+    folder_depth: int = 2  # глубина дерева папок
+    latency: float = 0.0  # задержка ответа в секундах
+    jitter: float = 0.0  # случайная добавка к задержке в секундах
+    rate_429: float = 0.0  # доля ответов 429
+    rate_5xx: float = 0.0  # доля ответов 503
+    seed: int = 0
+    etag: bool = True  # отдавать ETag и отвечать 304 на If-None-Match
+    fixtures: dict = field(default_factory=dict)  # "GET /route?query" -> тело ответа
+
+
+def _iso(value: datetime.datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S+0300")
+
+
+def _paginate(request: web.Request, total: int, default_per_page: int = 250) -> range:
+    query = request.query
+    if "offset" in query or "limit" in query:
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", default_per_page))
+        return range(min(offset, total), min(offset + limit, total))
+    page = max(int(query.get("page", 1)), 1)
+    per_page = int(query.get("perPage", default_per_page))
+    start = (page - 1) * per_page
+    return range(min(start, total), min(start + per_page, total))
+
+
+class StubData:
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self._next_id = config.events + 1
+
+    def new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def event_ids(self) -> range:
+        return range(1, self.config.events + 1)
+
+    def session_ids(self, event_id: int) -> list[int]:
+        return [event_id * SESSION_FACTOR + k for k in range(1, self.config.sessions + 1)]
+
+    def session_starts_at(self, session_id: int) -> datetime.datetime:
+        event_id, number = divmod(session_id, SESSION_FACTOR)
+        return BASE_DATE + datetime.timedelta(days=event_id, hours=number)
+
+    def user(self, user_id: int) -> dict:
+        return {
+            "id": user_id,
+            "name": f"Имя{user_id}",
+            "secondName": f"Фамилия{user_id}",
+            "email": f"user{user_id}@example.com",
+        }
+
+    def member(self, index: int) -> dict:
+        return {
+            **self.user(index + 1),
+            "membershipId": 10_000 + index,
+            "role": "admin" if index == 0 else "lecturer",
+            "phone": f"+7900{index + 1:07d}",
+            "position": "Преподаватель",
+        }
+
+    def contact(self, user_id: int) -> dict:
+        return {
+            **self.user(user_id),
+            "userId": 1,
+            "phoneMain": f"+7900{user_id:07d}",
+            "company": "ООО Пример",
+            "tags": [],
+        }
+
+    def participant_user_id(self, session_id: int, index: int) -> int:
+        return (session_id * 7919 + index * 104729) % self.config.users + 1
+
+    def session_participant(self, session_id: int, index: int) -> dict:
+        user_id = self.participant_user_id(session_id, index)
+        return {
+            **self.user(user_id),
+            "id": session_id * PARTICIPANT_FACTOR + index,
+            "isAccepted": 1,
+            "role": "GUEST",
+            "registerStatus": "REGISTERED",
+            "paymentStatus": "FREE",
+            "registerDate": _iso(self.session_starts_at(session_id) - datetime.timedelta(days=1, minutes=index)),
+            "additionalFieldValues": [],
+            "visited": (index * 7 + session_id) % 3 != 0,
+        }
+
+    def event_participant(self, event_id: int, index: int) -> dict:
+        session_id = self.session_ids(event_id)[0] if self.config.sessions else event_id * SESSION_FACTOR
+        participant = self.session_participant(session_id, index)
+        participant.pop("registerDate")
+        participant.pop("additionalFieldValues")
+        return {
+            **participant,
+            "id": event_id * PARTICIPANT_FACTOR + index,
+            "eventId": event_id,
+            "eventSessionId": None,
+            "userId": self.participant_user_id(session_id, index),
+            "url": f"token{event_id}x{index}",
+        }
+
+    def session(self, session_id: int) -> dict:
+        starts_at = self.session_starts_at(session_id)
+        return {
+            "id": session_id,
+            "name": f"Вебинар {session_id}",
+            "description": "Синтетическое мероприятие",
+            "status": "STOP",
+            "accessSettings": {
+                "isPasswordRequired": False,
+                "isRegistrationRequired": True,
+                "isModerationRequired": False,
+            },
+            "lang": "RU",
+            "startsAt": _iso(starts_at),
+            "endsAt": _iso(starts_at + datetime.timedelta(hours=1)),
+            "timezoneId": 1,
+            "organizationId": 1,
+            "type": "webinar",
+            "createUser": self.user(1),
+            "startType": "manual",
+            "lectors": [self.member(0)],
+            "tags": [],
+            "announceFiles": [],
+            "files": [],
+        }
+
+    def event(self, event_id: int) -> dict:
+        sessions = [self.session(session_id) for session_id in self.session_ids(event_id)]
+        starts_at = BASE_DATE + datetime.timedelta(days=event_id)
+        return {
+            "id": event_id,
+            "name": f"Мероприятие {event_id}",
+            "description": "Синтетическое мероприятие",
+            "status": "STOP",
+            "accessSettings": sessions[0]["accessSettings"] if sessions else None,
+            "rule": "FREQ=DAILY;COUNT=1",
+            "lang": "RU",
+            "startsAt": _iso(starts_at),
+            "endsAt": _iso(starts_at + datetime.timedelta(hours=self.config.sessions + 1)),
+            "createUserId": 1,
+            "timezoneId": 1,
+            "organizationId": 1,
+            "type": "webinar",
+            "createUser": self.user(1),
+            "lectors": [self.member(0)],
+            "tags": [],
+            "announceFiles": [],
+            "files": [],
+            "eventSessions": sessions,
+        }
+
+    def session_stats(self, session_id: int, index: int) -> dict:
+        starts_at = self.session_starts_at(session_id)
+        duration = 600 + (index * 37 + session_id) % 3000
+        return {
+            "id": session_id,
+            "name": f"Вебинар {session_id}",
+            "startsAt": _iso(starts_at),
+            "endsAt": _iso(starts_at + datetime.timedelta(hours=1)),
+            "duration": 3600,
+            "eventId": session_id // SESSION_FACTOR,
+            "questionCount": 5,
+            "userQuestionCount": index % 2,
+            "chatMessageCount": 40,
+            "userChatMessageCount": index % 5,
+            "actualInvolvement": duration // 2,
+            "speechDuration": 0,
+            "usersReactionClicks": index % 4,
+            "actualParticipantActivityPercent": round(duration / 36, 2),
+            "rating": 5,
+            "connections": [{
+                "joined": _iso(starts_at),
+                "leaved": _iso(starts_at + datetime.timedelta(seconds=duration)),
+                "duration": duration,
+                "country": "Россия",
+                "city": "Москва",
+                "platform": "Web",
+            }],
+            "utms": [],
+        }
+
+    def users_stats(self, events: list[int], date_from: Optional[datetime.datetime],
+                    date_to: Optional[datetime.datetime]) -> list[dict]:
+        by_user: dict[int, list[dict]] = {}
+        for event_id in events:
+            for session_id in self.session_ids(event_id):
+                starts_at = self.session_starts_at(session_id)
+                if date_from is not None and starts_at < date_from or date_to is not None and starts_at > date_to:
+                    continue
+                for index in range(self.config.participants):
+                    if (index * 7 + session_id) % 3 == 0:
+                        continue
+                    user_id = self.participant_user_id(session_id, index)
+                    by_user.setdefault(user_id, []).append(self.session_stats(session_id, index))
+        return [
+            {**self.user(user_id), "patrName": None, "sex": "o", "eventSessions": sessions}
+            for user_id, sessions in sorted(by_user.items())
+        ]
+
+    def event_stats(self, event_id: int) -> list[dict]:
+        result = []
+        for session_id in self.session_ids(event_id):
+            starts_at = self.session_starts_at(session_id)
+            visited = sum(1 for index in range(self.config.participants) if (index * 7 + session_id) % 3 != 0)
+            result.append({
+                "id": session_id,
+                "name": f"Вебинар {session_id}",
+                "startsAt": _iso(starts_at),
+                "endsAt": _iso(starts_at + datetime.timedelta(hours=1)),
+                "duration": 3600,
+                "invitedCount": 0,
+                "invitedVisitedCount": 0,
+                "registeredCount": self.config.participants,
+                "registeredVisitedCount": visited,
+                "createUser": self.user(1),
+            })
+        return result
+
+    def folder_children(self, folder_id: Optional[int]) -> list[dict]:
+        depth = 0
+        current = folder_id or 0
+        while current:
+            current //= 100
+            depth += 1
+        result = []
+        if depth < self.config.folder_depth:
+            for number in range(1, self.config.folders + 1):
+                child_id = (folder_id or 0) * 100 + number
+                result.append({
+                    "id": child_id,
+                    "name": f"Папка {child_id}",
+                    "type": "folder",
+                    "parent": {"id": folder_id} if folder_id else None,
+                    "createAt": _iso(BASE_DATE),
+                    "isDeleted": False,
+                })
+        for number in range(1, self.config.files + 1):
+            file_id = 10_000_000 + (folder_id or 0) * 1000 + number
+            result.append(self.file(file_id, folder_id))
+        return result
+
+    def file(self, file_id: int, folder_id: Optional[int] = None) -> dict:
+        return {
+            "id": file_id,
+            "name": f"file{file_id}.pdf",
+            "type": "file",
+            "typeFile": "file",
+            "format": "pdf" if file_id % 2 else "mp4",
+            "size": 1024 * (file_id % 997),
+            "parent": {"id": folder_id} if folder_id else None,
+            "createAt": _iso(BASE_DATE + datetime.timedelta(days=file_id % 365)),
+            "isDeleted": False,
+            "url": f"https://files.example.com/{file_id}",
+        }
+
+    def record(self, index: int) -> dict:
+        event_id = index // max(self.config.sessions, 1) + 1
+        session_id = event_id * SESSION_FACTOR + index % max(self.config.sessions, 1) + 1
+        starts_at = self.session_starts_at(session_id)
+        return {
+            "id": 500_000 + index,
+            "name": f"Запись {session_id}",
+            "createAt": _iso(starts_at + datetime.timedelta(hours=1)),
+            "duration": 3600,
+            "isViewable": True,
+            "link": f"https://events.webinar.ru/record/{500_000 + index}",
+            "eventSession": {"id": session_id, "name": f"Вебинар {session_id}"},
+        }
+
+    def records_count(self) -> int:
+        return self.config.events * self.config.sessions
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    return datetime.datetime.fromisoformat(value.split("+")[0]).replace(tzinfo=None)
+
+
+def _fixture_key(method: str, path: str, query: Mapping[str, str]) -> str:
+    query_string = urlencode(sorted(query.items()))
+    return f"{method} {path}?{query_string}" if query_string else f"{method} {path}"
+
+
+def make_app(config: Optional[StubConfig] = None, prefix: str = "/v3") -> web.Application:
+    """
+    Создаёт приложение заглушки
+    @param config: параметры набора данных и ошибок
+    @param prefix: префикс маршрутов (как в https://userapi.webinar.ru/v3)
+    @return: приложение aiohttp
+    """
+    config = config or StubConfig()
+    data = StubData(config)
+    rnd = random.Random(config.seed)
+    stats = {"requests": 0, "errors": 0, "not_modified": 0}
+
+    @web.middleware
+    async def faults(request: web.Request, handler):
+        stats["requests"] += 1
+        if config.latency or config.jitter:
+            await asyncio.sleep(config.latency + rnd.random() * config.jitter)
+        roll = rnd.random()
+        if roll < config.rate_429:
+            stats["errors"] += 1
+            return web.json_response({"error": "Too many requests"}, status=429, headers={"Retry-After": "1"})
+        if roll < config.rate_429 + config.rate_5xx:
+            stats["errors"] += 1
+            return web.json_response({"error": "Service unavailable"}, status=503)
+        path = request.path[len(prefix):] if request.path.startswith(prefix) else request.path
+        key = _fixture_key(request.method, path, request.query)
+        if key in config.fixtures:
+            response = web.json_response(config.fixtures[key])
+        else:
+            response = await handler(request)
+        if config.etag and request.method == "GET" and response.status == 200 and response.body is not None:
+            etag = f'"{hashlib.sha1(response.body).hexdigest()}"'
+            if request.headers.get("If-None-Match") == etag:
+                stats["not_modified"] += 1
+                return web.Response(status=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+        return response
+
+    def ids(request: web.Request, name: str) -> int:
+        return int(request.match_info[name])
+
+    async def no_content(request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    async def members(request):
+        rows = [data.member(index) for index in range(config.members)]
+        if "email" in request.query:
+            rows = [row for row in rows if row["email"] == request.query["email"]]
+        if "id" in request.query:
+            rows = [row for row in rows if row["id"] == int(request.query["id"])]
+        return web.json_response([rows[index] for index in _paginate(request, len(rows))])
+
+    async def contacts(request):
+        emails = [value for key, value in request.query.items() if key == "contactsData[email]"]
+        user_ids = [int(value) for key, value in request.query.items() if key.startswith("userIds[")]
+        if emails:
+            rows = [
+                data.contact(int(email[4:].split("@")[0]))
+                for email in emails if email.startswith("user") and email[4:].split("@")[0].isdigit()
+            ]
+        elif user_ids:
+            rows = [data.contact(user_id) for user_id in user_ids]
+        else:
+            # Адресная книга — все пользователи пула, постранично (по умолчанию 100 на странице)
+            rows = [data.contact(user_id + 1) for user_id in _paginate(request, config.users, default_per_page=100)]
+        return web.json_response(rows)
+
+    async def register(request):
+        participation_id = data.new_id()
+        return web.json_response({
+            "participationId": participation_id,
+            "link": f"https://events.webinar.ru/{ids(request, 'event_id')}/?t={participation_id}",
+            "contactId": participation_id,
+        }, status=201)
+
+    async def invite(request):
+        form = await request.post()
+        count = len({key.split("]")[0] for key in form if key.startswith("users[")})
+        result = []
+        for _ in range(count):
+            participation_id = data.new_id()
+            result.append({
+                "participationId": participation_id,
+                "link": f"https://events.webinar.ru/{ids(request, 'event_id')}/?t={participation_id}",
+                "contactId": participation_id,
+            })
+        return web.json_response(result, status=201)
+
+    def filtered_events(request) -> list[int]:
+        date_from = _parse_date(request.query.get("from"))
+        date_to = _parse_date(request.query.get("to"))
+        result = []
+        for event_id in data.event_ids():
+            starts_at = BASE_DATE + datetime.timedelta(days=event_id)
+            if date_from is not None and starts_at < date_from or date_to is not None and starts_at > date_to:
+                continue
+            result.append(event_id)
+        return result
+
+    async def schedule(request):
+        events = filtered_events(request)
+        return web.json_response([data.event(events[index]) for index in _paginate(request, len(events))])
+
+    async def event_info(request):
+        event_id = ids(request, "event_id")
+        if event_id not in data.event_ids():
+            return web.json_response({"error": "Not found"}, status=404)
+        return web.json_response(data.event(event_id))
+
+    async def event_participations(request):
+        event_id = ids(request, "event_id")
+        rows = _paginate(request, config.participants)
+        return web.json_response([data.event_participant(event_id, index) for index in rows])
+
+    async def session_participations(request):
+        session_id = ids(request, "session_id")
+        rows = _paginate(request, config.participants)
+        return web.json_response([data.session_participant(session_id, index) for index in rows])
+
+    async def session_info(request):
+        session_id = ids(request, "session_id")
+        if session_id // SESSION_FACTOR not in data.event_ids():
+            return web.json_response({"error": "Not found"}, status=404)
+        return web.json_response(data.session(session_id))
+
+    async def timezones(request):
+        return web.json_response([
+            {"id": 1, "name": "Europe/Moscow", "description": "Москва", "offset": 10800},
+            {"id": 2, "name": "Asia/Yekaterinburg", "description": "Екатеринбург", "offset": 18000},
+        ])
+
+    async def create_event(request):
+        event_id = data.new_id()
+        return web.json_response({"eventId": event_id, "link": f"https://events.webinar.ru/event/{event_id}"}, status=201)
+
+    async def create_session(request):
+        session_id = data.new_id()
+        return web.json_response({"eventSessionId": session_id, "link": f"https://events.webinar.ru/{session_id}"},
+                                 status=201)
+
+    async def chat(request):
+        session_id = ids(request, "session_id")
+        limit = int(request.query.get("limit", 100))
+        starts_at = data.session_starts_at(session_id)
+        return web.json_response([
+            {
+                "id": session_id * 1000 + index,
+                "authorName": f"Имя{index}",
+                "text": f"Сообщение {index}",
+                "isModerated": False,
+                "sentByAdmin": index == 0,
+                "authorId": data.participant_user_id(session_id, index),
+                "createAt": _iso(starts_at + datetime.timedelta(minutes=index)),
+            }
+            for index in range(min(limit, 100))
+        ])
+
+    async def files(request):
+        parent = request.query.get("parent")
+        return web.json_response(data.folder_children(int(parent) if parent else None))
+
+    async def file(request):
+        return web.json_response(data.file(ids(request, "file_id")))
+
+    async def attached_files(request):
+        return web.json_response([{"file": data.file(10_000_000 + number)} for number in range(1, 4)])
+
+    async def records(request):
+        if "id" in request.query:
+            index = int(request.query["id"]) - 500_000
+            if 0 <= index < data.records_count():
+                return web.json_response([data.record(index)])
+            return web.json_response([])
+        rows = _paginate(request, data.records_count(), default_per_page=10)
+        return web.json_response([data.record(index) for index in rows])
+
+    async def events_stats(request):
+        events = filtered_events(request)
+        if "eventId" in request.query:
+            events = [int(request.query["eventId"])]
+        return web.json_response([row for event_id in events for row in data.event_stats(event_id)])
+
+    async def users_stats(request):
+        events = list(data.event_ids())
+        if "eventId" in request.query:
+            events = [int(request.query["eventId"])]
+        return web.json_response(data.users_stats(
+            events,
+            _parse_date(request.query.get("from")),
+            _parse_date(request.query.get("to")),
+        ))
+
+    async def stub_stats(request):
+        return web.json_response(stats)
+
+    app = web.Application(middlewares=[faults])
+    app[STATS] = stats
+    routes = [
+        ("GET", "/organization/members", members),
+        ("GET", "/contacts/search", contacts),
+        ("POST", "/events/{event_id}/register", register),
+        ("POST", "/events/{event_id}/invite", invite),
+        ("GET", "/users/{user_id}/events/schedule", schedule),
+        ("GET", "/organization/events/schedule", schedule),
+        ("GET", "/organization/events/{event_id}", event_info),
+        ("DELETE", "/organization/events/{event_id}", no_content),
+        ("GET", "/events/{event_id}/participations", event_participations),
+        ("GET", "/eventsessions/{session_id}/participations", session_participations),
+        ("GET", "/eventsessions/{session_id}", session_info),
+        ("PUT", "/eventsessions/{session_id}", no_content),
+        ("DELETE", "/eventsessions/{session_id}", no_content),
+        ("PUT", "/eventsessions/{session_id}/stop", no_content),
+        ("GET", "/timezones", timezones),
+        ("POST", "/events", create_event),
+        ("PUT", "/events/{event_id}", no_content),
+        ("POST", "/events/{event_id}/sessions", create_session),
+        ("GET", "/eventsessions/{session_id}/chat", chat),
+        ("GET", "/fileSystem/files", files),
+        ("GET", "/fileSystem/file/{file_id}", file),
+        ("GET", "/events/{event_id}/files", attached_files),
+        ("GET", "/eventsessions/{session_id}/files", attached_files),
+        ("GET", "/records", records),
+        ("PUT", "/records/{record_id}", no_content),
+        ("PUT", "/eventsessions/{session_id}/records", no_content),
+        ("POST", "/records/{record_id}/share", no_content),
+        ("GET", "/stats/events", events_stats),
+        ("GET", "/stats/users", users_stats),
+    ]
+    for method, path, handler in routes:
+        app.router.add_route(method, f"{prefix}{path}", handler)
+    app.router.add_get("/_stub/stats", stub_stats)
+    return app
+
+
+@asynccontextmanager
+async def stub_server(
+        config: Optional[StubConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+):
+    """
+    Запускает заглушку на время блока
+    @param config: параметры набора данных и ошибок
+    @param host: адрес
+    @param port: порт (0 — любой свободный)
+    @param ssl_context: серверный SSL контекст для HTTPS (например, для проверки закрепления сертификата)
+    @return: base_link для WebinarAPI
+    """
+    runner = web.AppRunner(make_app(config), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port, ssl_context=ssl_context).start()
+    actual_port = runner.addresses[0][1]
+    scheme = "https" if ssl_context is not None else "http"
+    try:
+        yield f"{scheme}://{host}:{actual_port}/v3"
+    finally:
+        await runner.cleanup()
+
+
+class RecordingTransport(Transport):
+    """
+    Транспорт-обёртка, сохраняющая успешные GET ответы в словарь фикстур.
+    Файл фикстур затем воспроизводится заглушкой (--fixtures).
+    """
+    def __init__(self, inner: Transport, base_link: str):
+        self.inner = inner
+        self.base_path = urlsplit(base_link).path
+        self.fixtures: dict = {}
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None) -> TransportResponse:
+        resp = await self.inner.request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+        if method == "GET" and resp.ok:
+            path = urlsplit(url).path[len(self.base_path):]
+            query = {key: str(value) for key, value in (params or {}).items()}
+            self.fixtures[_fixture_key(method, path, query)] = resp.json()
+        return resp
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.fixtures, file, ensure_ascii=False, indent=1)
+
+    async def close(self):
+        await self.inner.close()
+
+    def detach(self):
+        self.inner.detach()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--events", type=int, default=StubConfig.events)
+    parser.add_argument("--sessions", type=int, default=StubConfig.sessions)
+    parser.add_argument("--participants", type=int, default=StubConfig.participants)
+    parser.add_argument("--users", type=int, default=StubConfig.users)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixtures", help="JSON file with recorded responses to replay")
+    parser.add_argument("--no-etag", action="store_true", help="do not send ETag / 304 responses")
+    args = parser.parse_args()
+
+    fixtures = {}
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as file:
+            fixtures = json.load(file)
+    config = StubConfig(
+        events=args.events,
+        sessions=args.sessions,
+        participants=args.participants,
+        users=args.users,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        seed=args.seed,
+        fixtures=fixtures,
+        etag=not args.no_etag,
+    )
+    print(f"Stub API on http://{args.host}:{args.port}/v3")
+    web.run_app(make_app(config), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
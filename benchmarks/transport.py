@@ -0,0 +1,80 @@
+"""
+Сравнение транспортов (aiohttp / httpx HTTP/2) на локальной заглушке API.
+
+    python -m benchmarks.transport
+    python -m benchmarks.transport --url https://h2-stub.local/v3 --requests 2000
+
+Для HTTP/2 нужен сервер с поддержкой h2 (TLS + ALPN или h2c). Встроенная заглушка на aiohttp
+работает только по HTTP/1.1, поэтому на ней httpx сравнивается в режиме HTTP/1.1.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from contextlib import nullcontext
+
+from WebinarRu import WebinarAPI
+from WebinarRu.transport import AiohttpTransport, HttpxTransport
+
+from .stub_server import stub_server
+
+
+async def run(api: WebinarAPI, concurrency: int, total: int) -> dict:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await api.get_timezones()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def make_transports(http2: bool) -> dict:
+    transports = {"aiohttp": lambda: AiohttpTransport(connection_limit=500)}
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        print("httpx is not installed, skipping HttpxTransport")
+    else:
+        transports["httpx"] = lambda: HttpxTransport(http2=http2, connection_limit=10)
+    return transports
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base link of an external stub; by default a local one is started")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500])
+    args = parser.parse_args()
+
+    async with stub_server() if args.url is None else nullcontext(args.url) as url:
+        print(f"{'transport':<10} {'concurrency':>11} {'rps':>10} {'p50 ms':>9} {'p99 ms':>9}")
+        for name, factory in make_transports(http2=url.startswith("https")).items():
+            for concurrency in args.concurrency:
+                transport = factory()
+                api = WebinarAPI("benchmark", base_link=url, transport=transport)
+                try:
+                    await run(api, concurrency, min(args.requests, 50))  # прогрев
+                    result = await run(api, concurrency, args.requests)
+                finally:
+                    await transport.close()
+                print(
+                    f"{name:<10} {concurrency:>11} {result['rps']:>10.0f} "
+                    f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
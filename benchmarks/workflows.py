@@ -0,0 +1,246 @@
+"""
+Сквозные бенчмарки сценариев WebinarAPI на локальной заглушке.
+
+    python -m benchmarks.workflows
+    python -m benchmarks.workflows --json current.json --compare baseline.json
+
+Для каждого сценария выводятся: запросов в секунду, p50/p99 задержки запросов, пиковый RSS процесса
+и пик выделенной памяти (tracemalloc) в пересчёте на строку результата.
+С --compare сценарий считается регрессией, если время или память на строку выросли больше порога,
+и процесс завершается с кодом 1.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable
+
+from WebinarRu import WebinarAPI, EventParticipantInvite, WebhookMessage
+from WebinarRu.transport import Transport, TransportResponse, AiohttpTransport
+
+from .stub_server import stub_server, StubConfig
+
+
+class TimingTransport(Transport):
+    """
+    Обёртка над транспортом, измеряющая задержку каждого запроса
+    """
+    def __init__(self, inner: Transport):
+        self.inner = inner
+        self.latencies: list[float] = []
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None) -> TransportResponse:
+        started = time.perf_counter()
+        try:
+            return await self.inner.request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+    async def close(self):
+        await self.inner.close()
+
+    def detach(self):
+        self.inner.detach()
+
+
+@dataclass
+class Result:
+    name: str
+    rows: int
+    requests: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    peak_rss_mb: float
+    peak_bytes_per_row: float
+
+
+async def org_export(api: WebinarAPI, concurrency: int) -> int:
+    """Все мероприятия → сессии → участники"""
+    rows = 0
+    page = 1
+    sessions = []
+    while True:
+        events = await api.get_events(page=page, per_page=50)
+        if not events:
+            break
+        sessions.extend(session.id for event in events for session in event.eventSessions or [])
+        rows += len(events)
+        if len(events) < 50:
+            break
+        page += 1
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def participations(session_id: int) -> int:
+        count = 0
+        session_page = 1
+        while True:
+            async with semaphore:
+                chunk = await api.get_event_session_participations(session_id, per_page=500, page=session_page)
+            if not chunk:
+                return count
+            count += len(chunk)
+            if len(chunk) < 500:
+                return count
+            session_page += 1
+
+    return rows + sum(await asyncio.gather(*(participations(session_id) for session_id in sessions)))
+
+
+async def users_stats_year(api: WebinarAPI, concurrency: int) -> int:
+    """Статистика посещений за год"""
+    stats = await api.get_users_stats(
+        date_from=datetime.datetime(2024, 1, 1),
+        date_to=datetime.datetime(2024, 12, 31, 23, 59),
+    )
+    return sum(len(user.eventSessions or []) for user in stats or [])
+
+
+async def invite_10k(api: WebinarAPI, concurrency: int) -> int:
+    """Приглашение 10 000 участников пачками"""
+    users = [
+        EventParticipantInvite(email=f"guest{index}@example.com", name=f"Имя{index}", second_name=f"Фамилия{index}")
+        for index in range(10_000)
+    ]
+    batch = 100
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def invite(chunk) -> int:
+        async with semaphore:
+            return len(await api.invite_to_event(1, chunk) or [])
+
+    return sum(await asyncio.gather(*(invite(users[index:index + batch]) for index in range(0, len(users), batch))))
+
+
+async def webhook_burst(api: WebinarAPI, concurrency: int) -> int:
+    """Разбор 20 000 входящих уведомлений"""
+    payload = json.dumps({
+        "event": "eventSession.started",
+        "occurredAt": "2024-08-10T10:00:00+03:00",
+        "data": {
+            "eventSessionId": 1001,
+            "eventName": "Вебинар",
+            "eventUrl": "https://events.webinar.ru/1/1001",
+            "eventStartsAt": "2024-08-10T10:00:00+03:00",
+        },
+    })
+    messages = [WebhookMessage.model_validate_json(payload) for _ in range(20_000)]
+    return len(messages)
+
+
+WORKFLOWS: dict[str, Callable[[WebinarAPI, int], Awaitable[int]]] = {
+    "org_export": org_export,
+    "users_stats_year": users_stats_year,
+    "invite_10k": invite_10k,
+    "webhook_burst": webhook_burst,
+}
+
+
+async def measure(name: str, base_link: str, concurrency: int, trace_memory: bool) -> tuple[int, list, float, int]:
+    transport = TimingTransport(AiohttpTransport(connection_limit=concurrency))
+    api = WebinarAPI("benchmark", base_link=base_link, transport=transport, strict=True)
+    peak = 0
+    try:
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        rows = await WORKFLOWS[name](api, concurrency)
+        seconds = time.perf_counter() - started
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        await transport.close()
+    return rows, sorted(transport.latencies), seconds, peak
+
+
+async def run_workflow(name: str, base_link: str, concurrency: int) -> Result:
+    rows, latencies, seconds, _ = await measure(name, base_link, concurrency, trace_memory=False)
+    # Отдельный прогон под tracemalloc: он замедляет выполнение и не должен влиять на время
+    _, _, _, peak = await measure(name, base_link, concurrency, trace_memory=True)
+    return Result(
+        name=name,
+        rows=rows,
+        requests=len(latencies),
+        seconds=seconds,
+        rps=len(latencies) / seconds if seconds else 0.0,
+        p50_ms=statistics.median(latencies) * 1000 if latencies else 0.0,
+        p99_ms=latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else 0.0,
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        peak_bytes_per_row=peak / rows if rows else 0.0,
+    )
+
+
+def compare(results: list[Result], baseline_path: str, threshold: float) -> list[str]:
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {row["name"]: row for row in json.load(file)}
+    regressions = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None or not before["rows"] or not result.rows:
+            continue
+        time_ratio = (result.seconds / result.rows) / (before["seconds"] / before["rows"])
+        memory_ratio = result.peak_bytes_per_row / before["peak_bytes_per_row"] if before["peak_bytes_per_row"] else 1
+        if time_ratio > threshold:
+            regressions.append(f"{result.name}: time per row x{time_ratio:.2f}")
+        if memory_ratio > threshold:
+            regressions.append(f"{result.name}: memory per row x{memory_ratio:.2f}")
+    return regressions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("workflows", nargs="*", help=f"subset of: {', '.join(WORKFLOWS)}")
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=2)
+    parser.add_argument("--participants", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--json", help="save results to a JSON file")
+    parser.add_argument("--compare", help="baseline JSON produced with --json")
+    parser.add_argument("--threshold", type=float, default=1.2, help="allowed slowdown ratio")
+    args = parser.parse_args()
+    unknown = set(args.workflows) - set(WORKFLOWS)
+    if unknown:
+        parser.error(f"unknown workflows: {', '.join(sorted(unknown))}")
+
+    config = StubConfig(
+        events=args.events,
+        sessions=args.sessions,
+        participants=args.participants,
+        users=args.participants * 10,
+        latency=args.latency,
+    )
+    results = []
+    async with stub_server(config) as base_link:
+        print(f"{'workflow':<18} {'rows':>8} {'reqs':>6} {'sec':>7} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'rss MB':>8} {'B/row':>8}")
+        for name in args.workflows or WORKFLOWS:
+            result = await run_workflow(name, base_link, args.concurrency)
+            results.append(result)
+            print(f"{result.name:<18} {result.rows:>8} {result.requests:>6} {result.seconds:>7.2f} {result.rps:>8.0f} "
+                  f"{result.p50_ms:>8.2f} {result.p99_ms:>8.2f} {result.peak_rss_mb:>8.1f} "
+                  f"{result.peak_bytes_per_row:>8.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump([asdict(result) for result in results], file, indent=1)
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,121 @@
+import asyncio
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI
+from WebinarRu.adaptive import AdaptiveLimiter, AdaptiveTransport
+from WebinarRu.transport import Transport, TransportResponse, AiohttpTransport
+
+
+class SleepTransport(Transport):
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        await asyncio.sleep(self.delays[url])
+        return TransportResponse(200, {}, b"[]")
+
+
+class CountingTransport(Transport):
+    def __init__(self, inner: Transport):
+        self.inner = inner
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await self.inner.request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+        finally:
+            self.in_flight -= 1
+
+    async def close(self):
+        await self.inner.close()
+
+
+def test_limit_is_cut_on_429():
+    async def main():
+        limiter = AdaptiveLimiter(initial=8, max_limit=8)
+        async with stub_server(StubConfig(rate_429=1.0)) as base_link:
+            async with WebinarAPI("token", base_link=base_link) as webinar:
+                webinar.transport = AdaptiveTransport(webinar.transport, limiter)
+                for _ in range(4):
+                    await asyncio.gather(*(webinar.get_timezones() for _ in range(limiter.limit)))
+        stats = limiter.stats()
+        assert limiter.limit == 1
+        assert stats.decreases >= 3 and stats.throttled > 0 and stats.increases == 0
+
+    asyncio.run(main())
+
+
+def test_limit_grows_while_healthy():
+    async def main():
+        limiter = AdaptiveLimiter(initial=2, max_limit=10)
+        transport = AdaptiveTransport(SleepTransport({"/a": 0.01}), limiter)
+        await asyncio.gather(*(transport.request("GET", "/a") for _ in range(100)))
+        return limiter
+
+    limiter = asyncio.run(main())
+    assert limiter.limit > 2 and limiter.stats().decreases == 0
+
+
+def test_cancelled_request_keeps_limit():
+    async def main():
+        limiter = AdaptiveLimiter(initial=4)
+        transport = AdaptiveTransport(SleepTransport({"/slow": 10}), limiter)
+        tasks = [asyncio.ensure_future(transport.request("GET", "/slow")) for _ in range(6)]
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return limiter
+
+    limiter = asyncio.run(main())
+    stats = limiter.stats()
+    assert limiter.limit == 4
+    assert stats.decreases == 0 and stats.errors == 0
+    assert stats.in_flight == 0 and stats.waiting == 0
+
+
+def test_zero_latency_baseline():
+    async def main():
+        limiter = AdaptiveLimiter(initial=2, max_limit=2)
+        for latency in (0.0, 0.0, 0.0005):
+            ticket = await limiter.acquire()
+            limiter.release(ticket, "ok", latency=latency, route="/timezones")
+        return limiter
+
+    stats = asyncio.run(main()).stats()
+    assert stats.decreases == 0
+    assert stats.baseline_ms == 1.0
+
+
+def test_slow_route_is_not_overload():
+    async def main():
+        limiter = AdaptiveLimiter(initial=4, max_limit=4)
+        inner = SleepTransport({"/timezones": 0.001, "/stats/users": 0.03})
+        transport = AdaptiveTransport(inner, limiter)
+        for _ in range(10):
+            await asyncio.gather(*(transport.request("GET", "/timezones") for _ in range(4)))
+        for _ in range(5):
+            await asyncio.gather(*(transport.request("GET", "/stats/users") for _ in range(4)))
+        return limiter
+
+    limiter = asyncio.run(main())
+    assert limiter.stats().decreases == 0
+    assert limiter.limit == 4
+
+
+def test_participations_columns_run_in_parallel():
+    async def main():
+        async with stub_server(StubConfig(events=3, sessions=3, participants=30, latency=0.02)) as base_link:
+            transport = CountingTransport(AiohttpTransport())
+            webinar = WebinarAPI("token", base_link=base_link, transport=transport)
+            session_ids = [event * 1000 + number for event in (1, 2, 3) for number in (1, 2, 3)]
+            columns = await webinar.get_participations_columns(session_ids, per_page=10, concurrency=4)
+            await transport.close()
+        assert transport.max_in_flight == 4
+        assert len(columns) == 9 * 30
+        assert columns.values("eventSessionId")[::30] == session_ids
+
+    asyncio.run(main())
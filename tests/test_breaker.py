@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI, CircuitOpenError, ServerError
+from WebinarRu.breaker import CircuitBreakers, BreakerSettings, route_template
+from WebinarRu.cache import DiskCache
+
+
+def test_route_template():
+    assert route_template("/eventsessions/1001/participations") == "/eventsessions/*/participations"
+    assert route_template("/stats/users") == "/stats/users"
+
+
+def test_breaker_opens_and_closes():
+    async def main():
+        config = StubConfig()
+        breakers = CircuitBreakers(
+            BreakerSettings(failure_threshold=3, open_duration=0.2),
+            routes={"/timezones": BreakerSettings(failure_threshold=2, open_duration=0.2)},
+        )
+        async with stub_server(config) as base_link:
+            async with WebinarAPI("token", base_link=base_link, strict=True, breakers=breakers) as webinar:
+                config.rate_5xx = 1.0
+                for _ in range(2):
+                    with pytest.raises(ServerError):
+                        await webinar.get_timezones()
+                assert breakers.states() == {"/timezones": "open"}
+
+                # Платформа восстановилась, но до пробных запросов цепь отклоняет запросы маршрута;
+                # другие маршруты не затронуты
+                config.rate_5xx = 0.0
+                with pytest.raises(CircuitOpenError) as info:
+                    await webinar.get_timezones()
+                assert 0 < info.value.retry_after <= 0.2
+                assert await webinar.get_event_info(1)
+                assert breakers.states()["/organization/events/*"] == "closed"
+
+                await asyncio.sleep(0.25)
+                assert breakers.states()["/timezones"] == "half_open"
+                assert await webinar.get_timezones()
+                assert breakers.states()["/timezones"] == "closed"
+        stats = breakers.stats()["/timezones"]
+        assert (stats.opened, stats.rejected, stats.failures) == (1, 1, 0)
+
+    asyncio.run(main())
+
+
+def test_failed_probe_reopens():
+    async def main():
+        config = StubConfig(rate_5xx=1.0)
+        breakers = CircuitBreakers(BreakerSettings(failure_threshold=1, open_duration=0.1))
+        async with stub_server(config) as base_link:
+            async with WebinarAPI("token", base_link=base_link, breakers=breakers) as webinar:
+                assert await webinar.get_timezones() is None
+                await asyncio.sleep(0.15)
+                assert await webinar.get_timezones() is None
+                assert breakers.states()["/timezones"] == "open"
+        assert breakers.stats()["/timezones"].opened == 2
+
+    asyncio.run(main())
+
+
+def test_open_circuit_serves_cached_response(tmp_path):
+    async def main():
+        config = StubConfig()
+        breakers = CircuitBreakers(BreakerSettings(failure_threshold=1, open_duration=60))
+        cache = DiskCache(tmp_path / "cache.sqlite")
+        async with stub_server(config) as base_link:
+            async with WebinarAPI("token", base_link=base_link, breakers=breakers, cache=cache) as webinar:
+                fresh = await webinar.get_timezones()
+                config.rate_5xx = 1.0
+                assert await webinar.get_timezones() is None
+                assert breakers.states()["/timezones"] == "open"
+                assert await webinar.get_timezones() == fresh
+        cache.close()
+
+    asyncio.run(main())
+
+
+def test_rate_limit_does_not_open_circuit():
+    async def main():
+        breakers = CircuitBreakers(BreakerSettings(failure_threshold=1))
+        async with stub_server(StubConfig(rate_429=1.0)) as base_link:
+            async with WebinarAPI("token", base_link=base_link, breakers=breakers) as webinar:
+                for _ in range(3):
+                    await webinar.get_timezones()
+        assert breakers.states() == {"/timezones": "closed"}
+
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI, deadline
+from WebinarRu.budget import remaining_time
+from WebinarRu.exceptions import RequestTimeoutError
+from WebinarRu.transport import Transport, TransportResponse
+
+
+class TimeoutTransport(Transport):
+    """
+    Запоминает общий таймаут каждого запроса
+    """
+    def __init__(self):
+        self.totals: dict[str, float] = {}
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        self.totals[url.split("/v3", 1)[1]] = timeout.total
+        return TransportResponse(200, {}, b"[]")
+
+
+def test_nested_calls_inherit_remaining_budget():
+    async def main():
+        transport = TimeoutTransport()
+        webinar = WebinarAPI("token", transport=transport)
+        assert remaining_time() is None
+        async with deadline(0.5):
+            # Вложенный deadline не продлевает внешний, бюджет доходит и до задач из gather
+            async with deadline(10):
+                assert remaining_time() <= 0.5
+                await asyncio.gather(webinar.get_json("/a"), asyncio.ensure_future(webinar.get_json("/b")))
+            async with deadline(0.1):
+                await webinar.get_json("/c")
+        await webinar.get_json("/d")
+        return transport.totals
+
+    totals = asyncio.run(main())
+    assert 0.3 < totals["/a"] <= 0.5 and 0.3 < totals["/b"] <= 0.5
+    assert totals["/c"] <= 0.1
+    assert totals["/d"] == 120
+
+
+def test_exhausted_budget_stops_request():
+    async def main():
+        async with stub_server(StubConfig(latency=0.5)) as base_link:
+            async with WebinarAPI("token", base_link=base_link, strict=True) as strict:
+                started = time.perf_counter()
+                with pytest.raises(RequestTimeoutError):
+                    async with deadline(0.05):
+                        await strict.get_event_info(1)
+                strict_elapsed = time.perf_counter() - started
+            async with WebinarAPI("token", base_link=base_link) as lenient:
+                started = time.perf_counter()
+                async with deadline(0.05):
+                    result = await lenient.get_event_info(1)
+                lenient_elapsed = time.perf_counter() - started
+        return strict_elapsed, result, lenient_elapsed
+
+    strict_elapsed, result, lenient_elapsed = asyncio.run(main())
+    # Таймаут запроса урезан до бюджета: ответа в 0.5 с никто не ждёт
+    assert strict_elapsed < 0.4 and lenient_elapsed < 0.4
+    assert result is None
+
+
+def test_spent_budget_skips_request():
+    async def main():
+        transport = TimeoutTransport()
+        webinar = WebinarAPI("token", transport=transport, strict=True)
+        with pytest.raises(RequestTimeoutError):
+            async with deadline(0.05):
+                await asyncio.shield(asyncio.sleep(0.1))
+                await webinar.get_json("/late")
+        return transport.totals
+
+    assert asyncio.run(main()) == {}
+
+
+def test_route_timeouts_apply_by_pattern():
+    async def main():
+        async with stub_server(StubConfig(latency=0.2, events=1)) as base_link:
+            async with WebinarAPI(
+                    "token",
+                    base_link=base_link,
+                    strict=True,
+                    route_timeouts={"/stats/*": aiohttp.ClientTimeout(total=0.05)},
+            ) as webinar:
+                with pytest.raises(RequestTimeoutError) as info:
+                    await webinar.get_users_stats(None)
+                assert info.value.route == "/stats/users"
+                assert (await webinar.get_event_info(1)).id == 1
+
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+import asyncio
+import itertools
+import json
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI
+from WebinarRu.bulk import BulkWebinarCreator, BulkJournal
+from WebinarRu.models import AccessSettings, WebinarSpec, CreatedEvent, CreatedEventSession
+
+
+class FakeAPI:
+    def __init__(self, failing: set[str] = frozenset()):
+        self.failing = failing
+        self.deleted: list[int] = []
+        self._ids = itertools.count(100)
+
+    async def create_event(self, name, **kwargs):
+        event_id = next(self._ids)
+        return CreatedEvent(eventId=event_id, link=f"https://events.webinar.ru/event/{event_id}")
+
+    async def create_event_session(self, event_id, name=None, **kwargs):
+        if name in self.failing:
+            return None
+        session_id = next(self._ids)
+        return CreatedEventSession(eventSessionId=session_id, link=f"https://events.webinar.ru/{session_id}")
+
+    async def delete_event(self, event_id):
+        self.deleted.append(event_id)
+        return True
+
+
+def spec(key: str) -> WebinarSpec:
+    return WebinarSpec(key=key, event={"name": key}, sessions=[{"name": key}])
+
+
+def test_item_rollback():
+    api = FakeAPI(failing={"b"})
+    results = asyncio.run(BulkWebinarCreator(api).run([spec("a"), spec("b")]))
+    assert [result.status for result in results] == ["created", "rolled_back"]
+    assert api.deleted == [results[1].event.eventId]
+
+
+def test_resume_skips_complete_items():
+    journal = BulkJournal()
+    first = FakeAPI(failing={"b"})
+    asyncio.run(BulkWebinarCreator(first, journal=journal, rollback="none").run([spec("a"), spec("b")]))
+    second = FakeAPI()
+    results = asyncio.run(BulkWebinarCreator(second, journal=journal).run([spec("a"), spec("b")]))
+    assert [result.status for result in results] == ["existing", "created"]
+    assert len(results[1].sessions) == 1
+
+
+def test_all_rollback_keeps_events_of_earlier_runs(tmp_path):
+    path = tmp_path / "journal.json"
+    earlier = FakeAPI(failing={"b"})
+    first = asyncio.run(
+        BulkWebinarCreator(earlier, journal=BulkJournal(path), rollback="none").run([spec("a"), spec("b")])
+    )
+    assert [result.status for result in first] == ["created", "failed"]
+
+    # Серия b создана в прошлом запуске и досоздаётся из журнала, серии c и d — новые
+    api = FakeAPI(failing={"d"})
+    results = asyncio.run(
+        BulkWebinarCreator(api, journal=BulkJournal(path), rollback="all").run(
+            [spec("a"), spec("b"), spec("c"), spec("d")]
+        )
+    )
+    assert [result.status for result in results] == ["existing", "created", "rolled_back", "rolled_back"]
+    assert results[1].event == first[1].event
+    assert sorted(api.deleted) == sorted(result.event.eventId for result in results[2:])
+
+
+def test_journal_path_may_be_pathlike(tmp_path):
+    path = tmp_path / "journal.json"
+    access = AccessSettings(isPasswordRequired=False, isRegistrationRequired=True, isModerationRequired=False)
+    specs = [WebinarSpec(key="a", event={"name": "a", "access_settings": access, "access": 1})]
+
+    async def main():
+        async with stub_server(StubConfig(events=1)) as base_link:
+            async with WebinarAPI("token", base_link=base_link) as webinar:
+                first = await webinar.create_webinars(specs, journal=path)
+                again = await webinar.create_webinars(specs, journal=path)
+        return first, again
+
+    first, again = asyncio.run(main())
+    assert [result.status for result in first] == ["created"]
+    assert [result.status for result in again] == ["existing"]
+    assert "a" in json.loads(path.read_text(encoding="utf-8"))
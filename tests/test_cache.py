@@ -0,0 +1,61 @@
+import asyncio
+
+import aiohttp
+
+from benchmarks.stub_server import stub_server
+from WebinarRu import WebinarAPI
+from WebinarRu.cache import DiskCache, cache_key
+from WebinarRu.transport import TransportResponse
+
+
+async def stub_stats(base_link: str) -> dict:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(base_link.replace("/v3", "/_stub/stats")) as resp:
+            return await resp.json()
+
+
+def test_not_modified_is_served_from_cache(tmp_path):
+    async def main():
+        cache = DiskCache(tmp_path / "cache.sqlite")
+        async with stub_server() as base_link:
+            async with WebinarAPI("token", base_link=base_link, cache=cache) as webinar:
+                first = await webinar.get_timezones()
+                second = await webinar.get_timezones()
+            stats = await stub_stats(base_link)
+        assert first == second and len(first) == 2
+        assert stats["requests"] == 3  # два запроса клиента и запрос статистики
+        assert stats["not_modified"] == 1
+        assert len(cache) == 1
+        cache.close()
+
+    asyncio.run(main())
+
+
+def test_tokens_do_not_share_entries(tmp_path):
+    async def main():
+        cache = DiskCache(tmp_path / "cache.sqlite")
+        async with stub_server() as base_link:
+            for token in ("school", "college"):
+                async with WebinarAPI(token, base_link=base_link, cache=cache) as webinar:
+                    await webinar.get_timezones()
+            stats = await stub_stats(base_link)
+        assert stats["not_modified"] == 0
+        assert len(cache) == 2
+        cache.close()
+
+    asyncio.run(main())
+
+
+def test_store_rules_and_eviction(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=250)
+    assert not cache.put("plain", TransportResponse(200, {}, b"x"))
+    assert not cache.put("no-store", TransportResponse(200, {"ETag": '"1"', "Cache-Control": "no-store"}, b"x"))
+    for name in ("a", "b", "c"):
+        assert cache.put(name, TransportResponse(200, {"ETag": f'"{name}"'}, b"x" * 100))
+    assert cache.get("a") is None
+    assert cache.get("c").validators == {"If-None-Match": '"c"'}
+    # Заголовки ответа из кэша ищутся без учёта регистра, как у ответа aiohttp
+    assert cache.get("c").to_response().headers["etag"] == '"c"'
+    assert cache.size == 200
+    assert cache_key("GET", "/a", {"page": 1}) == cache_key("GET", "/a", {"page": "1"})
+    cache.close()
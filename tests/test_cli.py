@@ -0,0 +1,96 @@
+import asyncio
+import csv
+import datetime
+import json
+
+import pytest
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import cli
+
+
+def parse(*argv: str):
+    return cli._parser().parse_args(["events", "--token", "token", *argv])
+
+
+def run_export(config: StubConfig, *argv: str) -> int:
+    async def main():
+        async with stub_server(config) as base_link:
+            args = cli._parser().parse_args([*argv, "--token", "token", "--base-link", base_link, "--quiet"])
+            return await cli.export(args)
+
+    return asyncio.run(main())
+
+
+def test_period_parsing():
+    args = parse("--from", "2024-01-03", "--to", "2024-01-05T12:30")
+    assert args.date_from == datetime.datetime(2024, 1, 3)
+    assert args.date_to == datetime.datetime(2024, 1, 5, 12, 30)
+    assert parse().date_from is None and parse().date_to is None
+
+
+@pytest.mark.parametrize("argv", [
+    ["--from", "03.01.2024"],
+    ["--concurrency", "0"],
+    ["--concurrency", "-5"],
+    ["--concurrency", "many"],
+])
+def test_invalid_arguments_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as info:
+        parse(*argv)
+    assert info.value.code == 2
+    assert "invalid" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("output, explicit, expected", [
+    ("events.csv", None, "csv"),
+    ("events.CSV", None, "csv"),
+    ("events.jsonl", None, "ndjson"),
+    ("events.json", None, "ndjson"),
+    ("events.parquet", None, "parquet"),
+    ("events.txt", None, "ndjson"),
+    ("-", None, "ndjson"),
+    ("events.csv", "ndjson", "ndjson"),
+])
+def test_format_follows_extension(output, explicit, expected):
+    argv = ["-o", output] + (["-f", explicit] if explicit else [])
+    assert cli._format(parse(*argv)) == expected
+
+
+def test_ndjson_export_filters_period(tmp_path):
+    output = tmp_path / "events.ndjson"
+    code = run_export(
+        StubConfig(events=10), "events", "--from", "2024-01-03", "--to", "2024-01-05T23:00", "-o", str(output)
+    )
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert code == 0
+    assert [row["id"] for row in rows] == [2, 3, 4]
+    assert all("eventSessions" not in row for row in rows)
+
+
+def test_csv_export(tmp_path):
+    output = tmp_path / "participations.csv"
+    code = run_export(
+        StubConfig(events=2, sessions=2, participants=3), "participations", "--concurrency", "2", "-o", str(output)
+    )
+    with open(output, encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert code == 0
+    assert len(rows) == 2 * 2 * 3
+    assert list(rows[0])[:3] == ["eventId", "eventSessionId", "id"]
+    assert {row["eventSessionId"] for row in rows} == {"1001", "1002", "2001", "2002"}
+    # Вложенные значения записываются как JSON
+    assert rows[0]["additionalFieldValues"] == "[]"
+
+
+def test_partial_failure_exits_with_one(tmp_path, capsys):
+    output = tmp_path / "chat.ndjson"
+    # Часть запросов чата получает 503; первый запрос (список мероприятий) проходит при seed=0
+    code = run_export(
+        StubConfig(events=10, sessions=2, rate_5xx=0.3, seed=0), "chat", "--concurrency", "1", "-o", str(output)
+    )
+    rows = output.read_text(encoding="utf-8").splitlines()
+    errors = [line for line in capsys.readouterr().err.splitlines() if line.startswith("error: chat of session")]
+    assert code == 1
+    assert errors
+    assert len(rows) == (20 - len(errors)) * 100
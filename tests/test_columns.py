@@ -0,0 +1,174 @@
+import datetime
+import pickle
+
+import pytest
+
+from WebinarRu.columns import (
+    ParticipantColumns,
+    SessionStatsColumns,
+    StringPool,
+    UserStatsColumns,
+    total_nbytes,
+)
+from WebinarRu.models import EventSessionParticipant, UserStats
+
+
+UTC = datetime.timezone.utc
+
+PARTICIPANTS = [
+    {
+        "id": 1,
+        "name": "Анна",
+        "secondName": "Иванова",
+        "email": "anna@example.com",
+        "isAccepted": 1,
+        "role": "GUEST",
+        "registerStatus": "registered",
+        "paymentStatus": None,
+        "registerDate": "2024-03-01T10:00:00+00:00",
+        "additionalFieldValues": [{"label": "Город", "value": "Москва"}],
+        "visited": True,
+    },
+    {
+        "id": 2,
+        "name": None,
+        "email": None,
+        "role": "GUEST",
+        "registerDate": None,
+        "additionalFieldValues": [],
+        "visited": None,
+    },
+    {
+        "id": 3,
+        "name": "Борис",
+        "email": "boris@example.com",
+        "role": "LECTURER",
+        "registerDate": "2024-03-02T12:30:00",
+        "visited": False,
+    },
+]
+
+
+def test_participant_values_round_trip():
+    columns = ParticipantColumns.from_rows(PARTICIPANTS, eventSessionId=1001)
+    assert len(columns) == 3
+    assert columns.values("id") == [1, 2, 3]
+    assert columns.values("role") == ["GUEST", "GUEST", "LECTURER"]
+    assert columns.values("eventSessionId") == [1001] * 3
+    assert columns.values("registerDate") == [
+        datetime.datetime(2024, 3, 1, 10, tzinfo=UTC),
+        None,
+        # Даты без часового пояса считаются UTC
+        datetime.datetime(2024, 3, 2, 12, 30, tzinfo=UTC),
+    ]
+    assert columns.values("additionalFieldValues") == [[{"label": "Город", "value": "Москва"}], None, None]
+    assert columns.row(0)["email"] == "anna@example.com"
+
+    participant = columns[-1]
+    assert isinstance(participant, EventSessionParticipant)
+    assert (participant.id, participant.name, participant.visited) == (3, "Борис", False)
+    assert [row.id for row in columns] == [1, 2, 3]
+    with pytest.raises(IndexError):
+        columns[3]
+
+
+def test_missing_values_stay_none():
+    columns = ParticipantColumns.from_rows(PARTICIPANTS)
+    row = columns.row(1)
+    assert row["name"] is None and row["secondName"] is None and row["email"] is None
+    assert row["isAccepted"] is None and row["visited"] is None and row["registerDate"] is None
+    assert row["eventSessionId"] is None
+    assert columns.values("visited") == [True, None, False]
+    assert columns.values("isAccepted") == [1, None, None]
+    assert columns.count_by("visited") == {True: 1, None: 1, False: 1}
+    assert list(columns.where(visited=None)) == [1]
+    assert list(columns.where(email=None)) == [1]
+
+
+def test_models_are_accepted_as_rows():
+    models = [EventSessionParticipant.model_validate(row) for row in PARTICIPANTS]
+    from_models = ParticipantColumns.from_rows(models, eventSessionId=1001)
+    from_dicts = ParticipantColumns.from_rows(PARTICIPANTS, eventSessionId=1001)
+    for name in from_dicts.kinds:
+        assert from_models.values(name) == from_dicts.values(name)
+
+
+def test_empty_collections():
+    columns = ParticipantColumns.from_rows([])
+    assert len(columns) == 0
+    assert list(columns) == []
+    assert columns.values("id") == []
+    assert len(columns.where(role="GUEST")) == 0
+    assert columns.count_by("role") == {}
+    assert len(columns.filter(visited=True)) == 0
+
+    users = UserStatsColumns.from_rows([{"id": 7, "eventSessions": []}, {"id": 8}])
+    assert [user.eventSessions for user in users] == [[], []]
+    assert len(users.sessions) == 0
+
+
+def test_where_filter_and_aggregates():
+    columns = ParticipantColumns.from_rows(PARTICIPANTS, eventSessionId=1001)
+    assert list(columns.where(role="GUEST")) == [0, 1]
+    # Строки, которой нет в таблице, нет ни в одной строке
+    assert len(columns.where(role="MODERATOR")) == 0
+    assert list(columns.where({"registerDate": lambda date: date is not None and date.day == 2})) == [2]
+    guests = columns.filter(role="GUEST", visited=True)
+    assert guests.values("id") == [1]
+    assert guests.pool is columns.pool
+    assert columns.take([2, 0]).values("name") == ["Борис", "Анна"]
+    assert columns.sum_by("role", "isAccepted") == {"GUEST": 1, "LECTURER": 0}
+
+
+def test_concat_remaps_strings_between_pools():
+    first = ParticipantColumns.from_rows(PARTICIPANTS[:2], eventSessionId=1)
+    # Коллекция из другого процесса приходит со своей таблицей строк
+    second = pickle.loads(pickle.dumps(ParticipantColumns.from_rows(PARTICIPANTS[::-1], eventSessionId=2)))
+    first.concat(second)
+    assert len(first) == 5
+    assert first.values("email") == [
+        "anna@example.com", None, "boris@example.com", None, "anna@example.com",
+    ]
+    assert first.count_by("eventSessionId") == {1: 2, 2: 3}
+    with pytest.raises(TypeError):
+        first.concat(SessionStatsColumns())
+
+
+def test_user_stats_keep_sessions():
+    rows = [
+        {
+            "id": 10,
+            "email": "anna@example.com",
+            "eventSessions": [
+                {"id": 1001, "name": "Урок 1", "connections": [{"duration": 60}, {"duration": None}, None]},
+                {"id": 1002, "name": "Урок 2", "connections": None},
+            ],
+        },
+        {"id": 11, "email": None, "eventSessions": [{"id": 1001, "name": "Урок 1"}]},
+    ]
+    users = UserStatsColumns.from_rows(rows)
+    assert users.sessions.values("userId") == [10, 10, 11]
+    assert users.sessions.values("watchDuration") == [60, 0, 0]
+    assert users.sessions.values("connectionsCount") == [3, 0, 0]
+
+    user = users[0]
+    assert isinstance(user, UserStats)
+    assert [session.id for session in user.eventSessions] == [1001, 1002]
+    assert users[1].email is None
+
+    single = users.take([1])
+    assert single.sessions.values("userId") == [11]
+    assert [session.name for session in single[0].eventSessions] == ["Урок 1"]
+
+
+def test_string_pool_and_memory():
+    pool = StringPool()
+    assert pool.add(None) == 0 and pool.find(None) == 0
+    assert pool.add("GUEST") == pool.add("GUEST") == 1
+    assert pool.find("LECTURER") is None
+    assert len(pool) == 2
+
+    participants = ParticipantColumns.from_rows(PARTICIPANTS, pool=pool)
+    users = UserStatsColumns.from_rows([{"id": 10, "email": "anna@example.com"}], pool=pool)
+    assert users.pool is participants.pool is pool
+    assert total_nbytes([participants, users]) == participants.nbytes + users.nbytes + pool.nbytes
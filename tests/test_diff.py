@@ -0,0 +1,64 @@
+import asyncio
+
+from benchmarks.stub_server import stub_server, StubConfig, StubData
+from WebinarRu import WebinarAPI
+from WebinarRu.diff import Fingerprint, FingerprintStore, fingerprint
+from WebinarRu.models import EventSessionParticipant
+
+
+def participant(participant_id: int, **fields) -> EventSessionParticipant:
+    return EventSessionParticipant(id=participant_id, email=f"user{participant_id}@example.com", **fields)
+
+
+def test_diff_finds_added_removed_and_changed():
+    before = Fingerprint.of([participant(1), participant(2), participant(3, visited=False)])
+    diff, after = before.diff([participant(1), participant(3, visited=True), participant(4)])
+    assert [item.id for item in diff.added] == [4]
+    assert diff.removed == {2}
+    assert [item.id for item in diff.changed] == [3]
+    assert sorted(after.items) == [1, 3, 4]
+    assert not after.diff([participant(4), participant(3, visited=True), participant(1)])[0]
+
+
+def test_fingerprint_ignores_other_fields():
+    assert fingerprint(participant(1, registerDate="2024-01-01T10:00:00")) == fingerprint(participant(1, registerDate="2024-01-02T10:00:00"))
+    assert fingerprint(participant(1, registerDate="2024-01-01T10:00:00"), None) != fingerprint(participant(1, registerDate="2024-01-02T10:00:00"), None)
+
+
+def test_store_round_trip(tmp_path):
+    path = tmp_path / "fingerprints.json"
+    store = FingerprintStore(path)
+    store.put(1001, Fingerprint.of([participant(1), participant(2)]))
+    store.save()
+    loaded = FingerprintStore(path)
+    assert 1001 in loaded
+    assert loaded.get(1001).items == store.get(1001).items
+    # Снимок по другим полям не используется
+    assert len(loaded.get(1001, fields=("email",))) == 0
+
+
+def test_diff_session_against_stub(tmp_path):
+    async def main():
+        config = StubConfig(events=1, participants=600)
+        store = FingerprintStore(tmp_path / "fingerprints.json")
+        async with stub_server(config) as base_link:
+            async with WebinarAPI("token", base_link=base_link) as webinar:
+                first = await webinar.diff_event_session_participations(1001, store)
+                assert len(first.added) == 600 and not first.removed and not first.changed
+
+                # Пятьдесят участников удалены, у одного изменился статус оплаты
+                config.participants = 550
+                rows = [StubData(config).session_participant(1001, index) for index in range(500)]
+                rows[3]["paymentStatus"] = "PAID"
+                config.fixtures["GET /eventsessions/1001/participations?page=1&perPage=500"] = rows
+                second = await webinar.diff_event_session_participations(1001, store)
+                assert not second.added
+                assert len(second.removed) == 50
+                assert [item.id for item in second.changed] == [1001 * 1_000_000 + 3]
+
+                # Неполная выгрузка не даёт ложных удалений и не меняет снимок
+                config.rate_5xx = 1.0
+                assert await webinar.diff_event_session_participations(1001, store) is None
+                assert len(store.get("eventsession:1001")) == 550
+
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+import asyncio
+import datetime
+from collections import Counter
+from contextlib import aclosing
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI
+from WebinarRu.files import FileCrawler
+from WebinarRu.models import File
+
+
+class TreeAPI:
+    """
+    Хранилище, в котором папка 3 вложена и в 1, и в 2, а папка 1 ссылается на корень
+    """
+    def __init__(self, files: int = 2):
+        self.files = files
+        self.listed = Counter()
+        self.tree = {None: [1, 2], 1: [3, None], 2: [3], 3: []}
+
+    async def get_files(self, user=None, parent=None, is_shared=None):
+        folder_id = int(parent) if parent is not None else None
+        self.listed[folder_id] += 1
+        await asyncio.sleep(0)
+        folders = [File(id=child, type="folder") for child in self.tree[folder_id] if child is not None]
+        files = [
+            File(id=(folder_id or 0) * 10_000 + number, type="file", format="pdf")
+            for number in range(self.files)
+        ]
+        return folders + files
+
+
+def test_crawler_visits_each_folder_once():
+    async def main():
+        api = TreeAPI()
+        crawler = FileCrawler(api, concurrency=2)
+        files = [file async for file in crawler.crawl()]
+        return api, crawler, files
+
+    api, crawler, files = asyncio.run(main())
+    assert api.listed == {None: 1, 1: 1, 2: 1, 3: 1}
+    assert len(files) == crawler.stats.files == 8
+    assert crawler.stats.folders == 4 and crawler.stats.failed == []
+
+
+def test_early_exit_stops_walker_with_full_queue():
+    async def main():
+        api = TreeAPI(files=1500)
+        before = asyncio.all_tasks()
+        async with aclosing(FileCrawler(api).crawl()) as files:
+            async for _ in files:
+                break
+        await asyncio.sleep(0)
+        return asyncio.all_tasks() - before
+
+    assert asyncio.run(asyncio.wait_for(main(), 5)) == set()
+
+
+def test_filters_against_stub():
+    async def main():
+        async with stub_server(StubConfig(files=40, folders=2, folder_depth=2)) as base_link:
+            async with WebinarAPI("token", base_link=base_link) as webinar:
+                return [
+                    file async for file in webinar.iter_files(
+                        formats=[".MP4"],
+                        created_from=datetime.datetime(2024, 3, 1),
+                        created_to=datetime.datetime(2024, 6, 1),
+                    )
+                ]
+
+    files = asyncio.run(main())
+    assert files
+    assert {file.format for file in files} == {"mp4"}
+    assert all(
+        datetime.datetime(2024, 3, 1) <= file.createAt.replace(tzinfo=None) < datetime.datetime(2024, 6, 1)
+        for file in files
+    )
@@ -0,0 +1,55 @@
+import asyncio
+import random
+
+import pytest
+
+from benchmarks.stub_server import stub_server
+from WebinarRu import WebinarAPI
+from WebinarRu.transport import AiohttpTransport
+
+
+class HeadersTransport(AiohttpTransport):
+    def __init__(self):
+        super().__init__()
+        self.sent: list[tuple[str, dict]] = []
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        self.sent.append((method, dict(headers or {})))
+        await asyncio.sleep(0)
+        return await super().request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+
+
+def test_default_headers_are_read_only():
+    webinar = WebinarAPI("token")
+    with pytest.raises(TypeError):
+        webinar.headers["Content-Type"] = "text/plain"
+    assert "Content-Type" not in webinar.headers
+
+
+def test_mixed_verbs_do_not_leak_headers():
+    async def main():
+        transport = HeadersTransport()
+        async with stub_server() as base_link:
+            webinar = WebinarAPI("token", base_link=base_link, transport=transport)
+            calls = {
+                "GET": lambda: webinar.get_json("/timezones"),
+                "POST": lambda: webinar.post_json("/events", {"name": "Вебинар"}),
+                "PUT": lambda: webinar.put("/events/1", {"name": "Вебинар"}, headers={"X-Request-Id": "put"}),
+                "DELETE": lambda: webinar.delete("/organization/events/1"),
+            }
+            verbs = random.Random(0).sample(list(calls) * 125, 500)
+            results = await asyncio.gather(*(calls[verb]() for verb in verbs))
+            await transport.close()
+
+        assert all(result is not None for result in results)
+        assert len(transport.sent) == 500
+        for method, headers in transport.sent:
+            assert headers["x-auth-token"] == "token"
+            if method in ("POST", "PUT"):
+                assert headers["Content-Type"] == "application/x-www-form-urlencoded"
+            else:
+                assert "Content-Type" not in headers
+            assert ("X-Request-Id" in headers) == (method == "PUT")
+        assert dict(webinar.headers) == {"x-auth-token": "token", "Accept": "*/*"}
+
+    asyncio.run(main())
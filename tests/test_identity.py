@@ -0,0 +1,104 @@
+import asyncio
+from collections import Counter
+from urllib.parse import urlsplit
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI
+from WebinarRu.identity import IdentityIndex, normalize_phone
+from WebinarRu.models import EventSessionParticipant, Member, Contact
+from WebinarRu.transport import AiohttpTransport
+
+
+class CountingTransport(AiohttpTransport):
+    def __init__(self):
+        super().__init__()
+        self.routes = Counter()
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        self.routes[urlsplit(url).path.removeprefix("/v3")] += 1
+        return await super().request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+
+
+def test_normalize_phone():
+    assert normalize_phone("8 (900) 000-00-01") == normalize_phone("+7 900 000 00 01") == "79000000001"
+
+
+def test_load_pages_through_contacts_and_members():
+    async def main():
+        transport = CountingTransport()
+        async with stub_server(StubConfig(users=730, members=20)) as base_link:
+            webinar = WebinarAPI("token", base_link=base_link, transport=transport)
+            index = IdentityIndex(webinar, per_page=100, concurrency=4)
+            await index.load()
+            found = await index.by_email(["USER730@example.com ", "user20@example.com"], fetch_missing=False)
+            await transport.close()
+        # 730 контактов — 8 страниц; 20 сотрудников — одна неполная страница
+        assert found["USER730@example.com "].contact_ids == {730}
+        assert found["user20@example.com"].user_id == 20
+        assert transport.routes["/organization/members"] == 1
+        assert 8 <= transport.routes["/contacts/search"] <= 8 + 3
+
+    asyncio.run(main())
+
+
+class FlakyAPI:
+    def __init__(self):
+        self.calls = Counter()
+
+    async def get_event_session_participations(self, event_session_id, per_page, page):
+        self.calls[page] += 1
+        if page == 2 and self.calls[page] == 1:
+            return None
+        if page > 2:
+            return []
+        return [
+            EventSessionParticipant(id=page * 10 + index, email=f"p{page}x{index}@example.com")
+            for index in range(per_page)
+        ]
+
+
+def test_failed_page_keeps_session_unloaded():
+    async def main():
+        api = FlakyAPI()
+        index = IdentityIndex(api, members=False, contacts=False, event_session_ids=[1], per_page=10)
+        await index.load()
+        assert index._loaded_sessions == set()
+        assert index.by_phone(["1"]) == {"1": None}
+        await index.refresh()
+        assert index._loaded_sessions == {1}
+        assert len(index) == 20
+
+    asyncio.run(main())
+
+
+class MembersDownAPI:
+    def __init__(self):
+        self.members_up = False
+        self.member_lookups = 0
+
+    async def get_members(self, per_page=None, page=None, email=None, user_id=None):
+        if email is not None:
+            self.member_lookups += 1
+        if not self.members_up:
+            return None
+        return [Member(id=7, email="staff@example.com")] if page in (None, 1) else []
+
+    async def search_contacts(self, per_page=None, page=None, contact_data=None):
+        return [Contact(id=1, email="client@example.com")] if page in (None, 1) and contact_data is None else []
+
+
+def test_failed_source_is_reported_and_not_cached_as_missing():
+    async def main():
+        api = MembersDownAPI()
+        index = IdentityIndex(api, per_page=10)
+        assert await index.load() is False
+        assert index.failed == {"members"}
+        assert await index.user_ids(["staff@example.com"]) == {"staff@example.com": None}
+        api.members_up = True
+        # Неудачный точечный запрос не запомнен как отсутствие пользователя
+        assert await index.user_ids(["staff@example.com"]) == {"staff@example.com": 7}
+        assert api.member_lookups == 2
+        assert await index.refresh() is True
+        assert index.failed == set()
+
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+
+import WebinarRu
+
+
+def run(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def test_webhook_import_is_light():
+    loaded = run(
+        "import sys\n"
+        "from WebinarRu import WebhookMessage\n"
+        "print(sorted(name for name in ('aiohttp', 'WebinarRu.webinar_api') if name in sys.modules))"
+    )
+    assert loaded == "[]"
+
+
+def test_exports_resolve_lazily():
+    assert set(WebinarRu.__all__) <= set(dir(WebinarRu))
+    assert WebinarRu.WebinarAPI.__name__ == "WebinarAPI"
+    assert callable(WebinarRu.deadline)
+
+
+def test_submodules_do_not_shadow_exports():
+    import WebinarRu.budget as budget
+
+    assert WebinarRu.deadline is budget.deadline
+    assert WebinarRu.budget is budget
+    assert run("import WebinarRu.budget, WebinarRu\nprint(WebinarRu.deadline.__module__)") == "WebinarRu.budget"
+
+
+def test_client_import_skips_optional_subsystems():
+    loaded = run(
+        "import sys\n"
+        "import WebinarRu.webinar_api\n"
+        "heavy = ('sqlite3', 'multiprocessing', 'concurrent.futures.process') + tuple(\n"
+        "    f'WebinarRu.{name}' for name in\n"
+        "    ('cache', 'parallel', 'bulk', 'snapshot', 'columns', 'files', 'diff', 'records', 'identity')\n"
+        ")\n"
+        "print(sorted(name for name in heavy if name in sys.modules))"
+    )
+    assert loaded == "[]"
+
+
+def test_subsystems_load_on_first_use():
+    loaded = run(
+        "import asyncio, sys\n"
+        "from WebinarRu import WebinarAPI\n"
+        "from WebinarRu.transport import Transport, TransportResponse\n"
+        "class Empty(Transport):\n"
+        "    async def request(self, *args, **kwargs):\n"
+        "        return TransportResponse(200, {}, b'[]')\n"
+        "async def main():\n"
+        "    async with WebinarAPI('token', transport=Empty()) as webinar:\n"
+        "        await webinar.get_participations_columns([1])\n"
+        "asyncio.run(main())\n"
+        "print(sorted(name for name in ('WebinarRu.columns', 'WebinarRu.parallel', 'sqlite3') if name in sys.modules))"
+    )
+    assert loaded == "['WebinarRu.columns', 'WebinarRu.parallel']"
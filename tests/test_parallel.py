@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI, WebinarAPIError
+from WebinarRu.models import EventSessionParticipant
+from WebinarRu.parallel import ProcessDecoder, decode_models
+from WebinarRu.transport import Transport, TransportResponse
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    with ProcessDecoder(max_workers=2, chunk_size=3, min_size=0) as decoder:
+        yield decoder
+
+
+def test_pool_decoding_matches_inline(decoder):
+    async def main():
+        async with stub_server(StubConfig(events=1, participants=1200)) as base_link:
+            async with WebinarAPI("token", base_link=base_link) as inline:
+                expected = [
+                    page async for page in inline.iter_event_session_participations(1001, per_page=500)
+                ]
+            async with WebinarAPI("token", base_link=base_link, decoder=decoder) as pooled:
+                pages = [page async for page in pooled.iter_event_session_participations(1001, per_page=500)]
+                columns = await pooled.get_participations_columns([1001, 1002])
+        assert [len(page) for page in pages] == [500, 500, 200]
+        assert pages == expected
+        assert len(columns) == 2400
+        assert columns.count_by("eventSessionId") == {1001: 1200, 1002: 1200}
+
+    asyncio.run(main())
+
+
+def test_map_keeps_order(decoder):
+    async def bodies():
+        for index in range(10):
+            yield json.dumps([{"id": index * 10 + offset} for offset in range(3)]).encode()
+
+    async def main():
+        return [
+            [participant.id for participant in page]
+            async for page in decoder.map(bodies(), EventSessionParticipant)
+        ]
+
+    assert asyncio.run(main()) == [[index * 10 + offset for offset in range(3)] for index in range(10)]
+
+
+class BrokenJSONTransport(Transport):
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        return TransportResponse(200, {}, b"[{")
+
+
+def test_invalid_json(decoder):
+    assert decode_models(b"  ", EventSessionParticipant) is None
+
+    async def main():
+        lenient = WebinarAPI("token", transport=BrokenJSONTransport(), decoder=decoder)
+        assert await lenient.get_event_session_participations(1001) is None
+        strict = WebinarAPI("token", transport=BrokenJSONTransport(), decoder=decoder, strict=True)
+        with pytest.raises(WebinarAPIError):
+            await strict.get_event_session_participations(1001)
+
+    asyncio.run(main())
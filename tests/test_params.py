@@ -0,0 +1,140 @@
+import asyncio
+import datetime
+
+import pytest
+
+from WebinarRu import WebinarAPI, AccessSettings
+from WebinarRu.params import ParamSpec, Field
+from WebinarRu.transport import Transport, TransportResponse
+
+
+class CapturingTransport(Transport):
+    """
+    Запоминает параметры запросов и отвечает заранее заданным телом
+    """
+    def __init__(self, body: bytes = b"[]"):
+        self.body = body
+        self.calls: list[tuple[str, str, dict]] = []
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        self.calls.append((method, url.split("/v3", 1)[1], params if params is not None else data))
+        return TransportResponse(200, {}, self.body)
+
+
+def captured(call, body: bytes = b"[]") -> tuple[str, str, dict]:
+    async def main():
+        transport = CapturingTransport(body)
+        async with WebinarAPI("token", transport=transport) as webinar:
+            await call(webinar)
+        return transport.calls[-1]
+
+    return asyncio.run(main())
+
+
+STARTS = datetime.datetime(2024, 5, 6, 7, 8)
+ENDS = datetime.datetime(2024, 5, 6, 9, 30)
+SETTINGS = AccessSettings(isPasswordRequired=True, isRegistrationRequired=False, isModerationRequired=True)
+
+
+# Ожидаемые словари повторяют то, что собирали методы WebinarAPI до ParamSpec
+def test_get_events_params():
+    method, route, params = captured(lambda api: api.get_events(
+        date_from=STARTS, status=["ACTIVE", "STOP"], date_to=ENDS, access_settings=SETTINGS, per_page=50,
+    ))
+    assert (method, route) == ("GET", "/organization/events/schedule")
+    assert list(params.items()) == [
+        ("from", "2024-05-06 07:08:00"),
+        ("status[0]", "ACTIVE"),
+        ("status[1]", "STOP"),
+        ("to", "2024-05-06 09:30:00"),
+        ("accessSettings", {
+            "accessSettings[isPasswordRequired]": 1,
+            "accessSettings[isRegistrationRequired]": 0,
+            "accessSettings[isModerationRequired]": 1,
+        }),
+        ("perPage", 50),
+    ]
+
+
+def test_create_event_params():
+    _, _, data = captured(lambda api: api.create_event(
+        "Lecture", SETTINGS, 4,
+        is_event_reg_allowed=False,
+        starts_at=STARTS,
+        ends_at=ENDS,
+        lector_ids=(11, 12),
+        tags=[],
+        default_reminders_enabled=True,
+    ), body=b'{"eventId": 1, "link": "https://example.com"}')
+    assert list(data.items()) == [
+        ("name", "Lecture"),
+        ("AccessSettings", SETTINGS.to_dict),
+        ("access", 4),
+        ("isEventRegAllowed", "false"),
+        ("startsAt[date][year]", 2024),
+        ("startsAt[date][month]", 5),
+        ("startsAt[date][day]", 6),
+        ("startsAt[time][hour]", 7),
+        ("startsAt[time][minute]", 8),
+        ("endsAt[date][year]", 2024),
+        ("endsAt[date][month]", 5),
+        ("endsAt[date][day]", 6),
+        ("endsAt[time][hour]", 9),
+        ("endsAt[time][minute]", 30),
+        ("lectorIds[0]", 11),
+        ("lectorIds[1]", 12),
+        ("defaultRemindersEnabled", "true"),
+    ]
+
+
+def test_register_to_event_drops_falsy_values():
+    _, route, data = captured(lambda api: api.register_to_event(
+        7, "user@example.com", "Ivan", "", nickname="", role="GUEST", is_auto_enter=True, send_email=False,
+    ), body=b'{"participationId": 1}')
+    assert route == "/events/7/register"
+    assert data == {
+        "email": "user@example.com",
+        "name": "Ivan",
+        "secondName": "",
+        "role": "GUEST",
+        "isAutoEnter": "true",
+    }
+
+
+def test_search_contacts_arrays_and_mapping():
+    _, _, params = captured(lambda api: api.search_contacts(
+        contact_ids=[3, 4], tags=[], contact_data={"email": "a@b.c", "name": "A"}, per_page=10,
+    ))
+    assert params == {
+        "contactIds[0]": 3,
+        "contactIds[1]": 4,
+        "contactsData[email]": "a@b.c",
+        "contactsData[name]": "A",
+        "perPage": 10,
+    }
+
+
+def test_none_is_omitted_but_false_is_kept():
+    _, _, params = captured(lambda api: api.get_files(parent="5", is_shared=False))
+    assert params == {"parent": "5", "isShared": "false"}
+    _, _, params = captured(lambda api: api.get_files())
+    assert params == {}
+
+
+def test_spec_rules():
+    spec = ParamSpec(
+        always=Field("always", skip="never"),
+        flag=Field("flag", "bool", "falsy"),
+        items=Field("items", "array"),
+        count="count",
+    )
+    assert spec.build() == {"always": None}
+    assert spec.build(always=1, flag=True, items=iter("ab"), count=0) == {
+        "always": 1, "flag": "true", "items[0]": "a", "items[1]": "b", "count": 0,
+    }
+    with pytest.raises(TypeError):
+        spec.build(unknown=1)
+    with pytest.raises(ValueError):
+        ParamSpec(value=Field("value", "upper"))
+    with pytest.raises(ValueError):
+        ParamSpec(value=Field("value", skip="empty"))
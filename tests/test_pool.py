@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from WebinarRu.pool import ClientPool, WeightedScheduler
+from WebinarRu.transport import Transport, TransportResponse
+
+
+class TokenTransport(Transport):
+    """
+    Запоминает, с каким токеном начинались запросы; запросы с токенами из down падают с ошибкой соединения
+    """
+    def __init__(self, down: set[str] = frozenset()):
+        self.down = down
+        self.started: list[str] = []
+        self.closed = False
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        token = headers["x-auth-token"]
+        self.started.append(token)
+        await asyncio.sleep(0)
+        if token in self.down:
+            raise ConnectionError("connection refused")
+        return TransportResponse(200, {}, b'{"ok": true}')
+
+    async def close(self):
+        self.closed = True
+
+
+def test_slots_follow_weights():
+    async def main():
+        transport = TokenTransport()
+        async with ClientPool(concurrency=1, transport=transport) as pool:
+            pool.add("big", "big", weight=3)
+            pool.add("small", "small", weight=1)
+            calls = [pool[name].get_json("/timezones") for _ in range(8) for name in ("small", "big")]
+            await asyncio.gather(*calls)
+            return transport, pool.stats()
+
+    transport, stats = asyncio.run(main())
+    # Первый запрос занимает свободный слот, дальше слоты выдаются по весам 3:1, пока очереди не пусты
+    window = transport.started[1:9]
+    assert window.count("big") == 6 and window.count("small") == 2
+    assert stats["big"].requests == stats["small"].requests == 8
+    assert not transport.closed
+
+
+def test_failing_tenant_does_not_block_others():
+    async def main():
+        transport = TokenTransport(down={"broken"})
+        async with ClientPool({"broken": "broken", "healthy": "healthy"}, concurrency=2, transport=transport) as pool:
+            broken, healthy = await asyncio.gather(
+                asyncio.gather(*(pool["broken"].get_json("/timezones") for _ in range(10))),
+                asyncio.gather(*(pool["healthy"].get_json("/timezones") for _ in range(10))),
+            )
+            return pool, broken, healthy
+
+    pool, broken, healthy = asyncio.run(main())
+    assert broken == [None] * 10
+    assert healthy == [{"ok": True}] * 10
+    # Ошибки возвращают слоты: после выгрузки свободны все
+    assert pool.scheduler._free == 2
+    assert all(stats.in_flight == 0 for stats in pool.stats().values())
+
+
+def test_strict_tenant_error_is_isolated():
+    async def main():
+        transport = TokenTransport(down={"broken"})
+        async with ClientPool(
+                {"broken": "broken", "healthy": "healthy"}, concurrency=1, transport=transport, strict=True
+        ) as pool:
+            results = await asyncio.gather(
+                pool["broken"].get_json("/timezones"),
+                pool["healthy"].get_json("/timezones"),
+                return_exceptions=True,
+            )
+            return pool, results
+
+    pool, (broken, healthy) = asyncio.run(main())
+    assert isinstance(broken, Exception)
+    assert healthy == {"ok": True}
+    assert pool.scheduler._free == 1
+
+
+def test_removed_tenant_releases_queue():
+    async def main():
+        scheduler = WeightedScheduler(1)
+        scheduler.register("a")
+        scheduler.register("b")
+        await scheduler.acquire("a")
+        queued_a = [asyncio.ensure_future(scheduler.acquire("a")) for _ in range(3)]
+        queued_b = asyncio.ensure_future(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        assert scheduler.waiting("a") == 3
+        scheduler.unregister("a")
+        scheduler.release()
+        await asyncio.wait_for(queued_b, 1)
+        results = await asyncio.gather(*queued_a, return_exceptions=True)
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+def test_tenant_names_are_unique():
+    pool = ClientPool({"school": "token"}, transport=TokenTransport())
+    assert "school" in pool and len(pool) == 1 and list(pool) == ["school"]
+    with pytest.raises(ValueError):
+        pool.add("school", "other")
+    with pytest.raises(ValueError):
+        pool.add("college", "token", weight=0)
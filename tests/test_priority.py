@@ -0,0 +1,115 @@
+import asyncio
+
+from WebinarRu.priority import PriorityScheduler, PriorityTransport, priority
+from WebinarRu.transport import Transport, TransportResponse
+
+
+class GateTransport(Transport):
+    """
+    Запросы ждут, пока тест не откроет их ворота; порядок начала запросов запоминается
+    """
+    def __init__(self):
+        self.started: list[str] = []
+        self.gates: dict[str, asyncio.Event] = {}
+
+    async def request(self, method, url, params=None, data=None, headers=None, timeout=None):
+        self.started.append(url)
+        gate = self.gates.setdefault(url, asyncio.Event())
+        await gate.wait()
+        return TransportResponse(200, {}, b"[]")
+
+    def open(self, url: str):
+        self.gates.setdefault(url, asyncio.Event()).set()
+
+
+async def spin():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_interactive_overtakes_queued_bulk():
+    async def main():
+        inner = GateTransport()
+        scheduler = PriorityScheduler(1)
+        transport = PriorityTransport(inner, scheduler)
+        tasks = []
+        with priority("bulk"):
+            tasks.append(asyncio.ensure_future(transport.request("GET", "bulk-0")))
+            await spin()
+            tasks.extend(asyncio.ensure_future(transport.request("GET", f"bulk-{n}")) for n in range(1, 4))
+        await spin()
+        tasks.extend(asyncio.ensure_future(transport.request("GET", f"ui-{n}")) for n in range(2))
+        await spin()
+        assert scheduler.stats()["bulk"].waiting == 3 and scheduler.stats()["interactive"].waiting == 2
+        for url in ["bulk-0", "ui-0", "ui-1", "bulk-1", "bulk-2", "bulk-3"]:
+            inner.open(url)
+            await spin()
+        await asyncio.gather(*tasks)
+        return inner.started, scheduler.stats()
+
+    started, stats = asyncio.run(main())
+    assert started == ["bulk-0", "ui-0", "ui-1", "bulk-1", "bulk-2", "bulk-3"]
+    assert stats["interactive"].requests == 2 and stats["interactive"].max_wait > 0
+    assert stats["bulk"].in_flight == stats["interactive"].in_flight == 0
+
+
+def test_bulk_share_leaves_slots_for_interactive():
+    async def main():
+        inner = GateTransport()
+        scheduler = PriorityScheduler(5, shares={"interactive": 1.0, "bulk": 0.6})
+        transport = PriorityTransport(inner, scheduler)
+        with priority("bulk"):
+            bulk = [asyncio.ensure_future(transport.request("GET", "bulk")) for _ in range(10)]
+        await spin()
+        in_flight = scheduler.stats()["bulk"].in_flight
+        interactive = asyncio.ensure_future(transport.request("GET", "ui"))
+        await spin()
+        ui_started = "ui" in inner.started
+        inner.open("ui")
+        inner.open("bulk")
+        await asyncio.gather(interactive, *bulk)
+        return in_flight, ui_started
+
+    in_flight, ui_started = asyncio.run(main())
+    assert in_flight == 3
+    assert ui_started
+
+
+def test_cancelled_waiter_does_not_hold_a_slot():
+    async def main():
+        inner = GateTransport()
+        scheduler = PriorityScheduler(1)
+        transport = PriorityTransport(inner, scheduler)
+        holder = asyncio.ensure_future(transport.request("GET", "holder"))
+        await spin()
+        cancelled = asyncio.ensure_future(transport.request("GET", "cancelled"))
+        granted = asyncio.ensure_future(transport.request("GET", "granted"))
+        await spin()
+        cancelled.cancel()
+        await spin()
+        inner.open("holder")
+        inner.open("granted")
+        await asyncio.gather(holder, granted)
+        return inner.started, scheduler.stats()["interactive"]
+
+    started, stats = asyncio.run(main())
+    assert started == ["holder", "granted"]
+    assert stats.in_flight == 0 and stats.waiting == 0
+
+
+def test_waiter_cancelled_after_grant_returns_the_slot():
+    async def main():
+        scheduler = PriorityScheduler(1)
+        await scheduler.acquire()
+        waiter = asyncio.ensure_future(scheduler.acquire())
+        await spin()
+        # Слот выдаётся ожидающему при release, но задача отменяется до того, как успела его забрать
+        scheduler.release("interactive")
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.stats()["interactive"].in_flight == 0
+        await asyncio.wait_for(scheduler.acquire(), 1)
+        return scheduler.stats()["interactive"]
+
+    stats = asyncio.run(main())
+    assert stats.in_flight == 1 and stats.waiting == 0
@@ -0,0 +1,100 @@
+import asyncio
+
+from WebinarRu.models import File, EventSession
+from WebinarRu.records import RecordIndex
+
+
+class FakeAPI:
+    """
+    /records с постраничной выгрузкой и запросом по id. Записи с id из hidden не попадают в список
+    """
+    def __init__(self, count: int = 5, hidden: set[int] = frozenset(), failing: bool = False):
+        self.records = {
+            record_id: File(id=record_id, link=f"https://records/{record_id}", eventSession=EventSession(id=record_id % 2))
+            for record_id in range(1, count + 1)
+        }
+        self.hidden = hidden
+        self.failing = failing
+        self.pages = 0
+        self.single: list[int] = []
+
+    async def get_records(self, record_id=None, offset=None, limit=None, **kwargs):
+        await asyncio.sleep(0)
+        if record_id is not None:
+            self.single.append(record_id)
+            return [self.records[record_id]] if record_id in self.records else []
+        self.pages += 1
+        if self.failing:
+            return None
+        listed = [record for record_id, record in self.records.items() if record_id not in self.hidden]
+        return listed[offset:offset + limit]
+
+
+def test_hits_come_from_one_paged_load():
+    async def main():
+        api = FakeAPI(count=5)
+        index = RecordIndex(api, page_size=2)
+        links = await index.links([1, 4, 5])
+        again = await index.get(2)
+        return api, index, links, again
+
+    api, index, links, again = asyncio.run(main())
+    assert links == {1: "https://records/1", 4: "https://records/4", 5: "https://records/5"}
+    assert again.id == 2 and len(index) == 5
+    assert api.pages == 3 and api.single == []
+
+
+def test_misses_refresh_once_then_fetch_by_id():
+    async def main():
+        api = FakeAPI(count=4, hidden={3})
+        index = RecordIndex(api, refresh_interval=0)
+        await index.refresh()
+        found = await index.get_many([3, 9, 1])
+        repeated = await index.get_many([9])
+        return api, index, found, repeated
+
+    api, index, found, repeated = asyncio.run(main())
+    assert found[3].id == 3 and found[9] is None and found[1].id == 1
+    assert repeated == {9: None}
+    # Выгрузка при загрузке и одна перезагрузка на промахах; известное отсутствие записи её не вызывает
+    assert api.pages == 2
+    # Отсутствующая запись запрашивается по id один раз до следующей перезагрузки индекса
+    assert api.single == [3, 9]
+    assert 3 in index
+
+
+def test_refresh_interval_limits_reloads():
+    async def main():
+        api = FakeAPI(count=2)
+        index = RecordIndex(api, refresh_interval=60)
+        await index.get_many([1])
+        await index.get_many([7])
+        await index.get_many([8])
+        return api
+
+    api = asyncio.run(main())
+    assert api.pages == 1 and api.single == [7, 8]
+
+
+def test_failed_load_falls_back_to_single_requests():
+    async def main():
+        api = FakeAPI(count=3, failing=True)
+        index = RecordIndex(api, refresh_interval=0)
+        links = await index.links([1, 2, 5])
+        return api, links
+
+    api, links = asyncio.run(main())
+    assert links == {1: "https://records/1", 2: "https://records/2", 5: None}
+    assert api.pages == 1
+    assert sorted(api.single) == [1, 2, 5]
+
+
+def test_records_of_session():
+    async def main():
+        api = FakeAPI(count=5)
+        index = RecordIndex(api)
+        return await index.for_session(1), await index.for_session(42), api
+
+    odd, none, api = asyncio.run(main())
+    assert [record.id for record in odd] == [1, 3, 5]
+    assert none == [] and api.pages == 1
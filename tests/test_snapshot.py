@@ -0,0 +1,54 @@
+import asyncio
+import datetime
+
+import aiohttp
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI
+from WebinarRu.models import EventSession, File
+from WebinarRu.snapshot import SnapshotBuilder
+
+
+class RecordsAPI:
+    def __init__(self):
+        self.days: list[datetime.date] = []
+
+    async def get_records(self, date_from, date_to, offset, limit):
+        self.days.append(date_from.date())
+        if date_from.date() != datetime.date(2024, 1, 3):
+            return []
+        return [File(id=1, eventSession={"id": 7}), File(id=2, eventSession={"id": 8})]
+
+
+def test_records_of_multi_day_session():
+    async def main():
+        api = RecordsAPI()
+        session = EventSession(
+            id=7,
+            startsAt=datetime.datetime(2024, 1, 2, 22, 0),
+            endsAt=datetime.datetime(2024, 1, 5, 2, 0),
+        )
+        records = await SnapshotBuilder(api, include=["records"])._session_records(session)
+        assert [record.id for record in records] == [1]
+        assert api.days == [datetime.date(2024, 1, day) for day in range(2, 6)]
+
+    asyncio.run(main())
+
+
+def test_early_exit_cancels_pending_requests():
+    async def main():
+        async with stub_server(StubConfig(events=20, participants=10, latency=0.05)) as base_link:
+            async with WebinarAPI("token", base_link=base_link) as webinar:
+                async for snapshot in webinar.iter_event_snapshots(concurrency=4):
+                    assert snapshot.event.id
+                    break
+                async with aiohttp.ClientSession() as session:
+                    stats_link = base_link.replace("/v3", "/_stub/stats")
+                    async with session.get(stats_link) as resp:
+                        before = (await resp.json())["requests"]
+                    await asyncio.sleep(0.3)
+                    async with session.get(stats_link) as resp:
+                        after = (await resp.json())["requests"]
+                assert after == before + 1
+
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu import WebinarAPI
+from WebinarRu.exceptions import (
+    NotFoundError,
+    RateLimitedError,
+    ServerError,
+    APIConnectionError,
+    WebinarAPIError,
+)
+
+
+def test_lenient_mode_returns_none():
+    async def main():
+        async with stub_server(StubConfig(events=1)) as base_link:
+            async with WebinarAPI("token", base_link=base_link) as webinar:
+                assert await webinar.get_event_info(999) is None
+                assert (await webinar.get_event_info(1)).id == 1
+
+    asyncio.run(main())
+
+
+def test_strict_not_found():
+    async def main():
+        async with stub_server(StubConfig(events=1)) as base_link:
+            async with WebinarAPI("token", base_link=base_link, strict=True) as webinar:
+                with pytest.raises(NotFoundError) as info:
+                    await webinar.get_event_info(999)
+                assert info.value.status == 404
+                assert info.value.route == "/organization/events/999"
+
+    asyncio.run(main())
+
+
+def test_strict_rate_limited():
+    async def main():
+        async with stub_server(StubConfig(rate_429=1.0)) as base_link:
+            async with WebinarAPI("token", base_link=base_link, strict=True) as webinar:
+                with pytest.raises(RateLimitedError) as info:
+                    await webinar.get_timezones()
+                assert info.value.retry_after == 1.0
+
+    asyncio.run(main())
+
+
+def test_strict_server_error():
+    async def main():
+        async with stub_server(StubConfig(rate_5xx=1.0)) as base_link:
+            async with WebinarAPI("token", base_link=base_link, strict=True) as webinar:
+                with pytest.raises(ServerError) as info:
+                    await webinar.get_timezones()
+                assert isinstance(info.value, WebinarAPIError)
+                assert info.value.status == 503
+
+    asyncio.run(main())
+
+
+def test_strict_connection_error():
+    async def main():
+        async with stub_server() as base_link:
+            pass
+        async with WebinarAPI("token", base_link=base_link, strict=True) as webinar:
+            with pytest.raises(APIConnectionError):
+                await webinar.get_timezones()
+
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from benchmarks.stub_server import stub_server, StubConfig
+from WebinarRu.sync import SyncWebinarAPI
+
+
+@contextmanager
+def running_stub(config: StubConfig):
+    """
+    Заглушка в отдельном потоке, чтобы синхронный фасад мог обращаться к ней из основного
+    """
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    stop = loop.create_future()
+    links = []
+
+    async def serve():
+        async with stub_server(config) as base_link:
+            links.append(base_link)
+            started.set()
+            await stop
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    started.wait(5)
+    try:
+        yield links[0]
+    finally:
+        loop.call_soon_threadsafe(stop.set_result, None)
+        thread.join(5)
+        loop.close()
+
+
+def test_blocking_methods():
+    with running_stub(StubConfig(events=3, files=4, folders=1, folder_depth=1)) as base_link:
+        with SyncWebinarAPI("token", base_link=base_link, strict=True) as webinar:
+            assert [event.id for event in webinar.get_events()] == [1, 2, 3]
+            assert [event.id for event in webinar.map("get_event_info", [3, 1, 2])] == [3, 1, 2]
+            info, events = webinar.gather(
+                lambda api: api.get_event_info(2),
+                lambda api: api.get_events(per_page=2),
+            )
+            assert info.id == 2 and len(events) == 2
+            assert len(list(webinar.iter_files())) == 8
+
+
+def test_calls_from_many_threads_share_one_loop():
+    with running_stub(StubConfig(events=5)) as base_link:
+        with SyncWebinarAPI("token", base_link=base_link, strict=True) as webinar:
+            results = {}
+
+            def call(event_id):
+                results[event_id] = webinar.get_event_info(event_id).id
+
+            threads = [threading.Thread(target=call, args=(event_id,)) for event_id in range(1, 6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert results == {event_id: event_id for event_id in range(1, 6)}
+            assert webinar._thread is not None and webinar._thread.is_alive()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork is not available")
+def test_forked_child_gets_its_own_connections():
+    with running_stub(StubConfig(events=2)) as base_link:
+        webinar = SyncWebinarAPI("token", base_link=base_link, strict=True, timeout=5)
+        # Соединение родителя уже открыто к моменту fork, как в воркерах Celery prefork
+        assert webinar.get_event_info(1).id == 1
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            try:
+                result = str(webinar.get_event_info(2).id).encode()
+            except BaseException as error:
+                result = repr(error).encode()
+            os.write(write, result)
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read, "rb") as pipe:
+            result = pipe.read().decode()
+        os.waitpid(pid, 0)
+        # Родитель продолжает работать на своих соединениях
+        assert webinar.get_event_info(2).id == 2
+        webinar.close()
+    assert result == "2", result
+
+
+def test_facade_methods():
+    with pytest.raises(ValueError):
+        SyncWebinarAPI()
+    assert callable(SyncWebinarAPI.get_event_info) and callable(SyncWebinarAPI.iter_files)
@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+import shutil
+import ssl
+import subprocess
+
+import aiohttp
+import pytest
+
+from benchmarks.stub_server import stub_server
+from WebinarRu import WebinarAPI, APIConnectionError
+from WebinarRu.tls import make_ssl_context
+from WebinarRu.transport import AiohttpTransport
+
+
+@pytest.fixture
+def certificate(tmp_path):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is not available")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+            "-keyout", str(key), "-out", str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_context.load_cert_chain(cert, key)
+    pin = hashlib.sha256(ssl.PEM_cert_to_DER_cert(cert.read_text())).hexdigest()
+    return server_context, str(cert), pin
+
+
+def test_pinned_certificate(certificate):
+    server_context, cafile, pin = certificate
+
+    async def main():
+        async with stub_server(ssl_context=server_context) as base_link:
+            async with WebinarAPI(
+                "token", base_link=base_link, strict=True,
+                ssl_context=make_ssl_context(cafile=cafile), ssl_pins=[pin],
+            ) as webinar:
+                assert await webinar.get_timezones()
+
+    asyncio.run(main())
+
+
+def test_pin_mismatch_is_rejected(certificate):
+    server_context, cafile, _ = certificate
+
+    async def main():
+        async with stub_server(ssl_context=server_context) as base_link:
+            async with WebinarAPI(
+                "token", base_link=base_link, strict=True,
+                ssl_context=make_ssl_context(cafile=cafile), ssl_pins=["00" * 32],
+            ) as webinar:
+                with pytest.raises(APIConnectionError):
+                    await webinar.get_timezones()
+            # Соединение разрывается сразу после рукопожатия: запрос с токеном не отправляется
+            async with aiohttp.ClientSession() as session:
+                stats_link = base_link.replace("/v3", "/_stub/stats")
+                async with session.get(stats_link, ssl=make_ssl_context(cafile=cafile)) as resp:
+                    stats = await resp.json()
+        return stats
+
+    assert asyncio.run(main())["requests"] == 1  # только запрос статистики
+
+
+def test_pins_accept_colons_and_bytes(certificate):
+    server_context, cafile, pin = certificate
+    pins = ["00" * 32, ":".join(pin[i:i + 2] for i in range(0, len(pin), 2)), bytes.fromhex(pin)]
+
+    async def main():
+        async with stub_server(ssl_context=server_context) as base_link:
+            for accepted in pins[1:]:
+                transport = AiohttpTransport(ssl_context=make_ssl_context(cafile=cafile), ssl_pins=[pins[0], accepted])
+                async with WebinarAPI("token", base_link=base_link, strict=True, transport=transport) as webinar:
+                    assert await webinar.get_timezones()
+
+    asyncio.run(main())
+
+
+def test_untrusted_certificate_is_rejected(certificate):
+    server_context, _, pin = certificate
+
+    async def main():
+        async with stub_server(ssl_context=server_context) as base_link:
+            async with WebinarAPI("token", base_link=base_link, strict=True, ssl_pins=[pin]) as webinar:
+                with pytest.raises(APIConnectionError):
+                    await webinar.get_timezones()
+
+    asyncio.run(main())
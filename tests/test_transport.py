@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from benchmarks.stub_server import stub_server
+from WebinarRu import WebinarAPI, WebinarAPIError
+from WebinarRu.transport import Transport, AiohttpTransport, HttpxTransport
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        Transport()
+
+
+def test_tls_options_with_custom_transport():
+    with pytest.raises(ValueError):
+        WebinarAPI("token", transport=AiohttpTransport(), ssl_pins=["00" * 32])
+    with pytest.raises(ValueError):
+        WebinarAPI("token", transport=HttpxTransport(), ssl_pins=["00" * 32])
+
+
+@pytest.mark.parametrize("factory", [AiohttpTransport, lambda: HttpxTransport(http2=False)])
+def test_transport_is_bound_to_one_loop(factory):
+    transport = factory()
+
+    async def get(close: bool):
+        async with stub_server() as base_link:
+            webinar = WebinarAPI("token", base_link=base_link, transport=transport, strict=True)
+            timezones = await webinar.get_timezones()
+            if close:
+                await transport.close()
+            return timezones
+
+    # Закрытый транспорт можно использовать в новом loop, незакрытый — нет
+    assert asyncio.run(get(close=True))
+    assert asyncio.run(get(close=False))
+    with pytest.raises(WebinarAPIError) as info:
+        asyncio.run(get(close=False))
+    assert isinstance(info.value.__cause__, RuntimeError)